@@ -0,0 +1,59 @@
+"""
+Mide la programación de la ROM con una Basys3 simulada (MockBasys3): la
+programación completa y una reprogramación en que solo cambia una fracción
+de las palabras, que con la caché escribe solo esas direcciones.
+
+Uso: python -m benchmarks.basys [-n PALABRAS] [--latency SEGUNDOS] [--changed FRACCION]
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+
+from components.romProgrammer import MockBasys3, RomProgrammer
+
+
+def run(count: int, latency: float, changed: float, seed: int = 2343) -> dict:
+    rng = random.Random(seed)
+    binary = [rng.getrandbits(36) for _ in range(count)]
+    updated = list(binary)
+    for address in rng.sample(range(count), int(count * changed)):
+        updated[address] ^= 1
+
+    with tempfile.TemporaryDirectory() as directory:
+        device = MockBasys3(latency)
+        programmer = RomProgrammer(device, cache_path=os.path.join(directory, 'rom.bin'))
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            programmer.program(binary)
+            full = time.perf_counter() - start
+            full_writes = device.writes
+
+            start = time.perf_counter()
+            programmer.program(updated)
+            incremental = time.perf_counter() - start
+
+    return {
+        'words': count,
+        'full': {'seconds': full, 'writes': full_writes},
+        'incremental': {'seconds': incremental, 'writes': device.writes - full_writes},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de programación de la ROM')
+    parser.add_argument('-n', '--words', type=int, default=4096, help='Cantidad de palabras de la ROM')
+    parser.add_argument('--latency', type=float, default=0.0005, help='Segundos simulados por escritura serial')
+    parser.add_argument('--changed', type=float, default=0.05, help='Fracción de palabras que cambian al reprogramar')
+    args = parser.parse_args()
+
+    result = run(args.words, args.latency, args.changed)
+    print(f"Palabras: {result['words']}")
+    for stage in ('full', 'incremental'):
+        print(f"  {stage}: {result[stage]['writes']} escrituras en {result[stage]['seconds']:.3f} s")
+
+if __name__ == '__main__':
+    main()
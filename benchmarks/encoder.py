@@ -0,0 +1,89 @@
+"""
+Compara la codificación con la tabla precompilada (InstructionEncoder) contra
+la ruta original basada en strings de InstructionProcessor.
+
+Uso: python -m benchmarks.encoder [-n LINEAS]
+"""
+import argparse
+import json
+import os
+import random
+import time
+
+from components.configuration import Configuration
+from components.instructionProcessor import InstructionProcessor
+from components.memory import Memory
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SAMPLE_INSTRUCTIONS = [
+    'MOV A, B', 'MOV B, A', 'MOV A, 42', 'MOV B, FFh', 'MOV A, (var1)', 'MOV (var1), A',
+    'MOV A, (B)', 'MOV (B), 1010b', 'ADD A, B', 'ADD A, (arr)', 'SUB B, 3', 'AND A, (12)',
+    'OR B, A', 'XOR A, A', 'ADD (var1)', 'NOT A', 'SHL (var1), A', 'SHR B, A', 'INC B',
+    'INC (var1)', 'DEC A', 'CMP A, 0', 'CMP A, (B)', 'JMP loop', 'JEQ fin', 'JNE 7',
+    'CALL loop', 'PUSH A', 'POP B', 'RET', 'NOP',
+]
+
+
+def generate_lines(count: int, seed: int = 2343):
+    rng = random.Random(seed)
+    return [rng.choice(SAMPLE_INSTRUCTIONS) for _ in range(count)]
+
+
+def run(count: int) -> dict:
+    with open(os.path.join(ROOT, 'utils', 'setup.json')) as f:
+        processor = InstructionProcessor(Configuration(json.load(f)))
+    memory = Memory()
+    memory.store_value('var1', ['7'])
+    memory.store_value('arr', ['1', '2', '3'])
+    labels = {'loop': 3, 'fin': 12}
+    lines = generate_lines(count)
+    parsed = [processor._parse_instruction(line) for line in lines]
+
+    # Solo codificación, con las líneas ya separadas en instrucción y operandos
+    start = time.perf_counter()
+    for name, operands in parsed:
+        processor._get_opcode_legacy(name, operands, labels, memory.data, memory, 0)
+    legacy_encode = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for name, operands in parsed:
+        processor.encoder.encode(name, operands, labels, memory.data, memory)
+    table_encode = time.perf_counter() - start
+
+    # Línea completa: parseo, codificación y string de salida
+    start = time.perf_counter()
+    for line in lines:
+        name, operands = processor._parse_instruction(line)
+        processor._get_opcode_legacy(name, operands, labels, memory.data, memory, 0)
+    legacy = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for line in lines:
+        processor.get_opcode(line, labels, memory.data, memory, 0)
+    table = time.perf_counter() - start
+
+    return {
+        'lines': count,
+        'encode': {'legacy_seconds': legacy_encode, 'table_seconds': table_encode},
+        'get_opcode': {'legacy_seconds': legacy, 'table_seconds': table},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de codificación de instrucciones')
+    parser.add_argument('-n', '--lines', type=int, default=100000, help='Cantidad de líneas a codificar')
+    args = parser.parse_args()
+
+    result = run(args.lines)
+    print(f"Líneas codificadas: {result['lines']}")
+    for stage in ('encode', 'get_opcode'):
+        legacy = result[stage]['legacy_seconds']
+        table = result[stage]['table_seconds']
+        print(f"{stage}:")
+        print(f"  Ruta original: {legacy:.3f} s ({result['lines'] / legacy:,.0f} líneas/s)")
+        print(f"  Tabla:         {table:.3f} s ({result['lines'] / table:,.0f} líneas/s)")
+        print(f"  Aceleración:   {legacy / table:.2f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Mide la decodificación por lotes de utils/interpreter.py (NumPy) sobre una
+imagen de ROM sintética, separando carga, decodificación y formato.
+
+Uso: python -m benchmarks.interpreter [-n PALABRAS] [--format]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from utils.interpreter import EnhancedInterpreter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def write_image(path: str, interpreter: EnhancedInterpreter, count: int, seed: int = 2343) -> None:
+    rng = random.Random(seed)
+    opcodes = [info['opcode'] for info in interpreter.instructions.values()]
+    types = list(interpreter.types.values())
+    literal_bits = interpreter.lit_bits
+    with open(path, 'w') as f:
+        f.write(''.join(
+            f"{rng.choice(opcodes)}{rng.choice(types)}{rng.choice(types)}{rng.getrandbits(literal_bits):0{literal_bits}b}\n"
+            for _ in range(count)
+        ))
+
+
+def run(count: int, include_format: bool = False) -> dict:
+    interpreter = EnhancedInterpreter(os.path.join(ROOT, 'utils', 'setup.json'))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'image.txt')
+        write_image(path, interpreter, count)
+
+        start = time.perf_counter()
+        words, line_numbers, _ = interpreter.load_words(path)
+        load = time.perf_counter() - start
+
+    start = time.perf_counter()
+    decoded = interpreter.decode_batch(words)
+    decode = time.perf_counter() - start
+
+    result = {'words': count, 'load_seconds': load, 'decode_seconds': decode}
+    if include_format:
+        start = time.perf_counter()
+        for _ in interpreter.format_batch(decoded, line_numbers):
+            pass
+        result['format_seconds'] = time.perf_counter() - start
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark del decodificador por lotes')
+    parser.add_argument('-n', '--words', type=int, default=1_000_000, help='Cantidad de palabras de la imagen')
+    parser.add_argument('--format', action='store_true', help='Medir también la etapa de formato')
+    args = parser.parse_args()
+
+    result = run(args.words, args.format)
+    print(f"Palabras decodificadas: {result['words']}")
+    print(f"  Carga:          {result['load_seconds']:.3f} s")
+    print(f"  Decodificación: {result['decode_seconds']:.3f} s")
+    if 'format_seconds' in result:
+        print(f"  Formato:        {result['format_seconds']:.3f} s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+"""
+Mide el ensamblador completo sobre programas sintéticos (benchmarks.programs):
+cada etapa del pipeline, el ensamblaje del archivo completo, la escritura en
+cada formato y la decodificación con EnhancedInterpreter, con su rendimiento
+en líneas/s y la memoria máxima (RSS). El resultado se guarda como JSON y se
+compara con una línea base guardada antes; una regresión termina con código 1.
+
+Uso: python -m benchmarks.pipeline [-n INSTRUCCIONES] [--scenario NOMBRE ...]
+         [--output ARCHIVO] [--baseline ARCHIVO] [--save-baseline ARCHIVO] [--tolerance FRACCION]
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from benchmarks.programs import SCENARIOS, scenario_program
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SETUP_PATH = os.path.join(ROOT, 'utils', 'setup.json')
+
+# Tiempos de la línea base bajo este mínimo no se comparan: son puro ruido
+MIN_SECONDS = 0.01
+
+
+def peak_rss() -> Optional[int]:
+    """Memoria residente máxima del proceso en bytes (None si el sistema no la informa)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux la informa en KB y macOS en bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _best(function, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_scenario(name: str, instructions: int, repeat: int = 3) -> Dict:
+    from components.assembler import Assembler
+    from components.outputWriter import OUTPUT_WRITERS
+    from utils.interpreter import EnhancedInterpreter, np
+    from utils.profiling import AssemblyProfile
+
+    with open(SETUP_PATH) as f:
+        assembler = Assembler(json.load(f))
+    source = scenario_program(name, instructions)
+    lines = source.count('\n') + 1
+
+    binary = assembler.assemble(source)
+    seconds = _best(lambda: assembler.assemble(source), repeat)
+    # Con profile cada línea se mide aparte, así que las etapas suman más que el archivo completo
+    stages = {}
+    for _ in range(repeat):
+        profile = AssemblyProfile()
+        assembler.assemble(source, profile=profile)
+        for stage, values in profile.stages.items():
+            if stage not in stages or values['seconds'] < stages[stage]['seconds']:
+                stages[stage] = dict(values)
+    for values in stages.values():
+        values['lines_per_second'] = values['lines'] / values['seconds'] if values['seconds'] else 0.0
+
+    write = {}
+    decode = None
+    with tempfile.TemporaryDirectory() as directory:
+        for output_format in sorted(OUTPUT_WRITERS):
+            path = os.path.join(directory, 'salida' + OUTPUT_WRITERS[output_format].extension)
+            write[output_format] = _best(lambda: assembler.write(binary, path, output_format), repeat)
+        if np is not None:
+            interpreter = EnhancedInterpreter(SETUP_PATH)
+            path = os.path.join(directory, 'salida' + OUTPUT_WRITERS['txt'].extension)
+            decode = _best(lambda: interpreter.decode_batch(interpreter.load_words(path)[0]), repeat)
+
+    return {
+        'lines': lines,
+        'words': len(binary),
+        'assemble': {'seconds': seconds, 'lines_per_second': lines / seconds},
+        'stages': stages,
+        'write': write,
+        'decode': None if decode is None else {'seconds': decode, 'words_per_second': len(binary) / decode},
+        'peak_rss': peak_rss(),
+    }
+
+
+def run(instructions: int, scenarios: List[str], repeat: int = 3) -> Dict:
+    """Mide cada escenario en un proceso propio, para que su RSS máxima no incluya la de otros"""
+    results = {}
+    for name in scenarios:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            results[name] = executor.submit(run_scenario, name, instructions, repeat).result()
+    return {
+        'instructions': instructions,
+        'python': platform.python_version(),
+        'scenarios': results,
+    }
+
+
+def metrics(result: Dict) -> Dict[str, float]:
+    """Valores que se comparan con la línea base, con nombres como 'simple.assemble'"""
+    values = {}
+    for name, scenario in result['scenarios'].items():
+        values[f'{name}.assemble'] = scenario['assemble']['seconds']
+        for output_format, seconds in scenario['write'].items():
+            values[f'{name}.write.{output_format}'] = seconds
+        if scenario['decode'] is not None:
+            values[f'{name}.decode'] = scenario['decode']['seconds']
+        if scenario['peak_rss'] is not None:
+            values[f'{name}.peak_rss'] = scenario['peak_rss']
+    return values
+
+
+def compare(result: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Las métricas que empeoraron más que tolerance respecto de la línea base"""
+    if baseline.get('instructions') != result['instructions']:
+        return [f"La línea base se midió con {baseline.get('instructions')} instrucciones, no {result['instructions']}"]
+    current = metrics(result)
+    regressions = []
+    for key, previous in metrics(baseline).items():
+        value = current.get(key)
+        if value is None or (not key.endswith('peak_rss') and previous < MIN_SECONDS):
+            continue
+        if value > previous * (1 + tolerance):
+            regressions.append(f"{key}: {value:.4g} (línea base {previous:.4g}, {value / previous - 1:+.0%})")
+    return regressions
+
+
+def report(result: Dict) -> str:
+    lines = [f"Instrucciones por programa: {result['instructions']} (Python {result['python']})"]
+    for name, scenario in result['scenarios'].items():
+        rss = scenario['peak_rss']
+        lines.append(f"{name}: {scenario['lines']} líneas, {scenario['words']} palabras"
+                     + (f", RSS máxima {rss / 2**20:.1f} MB" if rss is not None else ''))
+        lines.append(f"  {'archivo completo':<18}{scenario['assemble']['seconds'] * 1000:9.2f} ms "
+                     f"{scenario['assemble']['lines_per_second']:12,.0f} líneas/s")
+        for stage, values in scenario['stages'].items():
+            lines.append(f"  {stage:<18}{values['seconds'] * 1000:9.2f} ms {values['lines_per_second']:12,.0f} líneas/s")
+        for output_format, seconds in scenario['write'].items():
+            lines.append(f"  {'escritura ' + output_format:<18}{seconds * 1000:9.2f} ms")
+        if scenario['decode'] is not None:
+            lines.append(f"  {'decodificación':<18}{scenario['decode']['seconds'] * 1000:9.2f} ms "
+                         f"{scenario['decode']['words_per_second']:12,.0f} palabras/s")
+    return '\n'.join(lines)
+
+
+def _write_json(result: Dict, path: str) -> None:
+    with open(path, 'w') as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark del pipeline de ensamblaje')
+    parser.add_argument('-n', '--instructions', type=int, default=50000, help='Líneas de CODE de cada programa')
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS), help='Escenario a medir (por defecto, todos)')
+    parser.add_argument('--repeat', type=int, default=3, help='Repeticiones por medición (se usa la mejor)')
+    parser.add_argument('--output', default=None, help='Guardar el resultado como JSON')
+    parser.add_argument('--baseline', default=None, help='Línea base con que comparar; una regresión termina con código 1')
+    parser.add_argument('--save-baseline', default=None, help='Guardar el resultado como nueva línea base')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Empeoramiento aceptado respecto de la línea base')
+    args = parser.parse_args()
+
+    result = run(args.instructions, args.scenario or list(SCENARIOS), args.repeat)
+    print(report(result))
+    if args.output:
+        _write_json(result, args.output)
+    if args.save_baseline:
+        _write_json(result, args.save_baseline)
+        print(f"Línea base guardada en {args.save_baseline}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(result, json.load(f), args.tolerance)
+        if regressions:
+            print(f"Regresiones respecto de {args.baseline} (tolerancia {args.tolerance:.0%}):")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"Sin regresiones respecto de {args.baseline}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+Genera programas sintéticos válidos para medir el ensamblador: cantidad de
+instrucciones, densidad de etiquetas, saltos por etiqueta, arrays de DATA y
+texto con muchas macros o comentarios. Con la misma semilla se obtiene
+siempre el mismo programa.
+
+Uso: python -m benchmarks.programs [-n INSTRUCCIONES] [--scenario NOMBRE] [-o ARCHIVO]
+"""
+import argparse
+import random
+from typing import Dict, List
+
+# Instrucciones sin etiquetas; {var} es una variable escalar y {array} un array de DATA
+BODY_INSTRUCTIONS = [
+    'MOV A,B', 'MOV B,A', 'MOV A,42', 'MOV B,FFh', 'MOV A,({var})', 'MOV ({var}),A',
+    'MOV B,{array}', 'MOV A,(B)', 'MOV (B),A', 'ADD A,B', 'ADD A,({var})', 'SUB B,3',
+    'AND A,(12)', 'OR B,A', 'XOR A,A', 'NOT A', 'SHL A', 'SHR B,A', 'INC B', 'DEC A',
+    'CMP A,0', 'CMP A,(B)', 'PUSH A', 'POP B', 'NOP',
+]
+JUMP_INSTRUCTIONS = ['JMP', 'JEQ', 'JNE', 'JGT', 'JLT', 'JCR']
+
+# Macros que se definen al inicio del programa con macros=True
+MACROS = """suma MACRO origen, destino
+    MOV A,(origen)
+    ADD A,(destino)
+    MOV (destino),A
+ENDM
+espera MACRO
+    LOCAL loop
+loop:
+    DEC A
+    JNE loop
+ENDM
+"""
+
+# Escenarios con que se mide el ensamblador (ver benchmarks.pipeline)
+SCENARIOS: Dict[str, Dict] = {
+    'simple': {},
+    'etiquetas': {'label_density': 0.2, 'jump_fan_in': 8},
+    'datos': {'arrays': 64, 'array_size': 256},
+    'macros': {'macros': 0.3},
+    'comentarios': {'comments': 0.5},
+}
+
+
+def generate_program(instructions: int = 10000, label_density: float = 0.02, jump_fan_in: int = 2,
+                     variables: int = 16, arrays: int = 4, array_size: int = 8,
+                     macros: float = 0.0, comments: float = 0.0, seed: int = 2343) -> str:
+    """
+    Programa de `instructions` líneas de CODE (una invocación de macro cuenta
+    como una). Se pone una etiqueta cada 1/label_density líneas y cada una
+    recibe en promedio jump_fan_in saltos desde cualquier parte del programa.
+    macros y comments son la fracción de líneas que son invocaciones de
+    macro y que llevan comentarios.
+    """
+    rng = random.Random(seed)
+    variable_names = [f'var{index}' for index in range(max(variables, 1))]
+    array_names = [f'tabla{index}' for index in range(max(arrays, 1))]
+
+    lines: List[str] = []
+    if macros:
+        lines.append(MACROS)
+    lines.append('DATA:')
+    for name in variable_names:
+        lines.append(f'{name} {rng.randrange(256)}')
+    for name in array_names:
+        lines.append(f"{name} {','.join(str(rng.randrange(256)) for _ in range(max(array_size, 1)))}")
+
+    labels = max(1, int(instructions * label_density))
+    jumps = min(labels * jump_fan_in, instructions // 2)
+    jump_positions = set(rng.sample(range(instructions), jumps))
+    label_every = max(1, instructions // labels)
+
+    lines.append('CODE:')
+    for index in range(instructions):
+        if index % label_every == 0 and index // label_every < labels:
+            lines.append(f'l{index // label_every}:')
+        if index in jump_positions:
+            line = f'{rng.choice(JUMP_INSTRUCTIONS)} l{rng.randrange(labels)}'
+        elif macros and rng.random() < macros:
+            line = 'espera' if rng.random() < 0.5 else f'suma {rng.choice(variable_names)}, {rng.choice(variable_names)}'
+        else:
+            line = rng.choice(BODY_INSTRUCTIONS).format(var=rng.choice(variable_names), array=rng.choice(array_names))
+        if comments and rng.random() < comments:
+            if rng.random() < 0.5:
+                line = f'{line} // comentario de la línea {index}'
+            else:
+                lines.append(f'/* bloque de comentario\n   antes de la línea {index} */')
+        lines.append(f'    {line}')
+    lines.append('fin:')
+    lines.append('    JMP fin')
+    return '\n'.join(lines) + '\n'
+
+
+def scenario_program(name: str, instructions: int, seed: int = 2343) -> str:
+    return generate_program(instructions, seed=seed, **SCENARIOS[name])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generador de programas sintéticos')
+    parser.add_argument('-n', '--instructions', type=int, default=10000, help='Cantidad de líneas de CODE')
+    parser.add_argument('--scenario', default='simple', choices=sorted(SCENARIOS), help='Parámetros del programa')
+    parser.add_argument('--seed', type=int, default=2343, help='Semilla del generador')
+    parser.add_argument('-o', '--output', default=None, help='Archivo de salida (por defecto, la salida estándar)')
+    args = parser.parse_args()
+
+    program = scenario_program(args.scenario, args.instructions, args.seed)
+    if args.output is None:
+        print(program, end='')
+    else:
+        with open(args.output, 'w') as f:
+            f.write(program)
+
+if __name__ == '__main__':
+    main()
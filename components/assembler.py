@@ -1,52 +1,289 @@
-from typing import List
-from components.fileProcessor import FileProcessor
-from components.codeProcessor import CodeProcessor
-from components.dataProcessor import DataProcessor
-from components.binaryGenerator import BinaryGenerator
+import os
+import threading
+from array import array
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from components.assemblyContext import AssemblyContext
 from components.configuration import Configuration
-from components.labelManager import LabelManager
-from components.memory import Memory
-from components.instructionProcessor import InstructionProcessor
+from components.instructionEncoder import DOUBLE_WORD_INSTRUCTIONS, InstructionEncoder
+from components.outputWriter import get_writer
+from components.valueConverter import ValueConverter
+from components.objectFile import (ObjectFile, Relocation, operand_symbol,
+                                   RELOC_CODE, RELOC_DATA, RELOC_EXTERNAL)
+from utils.exceptions import AssemblerError, InvalidOperandError, LabelError, with_location
+from utils.fingerprint import file_signature
+from utils.logger import logger
+from utils.profiling import AssemblyProfile
+
+if TYPE_CHECKING:
+    from components.batchAssembler import SourceResult
+
+def _context_attribute(name: str) -> property:
+    return property(lambda self: getattr(self.context, name),
+                    doc=f"{name} del último ensamblaje de este hilo (ver Assembler.context)")
+
 
 class Assembler:
-    def __init__(self, setup, verbose=False, load_data=False):
-        self.config = Configuration(setup)
+    """
+    Punto de entrada del ensamblador. El estado de cada ensamblaje vive en un
+    AssemblyContext nuevo, así que una misma instancia se puede reutilizar
+    para muchos programas seguidos o desde varios hilos a la vez.
+    """
+
+    def __init__(self, setup, verbose=False, load_data=False, optimize=False):
+        # Acepta el dict de setup.json o una Configuration ya cargada (Configuration.load)
+        self.config = setup if isinstance(setup, Configuration) else Configuration(setup)
         self.verbose = verbose
         self.load_data = load_data
-        self.memory = Memory()
-        self.label_manager = LabelManager()
-        self.instruction_processor = InstructionProcessor(self.config)
-        
-        self.file_processor = FileProcessor()
-        self.data_processor = DataProcessor(self.memory, self.load_data, self.verbose)
-        self.code_processor = CodeProcessor(self.label_manager, self.config)
-        self.binary_generator = BinaryGenerator(
-            self.instruction_processor, 
-            self.label_manager, 
-            self.memory, 
-            self.config, 
-            self.verbose
+        self.optimize = optimize
+        # Compartidos entre ensamblajes: dependen solo del setup y del texto de cada línea
+        self.encoder = InstructionEncoder(self.config)
+        self._code_memo: Dict = {}
+        self._include_memo: Dict = {}
+        # Directorio para las rutas relativas de INCLUDE e incbin (el del archivo de entrada)
+        self.base_dir: Optional[str] = None
+        self._local = threading.local()
+
+    def new_context(self, base_dir: Optional[str] = None) -> AssemblyContext:
+        """Crea el contexto de un ensamblaje y lo deja como el actual de este hilo"""
+        context = AssemblyContext(
+            self.config,
+            self.encoder,
+            self.load_data,
+            self.optimize,
+            self.verbose,
+            self.base_dir if base_dir is None else base_dir,
+            self._code_memo,
+            self._include_memo,
         )
+        self._local.context = context
+        return context
+
+    @property
+    def context(self) -> AssemblyContext:
+        """El contexto del último ensamblaje hecho en este hilo (uno vacío si aún no hay)"""
+        context = getattr(self._local, 'context', None)
+        return self.new_context() if context is None else context
 
-    def assemble(self, instructions: str) -> List[str]:
+    memory = _context_attribute('memory')
+    label_manager = _context_attribute('label_manager')
+    instruction_processor = _context_attribute('instruction_processor')
+    file_processor = _context_attribute('file_processor')
+    data_processor = _context_attribute('data_processor')
+    binary_generator = _context_attribute('binary_generator')
+    optimizer = _context_attribute('optimizer')
+
+    def assemble(self, instructions: str, base_dir: Optional[str] = None,
+                 profile: Optional[AssemblyProfile] = None) -> array:
         if self.verbose:
-            print("Iniciando proceso de ensamblaje...")
-        
-        cleaned_instructions, data_lines, code_lines = self.file_processor.process(instructions)
-        
-        self.data_processor.process(data_lines)
-        self.code_processor.process(code_lines)
-        
-        binary = self.binary_generator.generate(cleaned_instructions)
+            logger.info("Iniciando proceso de ensamblaje...")
+
+        if profile is not None:
+            # Los mensajes de verbose quedan fuera de las etapas medidas
+            binary = self._assemble_profiled(instructions, base_dir, profile)
+        else:
+            context = self.new_context(base_dir)
+            cleaned_instructions, data_lines, code_lines = context.file_processor.process(instructions)
+
+            context.data_processor.process(data_lines)
+            code = self.prepare_code(code_lines, context)
+
+            binary = context.binary_generator.generate(code)
         
         if self.verbose:
-            print("Ensamblaje completado.")
+            logger.info("Ensamblaje completado.")
+            logger.flush()
         
         return binary
 
-    def write(self, binary: List[str], filename: str) -> None:
-        with open(filename, 'w') as f:
-            for instruction in binary:
-                f.write(instruction + '\n')
+    def _assemble_profiled(self, instructions: str, base_dir: Optional[str], profile: AssemblyProfile) -> array:
+        """Igual que assemble, midiendo cada etapa en profile"""
+        literal_cache = ValueConverter.literal_cache_stats()
+        context = self.new_context(base_dir)
+        with profile.stage('FileProcessor') as stage:
+            _, data_lines, code_lines = context.file_processor.process(instructions)
+            stage['lines'] = instructions.count('\n') + 1
+        with profile.stage('DataProcessor') as stage:
+            context.data_processor.process(data_lines)
+            stage['lines'] = len(data_lines)
+        with profile.stage('CodeProcessor') as stage:
+            code_lines = self.prepare_code(code_lines, context)
+            stage['lines'] = len(code_lines)
+        with profile.stage('BinaryGenerator') as stage:
+            # Las líneas se siguen entregando de a una para medir cada una
+            binary = context.binary_generator.generate(profile.time_lines(code_lines))
+            stage['lines'] = len(code_lines)
+        profile.set_literal_cache(literal_cache, ValueConverter.literal_cache_stats())
+        return binary
+
+    def assemble_many(self, sources: Sequence[str], workers: Optional[int] = None,
+                      processes: bool = True, base_dir: Optional[str] = None) -> List['SourceResult']:
+        """
+        Ensambla varios programas en paralelo (ver batchAssembler.assemble_sources).
+        Entrega un SourceResult por programa, en orden, con las palabras, la
+        imagen de DATA o el error de ese programa.
+        """
+        # Import local: batchAssembler importa Assembler dentro de sus procesos
+        from components.batchAssembler import assemble_sources
+        return assemble_sources(self, sources, workers, processes, base_dir)
+
+    def assemble_object(self, instructions: str, name: str = '', base_dir: Optional[str] = None) -> ObjectFile:
+        """
+        Ensambla un módulo para enlazarlo después con otros (ver Linker). Las
+        etiquetas y variables de otros módulos se codifican con literal 0 y
+        quedan como reubicaciones, igual que las direcciones del propio módulo.
+        Solo los nombres declarados con GLOBAL son visibles desde otros módulos.
+        """
+        if self.load_data or self.optimize:
+            # Ambas dependen de direcciones finales, que se conocen recién al enlazar
+            raise InvalidOperandError("load_data y optimize no se pueden usar al ensamblar un módulo")
+
+        context = self.new_context(base_dir)
+        _, data_lines, code_lines = context.file_processor.process(instructions)
+        context.data_processor.process(data_lines)
+        labels = {line[:-1] for line, _ in code_lines if line.endswith(':')}
+        symbols = context.memory.data
+        exports = tuple(dict.fromkeys(context.file_processor.preprocessor.exported))
+        for symbol in exports:
+            if symbol not in labels and symbol not in symbols:
+                raise LabelError(f"GLOBAL de un símbolo no definido en el módulo: {symbol}")
+
+        lines = []
+        relocations = []
+        address = 0
+        for line, location in code_lines:
+            if line.endswith(':'):
+                lines.append((line, location))
+                continue
+            try:
+                instruction_name, operands = context.instruction_processor._parse_instruction(line)
+            except AssemblerError as e:
+                raise with_location(e, location) from None
+            referenced = [(index, operand_symbol(operand)) for index, operand in enumerate(operands)]
+            referenced = [(index, symbol) for index, symbol in referenced if symbol is not None]
+            if len(referenced) > 1:
+                raise with_location(InvalidOperandError(f"Más de una etiqueta o variable en: {line}"), location)
+            if referenced:
+                index, symbol = referenced[0]
+                if symbol in labels:
+                    relocations.append(Relocation(address, RELOC_CODE, symbol))
+                elif symbol in symbols:
+                    relocations.append(Relocation(address, RELOC_DATA, symbol))
+                else:
+                    # Símbolo de otro módulo: se codifica como la dirección 0
+                    relocations.append(Relocation(address, RELOC_EXTERNAL, symbol))
+                    operands[index] = '(0)' if operands[index].startswith('(') else '0'
+                    line = f"{instruction_name} {', '.join(operands)}"
+            lines.append((line, location))
+            address += 2 if instruction_name in DOUBLE_WORD_INSTRUCTIONS else 1
+
+        words = context.binary_generator.generate(lines)
+        included = context.file_processor.preprocessor.included + context.data_processor.included_files(data_lines)
+        return ObjectFile(
+            name=name,
+            words=words,
+            labels=dict(context.label_manager.labels),
+            symbols=dict(symbols),
+            data=array(context.memory.memory.typecode, context.memory.memory),
+            relocations=tuple(relocations),
+            dependencies=tuple((path, file_signature(path)) for path in included),
+            exports=exports,
+        )
+
+    def assemble_iter(self, lines: Iterable[str], base_dir: Optional[str] = None) -> Iterator[Tuple[int, int]]:
+        """
+        Ensambla leyendo las líneas de forma perezosa y entrega tuplas
+        (dirección, palabra) apenas se generan. Una dirección repetida trae la
+        palabra corregida de un salto hacia una etiqueta posterior.
+        """
+        if self.verbose:
+            logger.info("Iniciando proceso de ensamblaje...")
+
+        context = self.new_context(base_dir)
+        yield from context.binary_generator.generate_iter(self._iter_code(context, lines))
+
+        if self.verbose:
+            logger.info("Ensamblaje completado.")
+            logger.flush()
+
+    def _iter_code(self, context: AssemblyContext, lines: Iterable[str]) -> Iterator[Tuple[str, int]]:
+        """
+        Procesa la sección DATA a medida que llega y entrega las líneas de CODE
+        con su número de línea. Con optimize, CODE se acumula completo antes de
+        optimizarlo.
+        """
+        in_code = False
+        code_lines = []
+        for section, line, line_number in context.file_processor.iter_sections(lines):
+            if section == 'DATA':
+                context.data_processor.feed(line, line_number)
+                continue
+            if not in_code:
+                context.data_processor.flush()
+                in_code = True
+                if not self.optimize:
+                    yield from self.preload_lines(context)
+            if self.optimize:
+                code_lines.append((line, line_number))
+            else:
+                yield line, line_number
+        if self.optimize and in_code:
+            yield from self.prepare_code(code_lines, context)
+
+    def prepare_code(self, code_lines: List[Tuple[str, int]],
+                     context: Optional[AssemblyContext] = None) -> List[Tuple[str, int]]:
+        """Antepone la precarga de DATA y, con optimize, aplica el optimizador de mirilla"""
+        context = context or self.context
+        code_lines = self.preload_lines(context) + code_lines
+        if self.optimize:
+            code_lines = context.optimizer.optimize(code_lines)
+        return code_lines
+
+    def preload_lines(self, context: Optional[AssemblyContext] = None) -> List[Tuple[str, int]]:
+        """Con load_data, las instrucciones que cargan DATA en la RAM, como líneas de CODE sin número"""
+        if not self.load_data:
+            return []
+        context = context or self.context
+        return [(line, 0) for line in context.data_processor.generate_init_code(self.encoder.max_literal)]
+
+    def write_stream(self, lines: Iterable[str], filename: str) -> int:
+        """
+        Ensambla en modo streaming escribiendo cada palabra en cuanto se genera.
+        Cada línea de salida tiene largo fijo, así que los saltos corregidos se
+        sobrescriben en su posición. Retorna la cantidad de palabras escritas.
+        """
+        to_binary = self.encoder.to_binary
+        record_length = self.config.word_length + 1
+        temporary = filename + '.tmp'
+        count = 0
+        try:
+            with open(temporary, 'wb') as f:
+                for address, word in self.assemble_iter(lines):
+                    record = (to_binary(word) + '\n').encode('ascii')
+                    if address == count:
+                        f.write(record)
+                        count += 1
+                    else:
+                        f.seek(address * record_length)
+                        f.write(record)
+                        f.seek(count * record_length)
+            os.replace(temporary, filename)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        if self.verbose:
+            logger.info("Código de máquina escrito en %s", filename)
+            logger.flush()
+        return count
+
+    def to_text(self, binary: array) -> List[str]:
+        """Convierte las palabras de máquina a strings de bits"""
+        to_binary = self.encoder.to_binary
+        return [to_binary(word) for word in binary]
+
+    def write(self, binary: array, filename: str, output_format: str = 'txt') -> None:
+        """Escribe las palabras en el formato pedido (ver OUTPUT_WRITERS)"""
+        get_writer(output_format, self.config.word_length).write(binary, filename)
         if self.verbose:
-            print(f"Código de máquina escrito en {filename}")
+            logger.info("Código de máquina escrito en %s", filename)
+            logger.flush()
@@ -0,0 +1,256 @@
+import json
+import os
+from array import array
+from typing import Dict, List, Tuple
+from components.instructionEncoder import DOUBLE_WORD_INSTRUCTIONS
+from components.memory import DATA_TYPECODE, Symbol
+from components.objectFile import operand_symbol
+from utils.exceptions import AssemblerError, LabelError, with_location
+from utils.fingerprint import file_signature, text_digest
+from utils.logger import logger
+
+# Cambiar al modificar lo que se guarda en disco
+CACHE_VERSION = 4
+
+# Palabras de una línea, etiquetas de las que dependen (nombre, dirección) y
+# si usa algún símbolo (etiqueta o variable de DATA)
+Entry = Tuple[Tuple[int, ...], Tuple[Tuple[str, int], ...], bool]
+
+
+class AssemblyCache:
+    """
+    Caché en disco para re-ensamblar un programa después de editarlo. Guarda,
+    indexado por el contenido de cada línea, su limpieza y sus palabras de
+    máquina junto con las direcciones de las etiquetas que usó, además de la
+    sección DATA ya procesada. En la siguiente ejecución solo se vuelven a
+    codificar las líneas nuevas y las que dependen de etiquetas que cambiaron
+    de dirección (o de variables, si cambió DATA).
+    """
+
+    def __init__(self, assembler, path: str):
+        self.assembler = assembler
+        self.path = path
+        self.setup_key = text_digest(json.dumps([assembler.config.digest, assembler.load_data, assembler.optimize]))
+        self.state = self._load()
+        self.stats = {}
+
+    def _empty_state(self) -> Dict:
+        return {
+            'version': CACHE_VERSION,
+            'setup_key': self.setup_key,
+            'source_key': None,
+            'words': array('Q'),
+            'data_key': None,
+            'data': None,
+            'included': [],
+            'comment_memo': {},
+            'clean_memo': {},
+            'entries': {},
+        }
+
+    def _load(self) -> Dict:
+        """
+        Lee la caché guardada por save (JSON, ver _to_json). Un archivo
+        ilegible, de otra versión o de otro setup.json se descarta.
+        """
+        try:
+            with open(self.path, 'r') as f:
+                stored = json.load(f)
+            if not isinstance(stored, dict) or stored.get('version') != CACHE_VERSION or stored.get('setup_key') != self.setup_key:
+                return self._empty_state()
+            return self._from_json(stored)
+        except (OSError, ValueError, KeyError, TypeError):
+            return self._empty_state()
+
+    def save(self) -> None:
+        temporary = self.path + '.tmp'
+        with open(temporary, 'w') as f:
+            # dumps usa el codificador en C; dump escribe por partes y es varias veces más lento
+            f.write(json.dumps(self._to_json(self.state), separators=(',', ':')))
+        os.replace(temporary, self.path)
+
+    @staticmethod
+    def _to_json(state: Dict) -> Dict:
+        """
+        Formato en disco: un objeto JSON con los mismos campos que el estado.
+        words es la lista de palabras, data es {symbols: {nombre: [dirección,
+        tamaño, tipo]}, memory: [celdas], next_address}, included es una lista
+        de [ruta, [mtime_ns, tamaño] o null] y cada entrada de entries es
+        [palabras, [[etiqueta, dirección], ...], usa_símbolos].
+        """
+        stored = dict(state)
+        stored['words'] = state['words'].tolist()
+        if state['data'] is not None:
+            symbols, memory, next_address = state['data']
+            stored['data'] = {
+                'symbols': {name: list(symbol) for name, symbol in symbols.items()},
+                'memory': memory.tolist(),
+                'next_address': next_address,
+            }
+        return stored
+
+    @staticmethod
+    def _from_json(stored: Dict) -> Dict:
+        state = dict(stored)
+        state['words'] = array('Q', stored['words'])
+        if stored['data'] is not None:
+            data = stored['data']
+            symbols = {name: Symbol(*symbol) for name, symbol in data['symbols'].items()}
+            state['data'] = (symbols, array(DATA_TYPECODE, data['memory']), int(data['next_address']))
+        state['included'] = [(path, None if signature is None else tuple(signature)) for path, signature in stored['included']]
+        # Las entradas quedan como listas, que se leen igual que las tuplas de Entry
+        for key in ('comment_memo', 'clean_memo', 'entries'):
+            if not isinstance(stored[key], dict):
+                raise TypeError(f"Campo inválido en la caché: {key}")
+        return state
+
+    def _snapshot_memory(self) -> Tuple[Dict, array, int]:
+        memory = self.assembler.memory
+        return dict(memory.data), array(memory.memory.typecode, memory.memory), memory.next_data_address
+
+    def _restore_memory(self, snapshot: Tuple[Dict, array, int]) -> None:
+        memory = self.assembler.memory
+        data, values, next_data_address = snapshot
+        memory.data = dict(data)
+        memory.memory = array(values.typecode, values)
+        memory.next_data_address = next_data_address
+
+    def assemble(self, source: str) -> array:
+        """Ensambla source reutilizando todo lo posible de la ejecución anterior y actualiza la caché."""
+        state = self.state
+        source_key = text_digest(source)
+        if source_key == state['source_key'] and self._included_unchanged():
+            self.assembler.new_context()
+            self._restore_memory(state['data'])
+            binary = array('Q', state['words'])
+            self.stats = {'source_hit': True, 'lines': len(binary), 'encoded': 0}
+            return binary
+
+        assembler = self.assembler
+        assembler.new_context()
+        file_processor = assembler.file_processor
+        file_processor.comment_memo = state['comment_memo']
+        file_processor.clean_memo = state['clean_memo']
+        try:
+            _, data_lines, code_lines = file_processor.process(source)
+        finally:
+            file_processor.comment_memo = None
+            file_processor.clean_memo = None
+
+        # Los archivos de incbin también son parte de DATA
+        data_files = [(path, file_signature(path)) for path in assembler.data_processor.included_files(data_lines)]
+        data_key = text_digest('\n'.join([line for line, _ in data_lines] + [f'{path}:{signature}' for path, signature in data_files]))
+        # Los de INCLUDE ya quedaron expandidos en las líneas, pero invalidan un acierto por el texto fuente
+        included = data_files + [(path, file_signature(path)) for path in file_processor.preprocessor.included]
+        data_changed = data_key != state['data_key']
+        if data_changed:
+            assembler.memory.reset()
+            assembler.data_processor.process(data_lines)
+        else:
+            self._restore_memory(state['data'])
+
+        code_lines = assembler.prepare_code(code_lines)
+        entries = state['entries']
+        self._assign_labels(code_lines, entries)
+        binary, new_entries, encoded = self._encode(code_lines, entries, data_changed)
+
+        state.update({
+            'source_key': source_key,
+            'words': binary,
+            'data_key': data_key,
+            'data': self._snapshot_memory(),
+            'included': included,
+            'entries': new_entries,
+        })
+        self._prune_memos(source)
+        self.save()
+
+        self.stats = {'source_hit': False, 'lines': len(code_lines), 'encoded': encoded}
+        if assembler.verbose:
+            logger.info("Caché de ensamblaje: %d de %d instrucciones codificadas", encoded, len(new_entries))
+            logger.flush()
+        return binary
+
+    def dependencies(self) -> List[str]:
+        """Archivos de INCLUDE e incbin del último ensamblaje guardado"""
+        return [path for path, _ in self.state['included']]
+
+    def _included_unchanged(self) -> bool:
+        return all(file_signature(path) == signature for path, signature in self.state['included'])
+
+    def _assign_labels(self, code_lines: List[Tuple[str, int]], entries: Dict[str, Entry]) -> None:
+        """Calcula la dirección de todas las etiquetas antes de codificar"""
+        label_manager = self.assembler.label_manager
+        label_manager.reset()
+        address = 0
+        for line, location in code_lines:
+            if line.endswith(':'):
+                try:
+                    label_manager.add_label(line[:-1], address)
+                except AssemblerError as e:
+                    raise with_location(e, location) from None
+                continue
+            entry = entries.get(line)
+            if entry is not None:
+                address += len(entry[0])
+            else:
+                address += 2 if line.split(None, 1)[0] in DOUBLE_WORD_INSTRUCTIONS else 1
+
+    def _encode(self, code_lines: List[Tuple[str, int]], entries: Dict[str, Entry],
+                data_changed: bool) -> Tuple[array, Dict[str, Entry], int]:
+        assembler = self.assembler
+        labels = assembler.label_manager.labels
+        binary = array('Q')
+        new_entries: Dict[str, Entry] = {}
+        encoded = 0
+
+        for line, location in code_lines:
+            if line.endswith(':'):
+                continue
+            # Las entradas de esta misma pasada ya están al día
+            entry = new_entries.get(line)
+            if entry is None:
+                entry = entries.get(line)
+                if entry is None or not self._is_valid(entry, labels, data_changed):
+                    try:
+                        entry = self._encode_line(line, len(binary))
+                    except AssemblerError as e:
+                        raise with_location(e, location) from None
+                    encoded += 1
+                new_entries[line] = entry
+            binary.extend(entry[0])
+        return binary, new_entries, encoded
+
+    @staticmethod
+    def _is_valid(entry: Entry, labels: Dict[str, int], data_changed: bool) -> bool:
+        _, dependencies, uses_symbols = entry
+        if uses_symbols and data_changed:
+            return False
+        return all(labels.get(name) == address for name, address in dependencies)
+
+    def _encode_line(self, line: str, address: int) -> Entry:
+        assembler = self.assembler
+        processor = assembler.instruction_processor
+        labels = assembler.label_manager.labels
+        _, operands = processor._parse_instruction(line)
+
+        symbols = [symbol for symbol in map(operand_symbol, operands) if symbol is not None]
+
+        words = processor.encode(line, labels, assembler.memory.data, assembler.memory, address, self._undefined_label)
+        dependencies = tuple((symbol, labels[symbol]) for symbol in symbols if symbol in labels)
+        return words, dependencies, bool(symbols)
+
+    @staticmethod
+    def _undefined_label(label: str, address: int) -> None:
+        # Todas las etiquetas ya tienen dirección, así que una referencia pendiente no existe
+        raise LabelError(f"Etiqueta no definida: {label}")
+
+    def _prune_memos(self, source: str) -> None:
+        """Conserva solo las líneas del programa actual para que la caché no crezca sin límite"""
+        comment_memo = self.state['comment_memo']
+        if len(comment_memo) <= 2 * (source.count('\n') + 1):
+            return
+        lines = set(self.assembler.file_processor._remove_multiline_comments(source).split('\n'))
+        self.state['comment_memo'] = {line: value for line, value in comment_memo.items() if line in lines}
+        kept = set(self.state['comment_memo'].values())
+        self.state['clean_memo'] = {line: value for line, value in self.state['clean_memo'].items() if line in kept}
@@ -0,0 +1,49 @@
+from typing import Dict, List, Optional
+from components.binaryGenerator import BinaryGenerator
+from components.configuration import Configuration
+from components.dataProcessor import DataProcessor
+from components.fileProcessor import FileProcessor
+from components.instructionEncoder import InstructionEncoder
+from components.instructionProcessor import InstructionProcessor
+from components.labelManager import LabelManager
+from components.memory import Memory
+from components.peepholeOptimizer import PeepholeOptimizer
+
+
+class AssemblyContext:
+    """
+    Estado de un solo ensamblaje: memoria de DATA, etiquetas, líneas
+    tokenizadas, definiciones del preprocesador y estadísticas. Se crea uno
+    por cada llamada a Assembler.assemble, así que nada queda de la anterior.
+
+    La Configuration, el InstructionEncoder y los memos por línea se
+    comparten entre contextos: solo guardan resultados que dependen del texto
+    de cada línea, no del programa.
+    """
+
+    def __init__(self, config: Configuration, encoder: InstructionEncoder, load_data: bool = False,
+                 optimize: bool = False, verbose: bool = False, base_dir: Optional[str] = None,
+                 code_memo: Optional[Dict] = None, include_memo: Optional[Dict] = None):
+        self.config = config
+        self.load_data = load_data
+        self.optimize = optimize
+        self.memory = Memory()
+        self.label_manager = LabelManager()
+        self.instruction_processor = InstructionProcessor(config, encoder)
+
+        self.file_processor = FileProcessor(self.instruction_processor.parsed_lines, code_memo, include_memo)
+        self.data_processor = DataProcessor(self.memory, load_data, verbose)
+        self.binary_generator = BinaryGenerator(
+            self.instruction_processor,
+            self.label_manager,
+            self.memory,
+            config,
+            verbose
+        )
+        self.optimizer = PeepholeOptimizer(self.instruction_processor, verbose)
+        self.data_processor.base_dir = base_dir
+        self.file_processor.preprocessor.base_dir = base_dir
+
+    def dependencies(self) -> List[str]:
+        """Archivos de INCLUDE e incbin que leyó este ensamblaje (para --watch)"""
+        return self.file_processor.preprocessor.included + self.data_processor.included
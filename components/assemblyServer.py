@@ -0,0 +1,182 @@
+import json
+import os
+import socket
+import socketserver
+import stat
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+from components.outputWriter import OUTPUT_WRITERS, output_path
+from utils.exceptions import AssemblerError
+from utils.fingerprint import file_signature
+
+# Bytes leídos por el cliente en cada llamada a recv
+RECV_SIZE = 65536
+
+
+class AssemblyService:
+    """
+    Atiende pedidos de ensamblaje con un Assembler ya inicializado, para no
+    volver a pagar el inicio del intérprete, los imports y la lectura de
+    setup.json por cada archivo.
+
+    Un pedido es un dict con 'input' (ruta del programa), y opcionalmente
+    'format' y 'output' (por defecto <nombre>.out.<formato> junto al
+    programa). La respuesta tiene 'ok' y, según el caso, 'output' y 'words'
+    o 'error'.
+    """
+
+    def __init__(self, assembler):
+        self.assembler = assembler
+        self.requests = 0
+
+    def handle(self, request: Dict) -> Dict:
+        self.requests += 1
+        try:
+            path = request['input']
+            output_format = request.get('format', 'txt')
+            if output_format not in OUTPUT_WRITERS:
+                return {'ok': False, 'error': f"Formato de salida desconocido: {output_format}"}
+            output = request.get('output') or output_path(path, output_format)
+            with open(path, 'r') as f:
+                binary = self.assembler.assemble(f.read(), os.path.dirname(os.path.abspath(path)))
+            self.assembler.write(binary, output, output_format)
+        except KeyError as e:
+            return {'ok': False, 'error': f"Pedido sin el campo {e}"}
+        except (AssemblerError, OSError) as e:
+            return {'ok': False, 'error': str(e)}
+        except Exception as e:
+            # Un programa inválido no debe botar el servidor
+            return {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+        return {'ok': True, 'output': output, 'words': len(binary)}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Un pedido JSON por línea y una respuesta JSON por línea, en la misma conexión"""
+
+    def handle(self) -> None:
+        service = self.server.service
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                response = {'ok': False, 'error': f"JSON inválido: {e}"}
+            else:
+                if request.get('command') == 'shutdown':
+                    self._send({'ok': True})
+                    self.server.stop_requested = True
+                    return
+                response = service.handle(request)
+            self._send(response)
+
+    def _send(self, response: Dict) -> None:
+        self.wfile.write((json.dumps(response) + '\n').encode('utf-8'))
+        self.wfile.flush()
+
+
+class AssemblyServer(socketserver.UnixStreamServer):
+    """
+    Servidor local sobre un socket Unix. Atiende las conexiones de una en una
+    para que shutdown responda apenas termina el pedido en curso.
+    """
+
+    def __init__(self, socket_path: str, service: AssemblyService):
+        _remove_stale_socket(socket_path)
+        self.service = service
+        self.socket_path = socket_path
+        self.stop_requested = False
+        super().__init__(socket_path, _RequestHandler)
+        # Al cerrar solo se borra el socket propio, no uno que lo haya reemplazado
+        self._socket_id = _file_id(socket_path)
+
+    def serve_until_shutdown(self) -> None:
+        try:
+            while not self.stop_requested:
+                self.handle_request()
+        finally:
+            self.server_close()
+
+    def server_close(self) -> None:
+        super().server_close()
+        if _file_id(self.socket_path) == self._socket_id:
+            os.remove(self.socket_path)
+
+
+def _file_id(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        info = os.stat(path)
+    except OSError:
+        return None
+    return info.st_dev, info.st_ino
+
+
+def _remove_stale_socket(socket_path: str) -> None:
+    """
+    Borra el socket que dejó un servidor que ya no corre. Si la ruta no es un
+    socket o un servidor todavía responde en ella, lanza FileExistsError.
+    """
+    try:
+        mode = os.stat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{socket_path} ya existe y no es un socket")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(socket_path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.remove(socket_path)
+            return
+    raise FileExistsError(f"Ya hay un servidor escuchando en {socket_path}")
+
+
+def request(socket_path: str, requests: Sequence[Dict]) -> List[Dict]:
+    """Envía los pedidos por una sola conexión y retorna las respuestas en el mismo orden"""
+    payload = ''.join(json.dumps(item) + '\n' for item in requests).encode('utf-8')
+    responses = []
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        client.sendall(payload)
+        client.shutdown(socket.SHUT_WR)
+        buffer = b''
+        while len(responses) < len(requests):
+            chunk = client.recv(RECV_SIZE)
+            if not chunk:
+                break
+            buffer += chunk
+            *lines, buffer = buffer.split(b'\n')
+            responses.extend(json.loads(line) for line in lines if line)
+    return responses
+
+
+class FileWatcher:
+    """
+    Revisa periódicamente la fecha de modificación y el tamaño de un conjunto
+    de archivos. El conjunto se puede cambiar entre esperas, por ejemplo con
+    los archivos de INCLUDE e incbin del último ensamblaje.
+    """
+
+    def __init__(self, paths: Sequence[str], interval: float = 0.2):
+        self.interval = interval
+        self.signatures: Dict[str, Optional[Tuple[int, int]]] = {}
+        self.update(paths)
+
+    def update(self, paths: Sequence[str]) -> None:
+        """Observa paths; los archivos que ya se observaban conservan su última firma"""
+        previous = self.signatures
+        self.signatures = {path: previous[path] if path in previous else file_signature(path) for path in paths}
+
+    def wait(self) -> List[str]:
+        """Espera hasta que cambie algún archivo y retorna los que cambiaron"""
+        while True:
+            time.sleep(self.interval)
+            changed = []
+            for path, previous in self.signatures.items():
+                signature = file_signature(path)
+                if signature != previous:
+                    self.signatures[path] = signature
+                    changed.append(path)
+            if changed:
+                return changed
+
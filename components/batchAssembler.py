@@ -0,0 +1,174 @@
+import glob
+import os
+import time
+from array import array
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from components.outputWriter import output_path
+from utils.exceptions import AssemblerError
+
+# Caracteres que indican que una entrada es un patrón de glob
+GLOB_CHARACTERS = '*?['
+
+# Assembler y formato de salida de cada proceso del pool, fijados una sola vez en _init_worker
+_worker_assembler = None
+_worker_format = 'txt'
+
+
+class FileResult(NamedTuple):
+    input: str
+    output: str
+    ok: bool
+    words: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+class SourceResult(NamedTuple):
+    ok: bool
+    binary: Optional[array] = None
+    data: Optional[array] = None
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def words(self) -> int:
+        return len(self.binary) if self.binary is not None else 0
+
+
+def expand_inputs(patterns: Iterable[str]) -> List[str]:
+    """Expande los patrones de glob (por si la shell no lo hizo) sin repetir archivos"""
+    inputs = []
+    seen = set()
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) if any(c in pattern for c in GLOB_CHARACTERS) else [pattern]
+        for path in matches:
+            if path not in seen:
+                seen.add(path)
+                inputs.append(path)
+    return inputs
+
+
+def plan_outputs(inputs: List[str], output_format: str, directory: Optional[str] = None) -> List[Tuple[str, str]]:
+    """Asocia cada entrada con su archivo de salida; dos entradas no pueden escribir en el mismo"""
+    jobs = [(path, output_path(path, output_format, directory)) for path in inputs]
+    outputs = {}
+    for path, output in jobs:
+        if output in outputs:
+            raise ValueError(f"{path} y {outputs[output]} escribirían en {output}")
+        outputs[output] = path
+    return jobs
+
+
+def _init_worker(setup: Dict, output_format: str, load_data: bool = False, optimize: bool = False) -> None:
+    global _worker_assembler, _worker_format
+    # Import local: el proceso principal no necesita un Assembler propio
+    from components.assembler import Assembler
+    _worker_assembler = Assembler(setup, load_data=load_data, optimize=optimize)
+    _worker_format = output_format
+
+
+def _assemble_file(job: Tuple[str, str]) -> FileResult:
+    path, output = job
+    assembler = _worker_assembler
+    start = time.perf_counter()
+    try:
+        with open(path, 'r') as f:
+            binary = assembler.assemble(f.read(), os.path.dirname(os.path.abspath(path)))
+        assembler.write(binary, output, _worker_format)
+    except Exception as e:
+        # Un archivo con errores no debe detener el resto del lote
+        return FileResult(path, output, False, seconds=time.perf_counter() - start, error=_describe(e))
+    return FileResult(path, output, True, len(binary), time.perf_counter() - start)
+
+
+def assemble_source(assembler, source: str, base_dir: Optional[str] = None) -> SourceResult:
+    """Ensambla un programa ya leído; un error queda en el resultado en vez de propagarse"""
+    start = time.perf_counter()
+    try:
+        binary = assembler.assemble(source, base_dir)
+        memory = assembler.memory.memory
+        data = array(memory.typecode, memory)
+    except Exception as e:
+        return SourceResult(False, seconds=time.perf_counter() - start, error=_describe(e))
+    return SourceResult(True, binary, data, time.perf_counter() - start)
+
+
+def _assemble_source_job(job: Tuple[str, Optional[str]]) -> SourceResult:
+    source, base_dir = job
+    return assemble_source(_worker_assembler, source, base_dir)
+
+
+def assemble_sources(assembler, sources: Sequence[str], workers: Optional[int] = None,
+                     processes: bool = True, base_dir: Optional[str] = None) -> List[SourceResult]:
+    """
+    Ensambla programas ya leídos en un pool y entrega un SourceResult por
+    programa, en el orden de sources. Con processes se usa un
+    ProcessPoolExecutor cuyos procesos arman un Assembler igual al recibido,
+    para ocupar todos los núcleos. Si no, los hilos de un ThreadPoolExecutor
+    comparten el mismo Assembler, sin costo de inicio ni de copiar resultados.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(sources)) or 1
+    if workers == 1:
+        return [assemble_source(assembler, source, base_dir) for source in sources]
+
+    # Import local: concurrent.futures es lento de importar y solo se usa aquí
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    if not processes:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda source: assemble_source(assembler, source, base_dir), sources))
+
+    jobs = [(source, base_dir) for source in sources]
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(assembler.config, 'txt', assembler.load_data, assembler.optimize)) as executor:
+        return list(executor.map(_assemble_source_job, jobs, chunksize=chunksize))
+
+
+def _describe(error: Exception) -> str:
+    if isinstance(error, (AssemblerError, OSError)):
+        return str(error)
+    return f"{type(error).__name__}: {error}"
+
+
+def assemble_batch(setup: Dict, inputs: List[str], output_format: str = 'txt',
+                   output_dir: Optional[str] = None, workers: Optional[int] = None,
+                   load_data: bool = False, optimize: bool = False) -> List[FileResult]:
+    """
+    Ensambla muchos archivos repartiéndolos en un ProcessPoolExecutor. Cada
+    proceso arma su Assembler (y su Configuration) una vez y escribe sus
+    propias salidas, así que al proceso principal solo vuelve un FileResult
+    por archivo. Los resultados quedan en el orden de inputs.
+    """
+    jobs = plan_outputs(inputs, output_format, output_dir)
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+    workers = min(workers or os.cpu_count() or 1, len(jobs)) or 1
+
+    if workers == 1:
+        # Sin pool: lanzar procesos solo agrega costo
+        _init_worker(setup, output_format, load_data, optimize)
+        return [_assemble_file(job) for job in jobs]
+
+    # Import local: concurrent.futures es lento de importar y solo se usa aquí
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Varios archivos por envío para no pagar la comunicación por cada uno
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(setup, output_format, load_data, optimize)) as executor:
+        return list(executor.map(_assemble_file, jobs, chunksize=chunksize))
+
+
+def summarize(results: List[FileResult], elapsed: float) -> str:
+    """Resumen del lote con el detalle de los archivos que fallaron"""
+    failed = [result for result in results if not result.ok]
+    words = sum(result.words for result in results)
+    lines = [
+        f"Archivos: {len(results)} ({len(results) - len(failed)} exitosos, {len(failed)} con errores)",
+        f"Palabras generadas: {words}",
+        f"Tiempo: {elapsed:.3f} s ({len(results) / elapsed if elapsed else 0:.1f} archivos/s)",
+    ]
+    for result in failed:
+        lines.append(f"  Error en {result.input}: {result.error}")
+    return '\n'.join(lines)
@@ -1,8 +1,11 @@
-from typing import List
+from array import array
+from typing import Iterable, Iterator, List, Tuple
 from components.instructionProcessor import InstructionProcessor
 from components.labelManager import LabelManager
 from components.memory import Memory
 from components.configuration import Configuration
+from utils.exceptions import AssemblerError, LabelError, with_location
+from utils.logger import DEBUG, Deferred, logger
 
 class BinaryGenerator:
     def __init__(self, instruction_processor, label_manager, memory, config, verbose):
@@ -24,8 +27,7 @@ class BinaryGenerator:
         literal_bits = opcode[-self.config.lit_params['bits']:]
 
         # Encontrar el nombre de la instrucción
-        instruction_name = next((name for name, instr in self.config.instructions.items() 
-                               if instr['opcode'] == instruction_bits), "Unknown")
+        instruction_name = self.config.instructions_inverse.get(instruction_bits, "Unknown")
 
         # Instrucciones sin operandos
         if instruction_name in ['NOP', 'RET']:
@@ -69,94 +71,98 @@ class BinaryGenerator:
                 return f"{instruction_name} {param1} {param2}"
 
     def _decode_param(self, param: str) -> str:
-        return next((type_name for type_name, type_bits in self.config.types.items() if type_bits == param), "Unknown")
+        return self.config.types_inverse.get(param, "Unknown")
     
-    def generate(self, instructions: List[str]) -> List[str]:
-        binary = []
-        current_position = 0
-        instruction_positions = {}
+    def generate(self, instructions: Iterable[Tuple[str, int]]) -> array:
+        """
+        Genera las palabras de máquina como enteros empaquetados en un array('Q').
+        instructions son pares (línea, número de línea de origen).
+        """
+        binary = array('Q')
+        for address, word in self.generate_iter(instructions):
+            if address == len(binary):
+                binary.append(word)
+            else:
+                binary[address] = word
+        return binary
+
+    def generate_iter(self, instructions: Iterable[Tuple[str, int]]) -> Iterator[Tuple[int, int]]:
+        """
+        Genera las palabras en una sola pasada y entrega tuplas (dirección, palabra).
+        Los saltos a etiquetas que aún no aparecen se entregan con literal 0 y se
+        vuelven a entregar, ya corregidos, en cuanto se define la etiqueta; solo
+        esas palabras pendientes quedan en memoria.
+
+        Los errores llevan la línea de origen (con el archivo de INCLUDE o la
+        macro), y una etiqueta no definida, la de su primera referencia.
+        """
+        self.label_manager.reset()
+        pending = {}
+        # Línea de la primera referencia a cada etiqueta pendiente
+        first_references = {}
+        forward_references = []
+        record_forward_reference = lambda label, reference: forward_references.append(label)
+        address = 0
+        # Sin listado guardado ni verbose con nivel DEBUG, no se arma ninguna entrada
+        listing = logger.collecting or (self.verbose and logger.enabled(DEBUG))
         
-        # Primera pasada: generar código binario inicial
-        for instruction in instructions:
+        for instruction, location in instructions:
+            if instruction in ['DATA:', 'CODE:']:
+                continue
+
             if instruction.endswith(':'):
-                # Es una etiqueta, registrar su posición en el código binario
+                # Es una etiqueta, registrar su posición y corregir los saltos pendientes
                 label_name = instruction[:-1]
-                self.label_manager.labels[label_name] = len(binary)
-                continue
-            
-            if instruction in ['DATA:', 'CODE:']:
+                try:
+                    self.label_manager.add_label(label_name, address)
+                except AssemblerError as e:
+                    raise with_location(e, location) from None
+                first_references.pop(label_name, None)
+                for reference in self.label_manager.unresolved_labels.pop(label_name, ()):
+                    word = pending.pop(reference) | address
+                    if listing:
+                        logger.listing("\nInstrucción %d (etiqueta %s resuelta):\n%s", reference, label_name,
+                                       Deferred(self._format_binary_parts, word, label_name))
+                    yield reference, word
                 continue
 
-            instruction_name = instruction.split()[0]
-            instruction_positions[current_position] = len(binary)
-            
-            # Manejar instrucciones que generan dos instrucciones de máquina
-            if instruction_name in self.double_instructions:
-                result = self.instruction_processor.get_opcode(
-                    instruction,
-                    self.label_manager.labels,
-                    self.memory.data,
-                    self.memory,
-                    current_position
-                )
-                binary.extend(result)  # result será una lista de dos instrucciones
-                current_position += 2
-                
-                if self.verbose:
-                    print(f"\nInstrucción {len(binary)-2} (parte 1 de 2):")
-                    print(self._format_binary_parts(result[0], f"{instruction} (parte 1)"))
-                    print(f"\nInstrucción {len(binary)-1} (parte 2 de 2):")
-                    print(self._format_binary_parts(result[1], f"{instruction} (parte 2)"))
-            else:
-                result = self.instruction_processor.get_opcode(
+            # Las instrucciones POP y RET generan dos palabras de máquina
+            try:
+                words = self.instruction_processor.encode(
                     instruction,
                     self.label_manager.labels,
                     self.memory.data,
                     self.memory,
-                    current_position
+                    address,
+                    record_forward_reference
                 )
-                binary.append(result)
-                current_position += 1
-                
-                if self.verbose:
-                    print(f"\nInstrucción {len(binary)-1}:")
-                    print(self._format_binary_parts(result, instruction))
-
-        # Segunda pasada: resolver referencias a etiquetas
-        self._resolve_labels(binary)
-        
-        return binary
-
-    def _resolve_labels(self, binary: List[str]) -> None:
-        """Resuelve las referencias a etiquetas en el código binario"""
-        jump_opcodes = {
-            self.config.instructions[ins]['opcode']
-            for ins in ['JMP', 'JEQ', 'JNE', 'JGT', 'JGE', 'JLT', 'JLE', 'JCR', 'CALL']
-        }
-        
-        for i, instruction in enumerate(binary):
-            opcode = instruction[:self.config.instruction_params['bits']]
-            if opcode in jump_opcodes:
-                # Extraer la dirección actual
-                current_literal = int(instruction[-self.config.lit_params['bits']:], 2)
-                
-                # Mantener saltos a direcciones absolutas
-                if current_literal in self.label_manager.labels.values():
-                    continue
-                
-                # Procesar saltos relativos y a etiquetas
-                instruction_prefix = instruction[:self.config.word_length - self.config.lit_params['bits']]
-                if current_literal == i:  # Salto a sí mismo
-                    binary[i] = instruction_prefix + format(i, f'0{self.config.lit_params["bits"]}b')
-                else:
-                    # Buscar la etiqueta correspondiente
-                    for label, pos in self.label_manager.labels.items():
-                        if pos == current_literal:
-                            binary[i] = instruction_prefix + format(pos, f'0{self.config.lit_params["bits"]}b')
-                            break
-
-    def _format_binary_parts(self, binary: str, original_instruction: str) -> str:
+            except AssemblerError as e:
+                raise with_location(e, location) from None
+            if forward_references:
+                label_name = forward_references.pop()
+                self.label_manager.add_unresolved_label(label_name, address)
+                first_references.setdefault(label_name, location)
+                pending[address] = words[0]
+            
+            for part, word in enumerate(words):
+                if listing:
+                    if len(words) == 2:
+                        logger.listing("\nInstrucción %d (parte %d de 2):\n%s", address, part + 1,
+                                       Deferred(self._format_binary_parts, word, f"{instruction} (parte {part + 1})"))
+                    else:
+                        logger.listing("\nInstrucción %d:\n%s", address,
+                                       Deferred(self._format_binary_parts, word, instruction))
+                yield address, word
+                address += 1
+
+        # Las referencias que quedan apuntan a etiquetas no definidas
+        for label_name, location in first_references.items():
+            raise with_location(LabelError(f"Etiqueta no definida: {label_name}"), location)
+        self.label_manager.resolve_labels()
+
+    def _format_binary_parts(self, word: int, original_instruction: str) -> str:
         """Formatea una instrucción binaria en partes legibles."""
+        binary = self.instruction_processor.encoder.to_binary(word)
         opcode = binary[:self.config.instruction_params['bits']]
         params = binary[self.config.instruction_params['bits']:
                        self.config.instruction_params['bits'] + self.config.types_params['bits']]
@@ -168,11 +174,7 @@ class BinaryGenerator:
         param1_name = self.config.types_inverse.get(param1, 'None')
         param2_name = self.config.types_inverse.get(param2, 'None')
 
-        instruction_name = next(
-            (name for name, info in self.config.instructions.items() 
-             if info['opcode'] == opcode), 
-            'None'
-        )
+        instruction_name = self.config.instructions_inverse.get(opcode, 'None')
 
         formatted = (
             f"Instrucción: {original_instruction}\n"
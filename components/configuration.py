@@ -1,13 +1,115 @@
-from typing import List, Dict
+import json
+import marshal
+import os
+from functools import cached_property
+from types import MappingProxyType
+from typing import Any, List, Dict, Mapping, Optional
+from utils.fingerprint import file_signature, text_digest
+
+# Cambiar al modificar lo que se guarda en la configuración precompilada
+CONFIG_CACHE_VERSION = 1
+
+# La tabla precompilada depende también del código que la genera
+ENCODER_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instructionEncoder.py')
+
+def _freeze(value: Any) -> Any:
+    """Copia de solo lectura de un valor leído de JSON"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
 
 class Configuration:
-    def __init__(self, setup: Dict):
+    """
+    Descripción del ISA leída de setup.json junto con la tabla compilada de
+    InstructionEncoder. Es inmutable una vez creada, así que una misma
+    instancia se comparte entre ensamblajes, contextos e hilos.
+    """
+
+    def __init__(self, setup: Dict, encoder_table: Optional[Dict] = None):
+        self._frozen = False
+        self.setup = _freeze(setup)
         self.word_length = setup['config']['tamanoPalabra']
-        self.instruction_params = setup['config']['instrucciones']
-        self.types_params = setup['config']['tipos']
-        self.lit_params = setup['config']['literals']
-        self.instructions = setup['instrucciones']
-        self.types = setup['tipos']
-        
+        self.instruction_params = self.setup['config']['instrucciones']
+        self.types_params = self.setup['config']['tipos']
+        self.lit_params = self.setup['config']['literals']
+        self.instructions = self.setup['instrucciones']
+        self.types = self.setup['tipos']
+
         # Invertir el diccionario de tipos para facilitar la decodificación
-        self.types_inverse = {v: k for k, v in self.types.items()}
\ No newline at end of file
+        self.types_inverse = MappingProxyType({v: k for k, v in self.types.items()})
+        self.instructions_inverse = MappingProxyType({v['opcode']: k for k, v in self.instructions.items()})
+
+        # Tabla de InstructionEncoder: la precompilada (ver load) o se compila aquí
+        if encoder_table is None:
+            # Import local: el encoder importa este módulo
+            from components.instructionEncoder import InstructionEncoder
+            self.encoder_table = None
+            encoder_table = InstructionEncoder(self).table
+        self.encoder_table = MappingProxyType(encoder_table)
+        self._frozen = True
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if getattr(self, '_frozen', False):
+            raise AttributeError(f"Configuration es inmutable: no se puede cambiar '{name}'")
+        super().__setattr__(name, value)
+
+    def __reduce__(self):
+        # Para enviarla a otro proceso (los MappingProxyType no se pueden serializar)
+        return self.__class__, (self.to_dict(), dict(self.encoder_table))
+
+    @cached_property
+    def digest(self) -> str:
+        """Huella del setup, para las cachés que dependen de él"""
+        return text_digest(json.dumps(self.to_dict(), sort_keys=True))
+
+    def to_dict(self) -> Dict:
+        """El setup como dict modificable, igual al JSON original"""
+        return _thaw(self.setup)
+
+    @classmethod
+    def load(cls, path: str, cache_path: Optional[str] = None) -> 'Configuration':
+        """
+        Carga setup.json desde una versión precompilada (el JSON ya
+        interpretado junto con la tabla de InstructionEncoder) guardada con
+        marshal en cache_path, por defecto __pycache__/<nombre>.marshal junto
+        al JSON. La caché se usa solo si el JSON y el encoder no cambiaron de
+        fecha de modificación ni de tamaño; si no, se lee el JSON y se vuelve
+        a generar.
+        """
+        if cache_path is None:
+            directory, name = os.path.split(path)
+            cache_path = os.path.join(directory, '__pycache__', name + '.marshal')
+        key = (CONFIG_CACHE_VERSION, file_signature(path), file_signature(ENCODER_SOURCE))
+
+        try:
+            with open(cache_path, 'rb') as f:
+                cached_key, setup, table = marshal.load(f)
+            if cached_key == key:
+                return cls(setup, table)
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+
+        with open(path, 'r') as f:
+            setup = json.load(f)
+        config = cls(setup)
+        try:
+            os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+            temporary = cache_path + '.tmp'
+            with open(temporary, 'wb') as f:
+                marshal.dump((key, setup, dict(config.encoder_table)), f)
+            os.replace(temporary, cache_path)
+        except OSError:
+            # Sin permisos de escritura se sigue sin caché
+            pass
+        return config
@@ -1,6 +1,20 @@
-from typing import List, Tuple
-from components.memory import Memory
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+from components.memory import DATA_MASK, Memory
+from components.valueConverter import ValueConverter
 from utils.exceptions import MemoryError
+from utils.logger import Deferred, logger
+
+# Repetición: N dup(valor)
+DUP_PATTERN = re.compile(r'(\S+)\s+dup\s*\(\s*(.*?)\s*\)$')
+DUP_START_PATTERN = re.compile(r'(\S+)\s+dup\s*\(')
+
+# Inclusión de un archivo: incbin "ruta" (o sin comillas)
+INCBIN_PATTERN = re.compile(r'incbin\s+(?:"([^"]*)"|(\S+))$')
+
+# Extensiones que se leen como texto (valores separados por comas, espacios o saltos de línea)
+TEXT_EXTENSIONS = {'.csv', '.txt'}
 
 class DataProcessor:
     def __init__(self, memory: Memory, load_data: bool, verbose: bool):
@@ -8,44 +22,235 @@ class DataProcessor:
         self.load_data = load_data
         self.verbose = verbose
         self.data_init_code = []
+        self.preload_stats = {}
+        # Directorio para las rutas relativas de incbin (None: el directorio actual)
+        self.base_dir: Optional[str] = None
+        self.reset()
 
-    def process(self, data_lines: List[Tuple[str, int]]) -> None:
-        current_array_name = None
-        current_array_values = []
+    def reset(self) -> None:
+        """Descarta un array a medio leer de un ensamblaje anterior"""
+        self.current_array_name = None
+        self.current_array_values = []
+        # Archivos de incbin leídos
+        self.included: List[str] = []
 
+    def process(self, data_lines: List[Tuple[str, int]]) -> None:
+        self.reset()
         for line, line_number in data_lines:
-            try:
-                parts = line.split(None, 1)
-                
-                # Si tenemos solo un valor, podría ser parte de un array
-                if len(parts) == 1 and current_array_name is not None:
-                    current_array_values.append(parts[0])
-                    if self.verbose:
-                        print(f"DATA: {current_array_name}[{len(current_array_values)-1}] = {parts[0]}")
+            self.feed(line, line_number)
+        self.flush()
+
+    def feed(self, line: str, line_number: int) -> None:
+        """Procesa una línea de la sección DATA"""
+        try:
+            parts = line.split(None, 1)
+
+            # Valores sueltos, una lista o una repetición continúan el array en curso
+            if self.current_array_name is not None and self._continues_array(parts):
+                values = self._expand_values(line)
+                start = len(self.current_array_values)
+                self.current_array_values.extend(values)
+                if self.verbose:
+                    self._log_values(start, values)
+            else:
+                # Si estábamos procesando un array, guardarlo
+                self._store_current_array()
+
+                # Procesar nueva variable o inicio de array
+                if len(parts) != 2:
+                    raise MemoryError(f"Línea {line_number}: Formato inválido en la línea de datos")
+
+                name, value = parts
+                include = INCBIN_PATTERN.match(value)
+                if include:
+                    self._include(name, include.group(1) or include.group(2))
+                    return
+
+                self.current_array_name = name
+                self.current_array_values = self._expand_values(value)
+
+                if self.verbose:
+                    if len(self.current_array_values) == 1:
+                        logger.info("DATA: %s = %s", name, value)
+                    else:
+                        self._log_values(0, self.current_array_values)
+
+        except ValueError as e:
+            raise MemoryError(f"Línea {line_number}: {str(e)}")
+
+    def _log_values(self, start: int, values: List[str]) -> None:
+        if len(values) == 1:
+            logger.info("DATA: %s[%d] = %s", self.current_array_name, start, values[0])
+        else:
+            logger.info("DATA: %s[%d:%d] = %d valores", self.current_array_name, start, start + len(values), len(values))
+
+    @staticmethod
+    def _continues_array(parts: List[str]) -> bool:
+        if len(parts) == 1:
+            return True
+        # "1, 2, 3" o "10 dup(0)" no son una variable nueva
+        if parts[0].endswith(',') or parts[1].startswith(','):
+            return True
+        repeat = DUP_START_PATTERN.match(' '.join(parts))
+        return repeat is not None and ValueConverter.is_numeric(repeat.group(1))
+
+    def _expand_values(self, text: str) -> List[str]:
+        """Separa una lista de valores por comas y expande las repeticiones N dup(valor)"""
+        text = text.strip()
+        if ',' not in text and 'dup' not in text:
+            return [text]
+        if text.startswith('"'):
+            # Un string se guarda tal cual, aunque tenga comas
+            return [text]
+
+        if '(' in text or "'" in text:
+            items = self._split_list(text)
+        else:
+            items = [item.strip() for item in text.split(',')]
+        if not items[-1]:
+            # Coma final: la lista sigue en la línea siguiente
+            items.pop()
+        if '' in items:
+            raise ValueError("Valor vacío en la lista de datos")
+        if 'dup' not in text:
+            return items
+
+        values = []
+        for item in items:
+            repeat = DUP_PATTERN.match(item)
+            if repeat is None:
+                values.append(item)
+                continue
+            count = ValueConverter.parse_numeric(repeat.group(1))
+            if count < 0:
+                raise ValueError(f"Cantidad de repeticiones inválida: {repeat.group(1)}")
+            values.extend(self._expand_values(repeat.group(2)) * count)
+        return values
+
+    @staticmethod
+    def _split_list(text: str) -> List[str]:
+        """Separa por las comas que no están dentro de paréntesis ni son un carácter ','"""
+        items = []
+        depth = 0
+        start = 0
+        position = 0
+        while position < len(text):
+            char = text[position]
+            if char == "'" and position + 2 < len(text) and text[position + 2] == "'":
+                position += 3
+                continue
+            if char == '(':
+                depth += 1
+            elif char == ')':
+                depth -= 1
+            elif char == ',' and depth == 0:
+                items.append(text[start:position].strip())
+                start = position + 1
+            position += 1
+        items.append(text[start:].strip())
+        return items
+
+    def resolve_path(self, path: str) -> str:
+        if self.base_dir is None or os.path.isabs(path):
+            return path
+        return os.path.join(self.base_dir, path)
+
+    def included_files(self, data_lines: List[Tuple[str, int]]) -> List[str]:
+        """Rutas de los archivos que incluye la sección DATA (para invalidar cachés)"""
+        paths = []
+        for line, _ in data_lines:
+            parts = line.split(None, 1)
+            if len(parts) == 2:
+                include = INCBIN_PATTERN.match(parts[1])
+                if include:
+                    paths.append(self.resolve_path(include.group(1) or include.group(2)))
+        return paths
+
+    def _include(self, name: str, path: str) -> None:
+        """
+        Carga un archivo completo en la imagen de DATA: uno binario deja un
+        byte por celda y uno de texto (.csv o .txt) un valor por elemento.
+        """
+        resolved = self.resolve_path(path)
+        self.included.append(resolved)
+        try:
+            if os.path.splitext(path)[1].lower() in TEXT_EXTENSIONS:
+                with open(resolved, 'r') as f:
+                    values = f.read().replace(',', ' ').split()
+                self.memory.store_value(name, values)
+            else:
+                with open(resolved, 'rb') as f:
+                    self.memory.store_bytes(name, f.read())
+        except OSError as e:
+            raise ValueError(f"No se pudo leer {path}: {e.strerror}")
+
+        if self.verbose:
+            logger.info("DATA: %s = %s (%d valores)", name, path, self.memory.data[name].size)
+
+    def flush(self) -> None:
+        """Guarda el último array pendiente al terminar la sección DATA"""
+        self._store_current_array()
+
+    def generate_init_code(self, max_literal: int) -> List[str]:
+        """
+        Genera las instrucciones que escriben la imagen de DATA en la RAM al
+        inicio del programa. Las celdas en 0 se omiten (la RAM parte en 0) y
+        las celdas se agrupan por valor, así que cada valor distinto se carga
+        en A una sola vez: el costo es una instrucción por valor distinto más
+        una por celda distinta de 0. Al final A vuelve a 0.
+
+        Los negativos (guardados en complemento a 2 de 32 bits) se cargan
+        con el ancho del literal; un valor que no cabe en él es un error.
+        """
+        # Desde aquí hacia arriba, la celda es un negativo que cabe en el literal
+        min_negative = DATA_MASK - (max_literal >> 1)
+        addresses_by_value: Dict[int, List[int]] = {}
+        for address, value in enumerate(self.memory.memory):
+            if value > max_literal:
+                if value < min_negative:
+                    raise MemoryError(f"La variable '{self._symbol_at(address)}' tiene el valor {value}, "
+                                      f"que no cabe en el literal de {max_literal.bit_length()} bits de la precarga")
+                value &= max_literal
+            if value:
+                addresses = addresses_by_value.get(value)
+                if addresses is None:
+                    addresses_by_value[value] = [address]
                 else:
-                    # Si estábamos procesando un array, guardarlo
-                    if current_array_name is not None:
-                        self.memory.store_value(current_array_name, current_array_values)
-                        current_array_name = None
-                        current_array_values = []
-                    
-                    # Procesar nueva variable o inicio de array
-                    if len(parts) != 2:
-                        raise MemoryError(f"Línea {line_number}: Formato inválido en la línea de datos")
-                    
-                    name, value = parts
-                    current_array_name = name
-                    current_array_values = [value]
-                    
-                    if self.verbose:
-                        print(f"DATA: {name} = {value}")
-                        
-            except ValueError as e:
-                raise MemoryError(f"Línea {line_number}: {str(e)}")
-        
-        # Guardar el último array si existe
-        if current_array_name is not None:
-            self.memory.store_value(current_array_name, current_array_values)
-
-        if self.load_data and self.verbose:
-            print("Código de inicialización de datos generado")
\ No newline at end of file
+                    addresses.append(address)
+
+        code = []
+        for value in sorted(addresses_by_value):
+            code.append(f"MOV A, {value}")
+            code.extend([f"MOV ({address}), A" for address in addresses_by_value[value]])
+        if code:
+            code.append("MOV A, 0")
+
+        self.data_init_code = code
+        self.preload_stats = {
+            # Cada MOV es una palabra de ROM y un ciclo
+            'instructions': len(code),
+            'cycles': len(code),
+            'cells': len(self.memory.memory),
+            'written': sum(len(addresses) for addresses in addresses_by_value.values()),
+            'values': len(addresses_by_value),
+        }
+        if self.verbose:
+            logger.info("%s", Deferred(self.preload_summary))
+        return code
+
+    def _symbol_at(self, address: int) -> str:
+        """Nombre de la variable que ocupa la dirección, para los mensajes de error"""
+        for name, symbol in self.memory.data.items():
+            if symbol.address <= address < symbol.address + symbol.size:
+                return name if symbol.size == 1 else f"{name}[{address - symbol.address}]"
+        return str(address)
+
+    def preload_summary(self) -> str:
+        stats = self.preload_stats
+        return (f"Precarga de DATA: {stats['instructions']} instrucciones ({stats['cycles']} ciclos) "
+                f"para {stats['written']} de {stats['cells']} celdas con {stats['values']} valores distintos")
+
+    def _store_current_array(self) -> None:
+        if self.current_array_name is not None:
+            self.memory.store_value(self.current_array_name, self.current_array_values)
+            self.reset()
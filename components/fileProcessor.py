@@ -1,17 +1,105 @@
 import re
-from typing import List, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from components.lexer import ParsedLine, parse_line
+from components.preprocessor import Preprocessor
+
+# Máximo de líneas tokenizadas guardadas (por texto original y por texto limpio)
+PARSED_LINES_SIZE = 65536
 
 class FileProcessor:
+    def __init__(self, parsed_lines: Optional[Dict[str, ParsedLine]] = None,
+                 code_memo: Optional[Dict] = None, include_memo: Optional[Dict] = None):
+        # Resultados por línea reutilizables entre ensamblajes (ver AssemblyCache)
+        self.comment_memo = None
+        self.clean_memo = None
+        # Líneas de CODE ya tokenizadas, indexadas por su texto limpio
+        self.parsed_lines = {} if parsed_lines is None else parsed_lines
+        # Resultado del lexer por línea original; las líneas repetidas se tokenizan una vez
+        self._code_memo: Dict[str, Tuple[str, Optional[ParsedLine]]] = {} if code_memo is None else code_memo
+        # Constantes, macros, REPT e INCLUDE, expandidos antes de separar las secciones
+        self.preprocessor = Preprocessor(self._remove_multiline_comments, include_memo)
+
     def process(self, instructions: str) -> Tuple[List[str], List[Tuple[str, int]], List[Tuple[str, int]]]:
+        self.parsed_lines.clear()
         instructions = self._remove_multiline_comments(instructions)
         lines = instructions.split('\n')
-        return self._separate_sections(lines)
+        if not self.preprocessor.needed(instructions):
+            self.preprocessor.reset()
+            return self._separate_sections(lines)
+        lines, line_numbers = self.preprocessor.expand(lines)
+        return self._separate_sections(lines, line_numbers)
     
     def _remove_multiline_comments(self, text: str) -> str:
         return re.sub(r'/\*.*?\*/', '', text, flags=re.DOTALL)
 
+    def _iter_without_multiline_comments(self, lines: Iterable[str]) -> Iterator[str]:
+        """
+        Versión incremental de _remove_multiline_comments: entrega las líneas sin
+        comentarios /* */, uniendo el texto antes y después de un comentario que
+        abarca varias líneas. Si un comentario nunca se cierra, las líneas se
+        entregan sin cambios, igual que con la expresión regular.
+        """
+        pending = None
+        skipped = []
+        for line in lines:
+            line = line.rstrip('\n')
+            position = 0
+            if pending is not None:
+                end = line.find('*/')
+                if end == -1:
+                    skipped.append(line)
+                    continue
+                position = len(pending)
+                line = pending + line[end + 2:]
+                pending = None
+                skipped = []
+
+            while True:
+                start = line.find('/*', position)
+                if start == -1:
+                    break
+                end = line.find('*/', start + 2)
+                if end == -1:
+                    pending = line[:start]
+                    skipped = [line]
+                    break
+                line = line[:start] + line[end + 2:]
+                position = start
+
+            if pending is None:
+                yield line
+
+        # Comentario sin cerrar: se conserva el texto original
+        yield from skipped
+
     def _remove_inline_comments(self, line: str) -> str:
-        return re.split(r'\s*//\s*', line)[0].strip()
+        comment = line.find('//')
+        return (line if comment == -1 else line[:comment]).strip()
+
+    def _clean_code_line(self, line: str) -> Tuple[str, Optional[ParsedLine]]:
+        """
+        Limpia una línea de CODE (con o sin su comentario) tokenizándola con
+        el lexer y guarda el resultado para InstructionProcessor. Las líneas
+        que el lexer no sabe tokenizar se limpian con _clean_instruction.
+        """
+        result = self._code_memo.get(line)
+        if result is None:
+            parsed = parse_line(line)
+            if parsed is None:
+                result = self._clean_instruction(self._remove_inline_comments(line)), None
+            else:
+                result = parsed.text, parsed
+            if len(self._code_memo) >= PARSED_LINES_SIZE:
+                self._code_memo.clear()
+            self._code_memo[line] = result
+
+        parsed = result[1]
+        if parsed is not None:
+            parsed_lines = self.parsed_lines
+            if len(parsed_lines) >= PARSED_LINES_SIZE:
+                parsed_lines.clear()
+            parsed_lines[parsed.text] = parsed
+        return result
 
     def _clean_instruction(self, instruction: str) -> str:
         """Limpia una instrucción eliminando espacios extra y normalizando la sintaxis."""
@@ -37,15 +125,64 @@ class FileProcessor:
         
         return instruction
 
-    def _separate_sections(self, lines: List[str]) -> Tuple[List[str], List[Tuple[str, int]], List[Tuple[str, int]]]:
+    def iter_sections(self, lines: Iterable[str]) -> Iterator[Tuple[str, str, int]]:
+        """
+        Recorre las líneas de forma perezosa y entrega tuplas
+        (sección, línea limpia, número de línea) para DATA y CODE.
+        """
+        current_section = None
+        has_code = False
+
+        self.parsed_lines.clear()
+        numbered = self.preprocessor.iter_expand(enumerate(self._iter_without_multiline_comments(lines), 1))
+        for line_number, line in numbered:
+            if current_section == 'CODE':
+                # Una sola pasada del lexer quita el comentario y limpia la instrucción
+                line, _ = self._clean_code_line(line)
+            else:
+                line = self._remove_inline_comments(line)
+            if not line:
+                continue
+
+            if line in ['DATA:', 'CODE:']:
+                if line == 'DATA:' and current_section == 'CODE':
+                    raise SyntaxError(f"Línea {line_number}: Sección DATA después de CODE")
+                current_section = 'DATA' if line == 'DATA:' else 'CODE'
+            elif current_section == 'DATA':
+                yield 'DATA', line, line_number
+            elif current_section == 'CODE':
+                has_code = True
+                yield 'CODE', line, line_number
+            else:
+                raise SyntaxError(f"Línea {line_number}: Instrucción fuera de las secciones DATA o CODE")
+
+        if not has_code:
+            raise SyntaxError("Falta la sección CODE en el archivo")
+
+    def _separate_sections(self, lines: List[str], line_numbers: Optional[List[int]] = None) -> Tuple[List[str], List[Tuple[str, int]], List[Tuple[str, int]]]:
         cleaned_instructions = []
         data_lines = []
         code_lines = []
         current_section = None
         current_array_definition = False
         
-        for line_number, line in enumerate(lines, 1):
-            line = self._remove_inline_comments(line).strip()
+        comment_memo = self.comment_memo
+        clean_memo = self.clean_memo
+        # Después del preprocesador, cada línea trae su número en el archivo original
+        numbered = enumerate(lines, 1) if line_numbers is None else zip(line_numbers, lines)
+        for line_number, line in numbered:
+            cleaned_line = None
+            if comment_memo is None:
+                if current_section == 'CODE':
+                    # Una sola pasada del lexer quita el comentario y limpia la instrucción
+                    line = cleaned_line = self._clean_code_line(line)[0]
+                else:
+                    line = self._remove_inline_comments(line)
+            else:
+                stripped = comment_memo.get(line)
+                if stripped is None:
+                    stripped = comment_memo[line] = self._remove_inline_comments(line).strip()
+                line = stripped
             if not line:
                 continue
 
@@ -66,7 +203,10 @@ class FileProcessor:
                 data_lines.append((line, line_number))
             elif current_section == 'CODE':
                 current_array_definition = False
-                cleaned_line = self._clean_instruction(line)
+                if cleaned_line is None:
+                    cleaned_line = clean_memo.get(line)
+                    if cleaned_line is None:
+                        cleaned_line = clean_memo[line] = self._clean_code_line(line)[0]
                 if cleaned_line:
                     code_lines.append((cleaned_line, line_number))
                     cleaned_instructions.append(cleaned_line)
@@ -76,4 +216,4 @@ class FileProcessor:
         if not code_lines:
             raise SyntaxError("Falta la sección CODE en el archivo")
 
-        return cleaned_instructions, data_lines, code_lines
\ No newline at end of file
+        return cleaned_instructions, data_lines, code_lines
@@ -0,0 +1,261 @@
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+from components.configuration import Configuration
+from components.valueConverter import ValueConverter
+from utils.exceptions import InvalidOperandError
+
+# Formas en que se obtiene el literal de una palabra
+LITERAL_NONE = 0
+LITERAL_NUMERIC = 1
+LITERAL_DIRECT = 2
+LITERAL_JUMP = 3
+LITERAL_LABEL = 4
+
+# Traducción de los operandos de 'formato' en setup.json a formas de operando
+FORMAT_SHAPES = {
+    'A': ('A',),
+    'B': ('B',),
+    'Lit': ('lit', 'var'),
+    '(Dir)': ('(dir)',),
+    '(A)': ('(A)',),
+    '(B)': ('(B)',),
+    'Ins': ('lit', 'var'),
+}
+
+# Tipo que se codifica para cada forma de operando
+SHAPE_TYPES = {
+    'A': 'A',
+    'B': 'B',
+    '(A)': '(A)',
+    '(B)': '(B)',
+    '(dir)': '(dir)',
+    'lit': 'lit',
+    'var': 'lit',
+}
+
+# Pseudo-instrucciones que generan dos palabras de máquina
+DOUBLE_WORD_INSTRUCTIONS = {'POP', 'RET'}
+
+# Conjuntos de instrucciones tal como los agrupa InstructionProcessor
+PROCESSOR_SETS = {
+    'single_operand': {'PUSH', 'INC', 'DEC'},
+    'flexible': {'NOT', 'SHL', 'SHR'},
+    'no_operand': {'NOP', 'RET1', 'RET2'},
+    'jump': {'JMP', 'JEQ', 'JNE', 'JGT', 'JGE', 'JLT', 'JLE', 'JCR', 'CALL'},
+    'binary_ops': {'ADD', 'SUB', 'AND', 'OR', 'XOR'},
+}
+
+# Cantidad máxima de operandos distintos clasificados en caché
+OPERAND_CACHE_SIZE = 4096
+
+Entry = Tuple[Tuple[int, ...], int, int]
+OperandInfo = Tuple[str, str, Optional[int]]
+
+
+class InstructionEncoder:
+    """
+    Compila setup.json una sola vez en una tabla indexada por
+    (instrucción, forma de operandos). Cada entrada guarda las palabras ya
+    desplazadas (opcode y tipos) y de dónde sale el literal, de modo que
+    codificar una línea es un acceso al diccionario más operaciones enteras.
+    """
+
+    def __init__(self, config: Configuration):
+        self.config = config
+        self.word_length = config.word_length
+        self.lit_bits = config.lit_params['bits']
+        self.types_bits = config.types_params['bits']
+        self.type_width = len(next(iter(config.types.values())))
+        self.max_literal = 2 ** self.lit_bits - 1
+
+        self.opcode_shift = self.lit_bits + self.types_bits
+        self.param1_shift = self.lit_bits + self.types_bits - self.type_width
+        self.param2_shift = self.lit_bits + self.types_bits - 2 * self.type_width
+
+        self.opcodes = {name: int(info['opcode'], 2) for name, info in config.instructions.items()}
+        self.type_codes = {shape: int(config.types[type_name], 2) for shape, type_name in SHAPE_TYPES.items()}
+        self._operand_cache: Dict[str, OperandInfo] = {}
+        # La tabla se compila una vez, al crear la Configuration, que la comparte
+        if config.encoder_table is None:
+            self.table: Mapping[Tuple[str, Tuple[str, ...]], Entry] = {}
+            self._compile()
+        else:
+            self.table = config.encoder_table
+
+    def _header(self, instruction_name: str, shapes: Tuple[str, ...]) -> int:
+        header = self.opcodes[instruction_name] << self.opcode_shift
+        if len(shapes) >= 1:
+            header |= self.type_codes[shapes[0]] << self.param1_shift
+        if len(shapes) >= 2:
+            header |= self.type_codes[shapes[1]] << self.param2_shift
+        return header
+
+    def _literal_source(self, instruction_name: str, shapes: Tuple[str, ...]) -> Optional[Tuple[int, int]]:
+        """
+        Determina de qué operando sale el literal siguiendo las mismas reglas
+        que InstructionProcessor. Retorna None si la combinación no es aceptada
+        por el procesador (por ejemplo POP1 con un operando).
+        """
+        arity = len(shapes)
+
+        if instruction_name in PROCESSOR_SETS['jump']:
+            return (LITERAL_JUMP, 0) if arity == 1 else None
+
+        if instruction_name in PROCESSOR_SETS['no_operand']:
+            return (LITERAL_NONE, 0) if arity == 0 else None
+
+        if instruction_name in PROCESSOR_SETS['binary_ops']:
+            if arity == 1:
+                return self._operand_literal(shapes, 0) if shapes[0].startswith('(') else None
+            if arity == 2:
+                return self._operand_literal(shapes, 1)
+            return None
+
+        if instruction_name in PROCESSOR_SETS['flexible']:
+            if arity == 1:
+                return (LITERAL_NONE, 0)
+            if arity == 2:
+                return self._operand_literal(shapes, 0) if shapes[0].startswith('(') else (LITERAL_NONE, 0)
+            return None
+
+        if instruction_name == 'DEC' and (arity == 0 or shapes[0] != 'A'):
+            return None
+
+        if instruction_name in PROCESSOR_SETS['single_operand']:
+            if arity != 1:
+                return None
+            return self._operand_literal(shapes, 0) if shapes[0].startswith('(') else (LITERAL_NONE, 0)
+
+        if arity != 2:
+            return None
+        if shapes[0] == '(dir)':
+            return (LITERAL_DIRECT, 0)
+        return self._operand_literal(shapes, 1)
+
+    def _operand_literal(self, shapes: Tuple[str, ...], index: int) -> Tuple[int, int]:
+        shape = shapes[index]
+        if shape == '(dir)':
+            return (LITERAL_DIRECT, index)
+        if shape == 'lit':
+            return (LITERAL_NUMERIC, index)
+        if shape == 'var':
+            return (LITERAL_LABEL, index)
+        return (LITERAL_NONE, 0)
+
+    def _compile(self) -> None:
+        for instruction_name, info in self.config.instructions.items():
+            formats = info['formato'] or ['']
+            for instruction_format in formats:
+                for shapes in self._expand_format(instruction_format):
+                    source = self._literal_source(instruction_name, shapes)
+                    if source is None:
+                        continue
+                    mode, index = source
+                    # Los saltos no codifican tipos, solo la dirección destino
+                    header_shapes = () if mode == LITERAL_JUMP else shapes
+                    self.table[(instruction_name, shapes)] = ((self._header(instruction_name, header_shapes),), mode, index)
+
+        # Pseudo-instrucciones que generan dos palabras de máquina
+        for register in ('A', 'B'):
+            self.table[('POP', (register,))] = (
+                (self._header('POP1', (register,)), self._header('POP2', (register,))),
+                LITERAL_NONE, 0
+            )
+        self.table[('RET', ())] = ((self._header('RET1', ()), self._header('RET2', ())), LITERAL_NONE, 0)
+
+    def _expand_format(self, instruction_format: str) -> List[Tuple[str, ...]]:
+        parts = [part.strip() for part in instruction_format.split(',') if part.strip()]
+        expanded = [()]
+        for part in parts:
+            expanded = [shapes + (shape,) for shapes in expanded for shape in FORMAT_SHAPES[part]]
+        return expanded
+
+    @staticmethod
+    def operand_shape(operand: str) -> str:
+        """Clasifica un operando en la forma usada como llave de la tabla."""
+        if operand == 'A' or operand == 'B':
+            return operand
+        if operand.startswith('(') and operand.endswith(')'):
+            inner = operand[1:-1].strip()
+            if inner == 'A' or inner == 'B':
+                return f'({inner})'
+            return '(dir)'
+        if ValueConverter.is_numeric(operand):
+            return 'lit'
+        return 'var'
+
+    def _operand_info(self, operand: str) -> OperandInfo:
+        """Clasifica un operando y pre-calcula su valor numérico, si lo tiene."""
+        shape = self.operand_shape(operand)
+        text = operand[1:-1].strip() if shape == '(dir)' else operand
+        value = None
+        if shape in ('lit', '(dir)'):
+            literal = ValueConverter.literal(text)
+            if literal.numeric:
+                value = literal.value
+        info = (shape, text, value)
+
+        if len(self._operand_cache) >= OPERAND_CACHE_SIZE:
+            self._operand_cache.clear()
+        self._operand_cache[operand] = info
+        return info
+
+    def encode(self, instruction_name: str, operands: List[str], labels: Dict[str, int],
+               data: Dict, memory, instruction_address: int = 0,
+               on_forward_reference: Optional[Callable[[str, int], None]] = None,
+               infos: Optional[Sequence[OperandInfo]] = None) -> Optional[Tuple[int, ...]]:
+        """
+        Codifica una instrucción como tupla de palabras enteras. Retorna None si
+        la forma no está en la tabla; en ese caso el llamador usa la ruta general.
+        Si se entrega on_forward_reference, los saltos a etiquetas aún no definidas
+        se emiten con literal 0 y se notifican para corregirlos al final.
+        infos son las clasificaciones de los operandos si ya vienen del lexer.
+        """
+        if infos is None:
+            cache = self._operand_cache
+            infos = [cache.get(operand) or self._operand_info(operand) for operand in operands]
+        entry = self.table.get((instruction_name, tuple([info[0] for info in infos])))
+        if entry is None:
+            return None
+
+        words, mode, index = entry
+        if mode == LITERAL_NONE:
+            return words
+
+        shape, text, value = infos[index]
+        if mode == LITERAL_NUMERIC:
+            if value is None:
+                value = ValueConverter.parse_numeric(text)
+            if value > self.max_literal:
+                raise InvalidOperandError(f"Literal fuera de rango: {value}")
+        elif mode == LITERAL_DIRECT:
+            if text in data:
+                value = memory.get_address(text)
+            elif value is not None:
+                if value > self.max_literal:
+                    raise InvalidOperandError(f"Dirección fuera de rango: {value}")
+            elif ValueConverter.is_numeric(text):
+                value = ValueConverter.parse_numeric(text)
+            else:
+                raise InvalidOperandError(f"Variable no definida: {text}")
+        elif mode == LITERAL_LABEL and text in data:
+            # Una variable sin paréntesis es un puntero: vale su dirección
+            value = memory.get_address(text)
+        elif text in labels:
+            value = labels[text]
+        elif shape == 'lit':
+            if value is None:
+                value = ValueConverter.parse_numeric(text)
+            if value > self.max_literal:
+                return None
+        elif on_forward_reference is not None:
+            on_forward_reference(text, instruction_address)
+            return words
+        else:
+            return None
+
+        return (words[0] | value,)
+
+    def to_binary(self, word: int) -> str:
+        """Representación de una palabra como string de bits."""
+        return format(word, f'0{self.word_length}b')
+
@@ -1,12 +1,18 @@
-from typing import Dict, List, Tuple, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
 from components.memory import Memory
 from utils.exceptions import InvalidInstructionError, InvalidOperandError
 from components.configuration import Configuration
 from components.valueConverter import ValueConverter
+from components.instructionEncoder import InstructionEncoder
+from components.lexer import ParsedLine
 
 class InstructionProcessor:
-    def __init__(self, config: Configuration):
+    def __init__(self, config: Configuration, encoder: Optional[InstructionEncoder] = None):
         self.config = config
+        # Sin estado por programa, así que se puede compartir entre ensamblajes (ver AssemblyContext)
+        self.encoder = InstructionEncoder(config) if encoder is None else encoder
+        # Líneas ya tokenizadas por FileProcessor, indexadas por su texto limpio
+        self.parsed_lines: Dict[str, ParsedLine] = {}
         self.single_operand_instructions = {
             'PUSH', 'INC', 'DEC'
         }
@@ -140,7 +146,12 @@ class InstructionProcessor:
         instruction_name = parts[0]
         if len(parts) == 1:
             return instruction_name, []
-            
+
+        # Caso común: ninguna coma queda dentro de paréntesis
+        pieces = parts[1].split(',')
+        if all(piece.rfind('(') <= piece.rfind(')') for piece in pieces[:-1]):
+            return instruction_name, [op for op in (piece.strip() for piece in pieces) if op]
+
         operands = []
         current = []
         in_parentheses = False
@@ -166,17 +177,11 @@ class InstructionProcessor:
 
     def _parse_numeric_value(self, value: str) -> int:
         """Procesa un valor numérico en cualquier formato soportado."""
-        value = value.strip()
-        try:
-            if value.endswith('h'):
-                return int(value[:-1], 16)
-            elif value.endswith('b'):
-                return int(value[:-1], 2)
-            elif value.endswith('d'):
-                return int(value[:-1])
-            return int(value)
-        except ValueError:
-            raise InvalidOperandError(f"Valor numérico inválido: {value}")
+        literal = ValueConverter.literal(value)
+        if literal.value is None or literal.kind == 'char':
+            # A diferencia de parse_numeric, aquí no se aceptan caracteres
+            raise InvalidOperandError(f"Valor numérico inválido: {value.strip()}")
+        return literal.value
 
     def _process_memory_reference(self, operand: str, data: Dict[str, int], memory: Memory) -> str:
         """Procesa referencias a memoria, manejando variables y direcciones directas."""
@@ -218,9 +223,36 @@ class InstructionProcessor:
             if operand != 'A':
                 raise InvalidOperandError("DEC solo acepta el operando A")
     
-    def get_opcode(self, instruction: str, labels: Dict[str, int], data: Dict[str, int], memory: Memory, instruction_address: int) -> Union[str, List[str]]:
-        instruction_name, operands = self._parse_instruction(instruction)
+    def encode(self, instruction: str, labels: Dict[str, int], data: Dict[str, int], memory: Memory, instruction_address: int,
+               on_forward_reference: Optional[Callable[[str, int], None]] = None) -> Tuple[int, ...]:
+        """Codifica una instrucción como tupla de palabras enteras (una o dos)."""
+        parsed = self.parsed_lines.get(instruction)
+        if parsed is None:
+            instruction_name, operands = self._parse_instruction(instruction)
+            infos = None
+        else:
+            instruction_name, operands, infos = parsed.name, list(parsed.operands), parsed.infos
+
+        # Ruta rápida: tabla precompilada de formatos de setup.json
+        words = self.encoder.encode(instruction_name, operands, labels, data, memory,
+                                    instruction_address, on_forward_reference, infos)
+        if words is not None:
+            return words
+
+        result = self._get_opcode_legacy(instruction_name, operands, labels, data, memory, instruction_address)
+        if isinstance(result, list):
+            return tuple(int(word, 2) for word in result)
+        return (int(result, 2),)
 
+    def get_opcode(self, instruction: str, labels: Dict[str, int], data: Dict[str, int], memory: Memory, instruction_address: int) -> Union[str, List[str]]:
+        words = self.encode(instruction, labels, data, memory, instruction_address)
+        if len(words) == 1:
+            return self.encoder.to_binary(words[0])
+        return [self.encoder.to_binary(word) for word in words]
+
+    def _get_opcode_legacy(self, instruction_name: str, operands: List[str], labels: Dict[str, int], data: Dict[str, int],
+                           memory: Memory, instruction_address: int) -> Union[str, List[str]]:
+        """Ruta general basada en strings, para formatos fuera de la tabla y para reportar errores"""
         # Manejo especial para operaciones binarias
         if instruction_name in self.binary_ops:
             return self._handle_binary_operation(instruction_name, operands, labels, data, memory, instruction_address)
@@ -240,9 +272,6 @@ class InstructionProcessor:
         # Manejo de RET
         if instruction_name == 'RET':
             return self._handle_ret_instruction(operands)
-        
-
-
 
         if instruction_name not in self.config.instructions:
             raise InvalidInstructionError(f"Instrucción desconocida: {instruction_name}")
@@ -384,12 +413,18 @@ class InstructionProcessor:
         binary = self.config.instructions[instruction_name]['opcode']
         param1_binary = ValueConverter.param_to_binary(operands[0], self.config.types, self.config.types_params)[:3]
         param2_binary = ValueConverter.param_to_binary(operands[1], self.config.types, self.config.types_params)[:3]
+        if operands[1] in labels or operands[1] in data:
+            # Etiquetas y variables usadas como literal valen su dirección
+            param2_binary = self.config.types['lit']
         param_binary = (param1_binary + param2_binary).ljust(self.config.types_params['bits'], '0')
         
         if operands[1].startswith('('):
             literal_value = ValueConverter.literal_or_direct_value(operands[1], self.config.types, self.config.lit_params, labels, data, memory, instruction_address)
-        elif ValueConverter.is_numeric(operands[1]):
+        elif ValueConverter.is_numeric(operands[1]) or param2_binary == self.config.types['lit']:
             literal_value = ValueConverter.literal_or_direct_value(operands[1], self.config.types, self.config.lit_params, labels, data, memory, instruction_address)
+        elif operands[0].startswith('('):
+            # Destino (Dir): la dirección va en el literal
+            literal_value = ValueConverter.literal_or_direct_value(operands[0], self.config.types, self.config.lit_params, labels, data, memory, instruction_address)
         else:
             literal_value = '0' * self.config.lit_params['bits']
             
@@ -429,10 +464,12 @@ class InstructionProcessor:
         # Procesamiento normal para dos operandos
         param1_binary = ValueConverter.param_to_binary(operands[0], self.config.types, self.config.types_params)[:3]
         param2_binary = ValueConverter.param_to_binary(operands[1], self.config.types, self.config.types_params)[:3]
+        if operands[1] in labels or operands[1] in data:
+            param2_binary = self.config.types['lit']
         param_binary = (param1_binary + param2_binary).ljust(self.config.types_params['bits'], '0')
         
         # Determinar el valor literal según el segundo operando
-        if operands[1].startswith('('):
+        if operands[1].startswith('(') or param2_binary == self.config.types['lit']:
             literal_value = ValueConverter.literal_or_direct_value(
                 operands[1],
                 self.config.types,
@@ -0,0 +1,185 @@
+import re
+from typing import List, NamedTuple, Optional, Tuple
+from components.valueConverter import ValueConverter
+
+# Tipos de token
+TOKEN_MNEMONIC = 'mnemonic'
+TOKEN_REGISTER = 'register'
+TOKEN_MEMORY = 'memory'
+TOKEN_LITERAL = 'literal'
+TOKEN_LABEL = 'label'
+TOKEN_STRING = 'string'
+TOKEN_CHAR = 'char'
+TOKEN_COMMA = 'comma'
+
+# Mismos números que acepta ValueConverter.is_numeric; el orden importa para
+# que, por ejemplo, 10b sea binario y 1bh hexadecimal
+_LITERAL = r"\d+d?|[01]*b|[0-9A-Fa-f]*h|'(?:[^\s,/]|[ ]|/(?!/))'"
+
+# Ningún token puede contener //: el primero que aparezca siempre inicia el comentario
+
+# Un registro o literal debe terminar donde termina la palabra
+_END = r"(?=[\s,()]|//|$)"
+
+MASTER_PATTERN = re.compile(rf"""
+    \s*(?:
+        (?P<comment>//.*)
+      | (?P<comma>,)
+      | (?P<memory>\(\s*(?:
+            (?P<memory_register>[AB])
+          | (?P<memory_literal>{_LITERAL})
+          | (?P<memory_symbol>(?:[^(),/]|/(?!/))*?)
+        )\s*\))
+      | (?P<register>[AB]){_END}
+      | (?P<literal>{_LITERAL}){_END}
+      | (?P<string>"(?:[^"/]|/(?!/))*")
+      | (?P<label>(?:[^\s,()/"]|/(?!/))+)
+      | (?P<error>\S)
+    )
+""", re.VERBOSE)
+
+
+_WORD = re.compile(r'\w+')
+
+
+class Token(NamedTuple):
+    kind: str
+    text: str
+    # Entero de un literal o carácter; para una referencia a memoria, el token interior
+    value: object = None
+    # Base de un literal (0 si no es literal)
+    base: int = 0
+    column: int = 0
+
+
+class ParsedLine(NamedTuple):
+    """
+    Línea de CODE ya tokenizada: el texto normalizado (el mismo que produce
+    FileProcessor._clean_instruction), la instrucción, los operandos como
+    texto y, por operando, la tupla (forma, texto, valor) que usa
+    InstructionEncoder.
+    """
+    text: str
+    name: str
+    operands: Tuple[str, ...]
+    infos: Tuple[Tuple[str, str, Optional[int]], ...]
+    tokens: Tuple[Token, ...]
+
+
+def _literal_token(text: str, column: int) -> Token:
+    """Token de un literal ya reconocido por el patrón; el valor es None si no tiene dígitos (por ejemplo 'h')"""
+    literal = ValueConverter.literal(text)
+    kind = TOKEN_CHAR if literal.kind == 'char' else TOKEN_LITERAL
+    return Token(kind, text, literal.value, literal.base, column)
+
+
+def _memory_inner(match: 're.Match') -> Optional[Token]:
+    """Token de lo que va entre los paréntesis de una referencia a memoria"""
+    text = match.group('memory_register')
+    if text is not None:
+        return Token(TOKEN_REGISTER, text, None, 0, match.start('memory_register'))
+    text = match.group('memory_literal')
+    if text is not None:
+        return _literal_token(text, match.start('memory_literal'))
+    text = match.group('memory_symbol')
+    if not text or ' ' in text or '\t' in text:
+        # Vacío o con espacios adentro: queda para la limpieza de strings
+        return None
+    return Token(TOKEN_LABEL, text, None, 0, match.start('memory_symbol'))
+
+
+def tokenize(line: str) -> Optional[List[Token]]:
+    """
+    Separa una línea en tokens con una sola pasada del patrón maestro,
+    descartando espacios y el comentario //. Retorna None si encuentra algo
+    que no sabe clasificar (por ejemplo un paréntesis sin cerrar o dos
+    tokens pegados), para que el llamador use la limpieza basada en strings.
+    """
+    if not line.isascii():
+        comment = line.find('//')
+        if comment == -1 or not line[:comment].isascii():
+            # Los espacios y dígitos Unicode se clasifican distinto que en str.split e isdigit
+            return None
+    tokens = []
+    previous_end = -1
+    for match in MASTER_PATTERN.finditer(line):
+        kind = match.lastgroup
+        if kind is None or kind == 'comment':
+            break
+        column = match.start(kind)
+        if kind == 'comma':
+            tokens.append(Token(TOKEN_COMMA, ',', None, 0, column))
+            previous_end = -1
+            continue
+        if column == previous_end and not (len(tokens) == 1 and kind == 'memory'):
+            # Solo el nombre de la instrucción puede ir pegado a un paréntesis, como en INC(B)
+            return None
+        previous_end = match.end()
+
+        text = match.group(kind)
+        if kind == 'label':
+            tokens.append(Token(TOKEN_MNEMONIC if not tokens else TOKEN_LABEL, text, None, 0, column))
+        elif kind == 'register':
+            tokens.append(Token(TOKEN_REGISTER, text, None, 0, column))
+        elif kind == 'literal':
+            tokens.append(_literal_token(text, column))
+        elif kind == 'memory':
+            inner = _memory_inner(match)
+            if inner is None:
+                return None
+            tokens.append(Token(TOKEN_MEMORY, f'({inner.text})', inner, 0, column))
+        elif kind == 'string':
+            tokens.append(Token(TOKEN_STRING, text, None, 0, column))
+        else:
+            return None
+    return tokens
+
+
+def operand_info(token: Token) -> Tuple[str, str, Optional[int]]:
+    """Forma, texto y valor de un operando, igual que InstructionEncoder._operand_info"""
+    kind = token.kind
+    if kind == TOKEN_REGISTER:
+        return token.text, token.text, None
+    if kind == TOKEN_MEMORY:
+        inner = token.value
+        if inner.kind == TOKEN_REGISTER:
+            return token.text, token.text, None
+        return '(dir)', inner.text, inner.value
+    if kind == TOKEN_LITERAL or kind == TOKEN_CHAR:
+        return 'lit', token.text, token.value
+    return 'var', token.text, None
+
+
+def parse_line(line: str) -> Optional[ParsedLine]:
+    """
+    Tokeniza una línea de CODE y arma su ParsedLine. Retorna None si la
+    línea está vacía o no se puede tokenizar.
+    """
+    tokens = tokenize(line)
+    if not tokens:
+        return None
+    first = tokens[0]
+    if first.kind not in (TOKEN_MNEMONIC, TOKEN_REGISTER, TOKEN_LITERAL):
+        return None
+    if len(tokens) > 1 and tokens[1].kind in (TOKEN_COMMA, TOKEN_MEMORY) and not _WORD.fullmatch(first.text):
+        # La limpieza de strings solo separa el nombre si es una palabra (\w+)
+        return None
+
+    # Texto normalizado: "NOMBRE op1, op2", con ", " después de cada coma
+    parts = [first.text]
+    operands = []
+    infos = []
+    previous = first
+    for token in tokens[1:]:
+        if token.kind == TOKEN_COMMA:
+            parts.append(' , ' if previous is first else ', ')
+        elif previous.kind != TOKEN_COMMA and previous is not first:
+            # Dos operandos sin coma entre ellos
+            return None
+        else:
+            parts.append(token.text if previous.kind == TOKEN_COMMA else ' ' + token.text)
+            operands.append(token.text)
+            infos.append(operand_info(token))
+        previous = token
+
+    return ParsedLine(''.join(parts), first.text, tuple(operands), tuple(infos), tuple(tokens))
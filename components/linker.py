@@ -0,0 +1,129 @@
+import os
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+from components.objectFile import (ObjectFile, object_path, read_object, write_object,
+                                   OBJECT_EXTENSION, RELOC_CODE, RELOC_DATA)
+from utils.exceptions import LinkError
+from utils.fingerprint import file_signature, text_digest
+from utils.logger import logger
+
+
+class Linker:
+    """
+    Combina módulos ensamblados por separado. Cada módulo queda a continuación
+    del anterior en CODE y en DATA (el primero parte en 0 y es el que se
+    ejecuta), y los literales de sus reubicaciones se corrigen con la dirección
+    final. Las referencias externas se resuelven solo con los nombres que otro
+    módulo exporta con GLOBAL. La imagen de DATA y la tabla de símbolos quedan
+    en assembler.memory; las variables no exportadas, como <módulo>:<nombre>.
+    """
+
+    def __init__(self, assembler):
+        self.assembler = assembler
+        self.setup_key = assembler.config.digest
+        self.stats: Dict[str, int] = {}
+
+    def build(self, inputs: Sequence[str], object_dir: Optional[str] = None) -> array:
+        """
+        Enlaza una lista de programas y archivos objeto. El objeto de cada
+        programa se guarda junto a él (o en object_dir) y se reutiliza mientras
+        el programa, setup.json y sus archivos incluidos no cambien.
+        """
+        self.stats = {'assembled': 0, 'reused': 0, 'prebuilt': 0}
+        objects = []
+        for path in inputs:
+            if path.endswith(OBJECT_EXTENSION):
+                objects.append(read_object(path))
+                self.stats['prebuilt'] += 1
+            else:
+                objects.append(self.object_for(path, object_dir))
+        return self.link(objects)
+
+    def object_for(self, path: str, object_dir: Optional[str] = None) -> ObjectFile:
+        """Objeto de un programa, reutilizado si sigue vigente o ensamblado y guardado"""
+        with open(path, 'r') as f:
+            source = f.read()
+        source_key = text_digest(self.setup_key + '\0' + source)
+        output = object_path(path, object_dir)
+        try:
+            obj = read_object(output)
+            if obj.source_key == source_key and all(file_signature(file) == signature for file, signature in obj.dependencies):
+                self.stats['reused'] += 1
+                return obj
+        except (OSError, LinkError):
+            pass
+
+        base_dir = os.path.dirname(os.path.abspath(path))
+        obj = self.assembler.assemble_object(source, path, base_dir)._replace(source_key=source_key)
+        if object_dir is not None:
+            os.makedirs(object_dir, exist_ok=True)
+        write_object(obj, output)
+        self.stats['assembled'] += 1
+        if self.assembler.verbose:
+            logger.info("Módulo ensamblado: %s -> %s", path, output)
+        return obj
+
+    def link(self, objects: Sequence[ObjectFile]) -> array:
+        if not objects:
+            raise LinkError("No hay módulos que enlazar")
+        max_literal = self.assembler.encoder.max_literal
+
+        # Direcciones finales de los símbolos exportados; el resto es local a su módulo
+        bases: List[Tuple[int, int]] = []
+        addresses: Dict[str, int] = {}
+        owners: Dict[str, str] = {}
+        symbols = {}
+        code_base = data_base = 0
+        for obj in objects:
+            bases.append((code_base, data_base))
+            module = os.path.splitext(os.path.basename(obj.name))[0]
+            for name, symbol in obj.symbols.items():
+                # Las variables locales quedan como <módulo>:<nombre>, para que no choquen
+                key = name if name in obj.exports else f"{module}:{name}"
+                symbols[key] = symbol._replace(address=data_base + symbol.address)
+            for name in obj.exports:
+                owner = owners.get(name)
+                if owner is not None:
+                    raise LinkError(f"Símbolo '{name}' exportado por {owner} y por {obj.name}")
+                owners[name] = obj.name
+                label = obj.labels.get(name)
+                addresses[name] = code_base + label if label is not None else data_base + obj.symbols[name].address
+            code_base += len(obj.words)
+            data_base += len(obj.data)
+
+        binary = array('Q')
+        # La imagen enlazada queda en un contexto nuevo, como la de un ensamblaje
+        memory = self.assembler.new_context().memory
+        for obj, (code_base, data_base) in zip(objects, bases):
+            words = array('Q', obj.words)
+            for relocation in obj.relocations:
+                word = words[relocation.address]
+                literal = word & max_literal
+                if relocation.kind == RELOC_CODE:
+                    literal += code_base
+                elif relocation.kind == RELOC_DATA:
+                    literal += data_base
+                else:
+                    literal = addresses.get(relocation.name)
+                    if literal is None:
+                        raise LinkError(_undefined_message(relocation.name, obj, objects))
+                if literal > max_literal:
+                    raise LinkError(f"Dirección fuera de rango al enlazar {obj.name}: {literal}")
+                words[relocation.address] = (word & ~max_literal) | literal
+            binary.extend(words)
+            memory.memory.extend(obj.data)
+
+        memory.data = symbols
+        memory.next_data_address = len(memory.memory)
+        if self.assembler.verbose:
+            logger.info("Enlazados %d módulos: %d palabras, %d celdas de DATA", len(objects), len(binary), len(memory.memory))
+            logger.flush()
+        return binary
+
+
+def _undefined_message(name: str, obj: ObjectFile, objects: Sequence[ObjectFile]) -> str:
+    message = f"Símbolo no definido: {name} (usado en {obj.name})"
+    for other in objects:
+        if other is not obj and (name in other.labels or name in other.symbols):
+            return f"{message}; {other.name} lo define pero no lo exporta con GLOBAL"
+    return message
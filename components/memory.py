@@ -1,13 +1,37 @@
-from typing import Union, List
+from array import array
+from typing import NamedTuple, Union, List
 from utils.exceptions import MemoryError
 from components.valueConverter import ValueConverter
 
+# Cada celda de la imagen de DATA usa 32 bits, más que los registros del computador
+DATA_TYPECODE = 'I'
+DATA_MASK = (1 << (8 * array(DATA_TYPECODE).itemsize)) - 1
+
+# Tipos de símbolo
+SYMBOL_SCALAR = 'scalar'
+SYMBOL_ARRAY = 'array'
+SYMBOL_STRING = 'string'
+
+class Symbol(NamedTuple):
+    address: int
+    size: int
+    kind: str
+
 class Memory:
     def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """Descarta las variables de un ensamblaje anterior"""
+        # Tabla de símbolos y la imagen contigua de la sección DATA (dirección = índice)
         self.data = {}
-        self.memory = {}
+        self.memory = array(DATA_TYPECODE)
         self.next_data_address = 0
 
+    def image(self) -> memoryview:
+        """Imagen de la sección DATA sin copiarla, para escritores y el simulador"""
+        return memoryview(self.memory)
+
     def store_value(self, name: str, value: Union[str, List[str]]) -> None:
         if isinstance(value, list):  # Es un array
             self._store_array(name, value)
@@ -20,65 +44,72 @@ class Memory:
 
     def _store_array(self, name: str, values: List[str]) -> None:
         start_address = self.next_data_address
-        for value in values:
-            if value.startswith("'") and value.endswith("'"):
-                self.memory[self.next_data_address] = ord(value[1])
-            else:
-                self.memory[self.next_data_address] = ValueConverter.parse_numeric(value)
-            self.next_data_address += 1
-        self.data[name] = (start_address, len(values))
+        try:
+            # Caso común: solo decimales sin sufijo, convertidos en una sola pasada
+            self.memory.extend(array(DATA_TYPECODE, map(int, values)))
+        except (ValueError, OverflowError):
+            append = self.memory.append
+            for value in values:
+                if value.startswith("'") and value.endswith("'"):
+                    append(ord(value[1]) & DATA_MASK)
+                else:
+                    append(ValueConverter.parse_numeric(value) & DATA_MASK)
+        finally:
+            self.next_data_address = len(self.memory)
+        self.data[name] = Symbol(start_address, len(values), SYMBOL_ARRAY)
+
+    def store_bytes(self, name: str, content: bytes) -> None:
+        """Almacena un archivo binario, un byte por celda"""
+        start_address = self.next_data_address
+        self.memory.extend(content)
+        self.next_data_address = len(self.memory)
+        self.data[name] = Symbol(start_address, len(content), SYMBOL_ARRAY)
 
     def _store_char(self, name: str, value: str) -> None:
         """Almacena un carácter como su valor ASCII"""
-        ascii_value = ord(value[1])
-        self.memory[self.next_data_address] = ascii_value
-        self.data[name] = self.next_data_address
-        self.next_data_address += 1
+        self._store_scalar(name, ord(value[1]))
 
     def _store_string(self, name: str, value: str) -> None:
         """Almacena un string como array de valores ASCII + null terminator"""
         start_address = self.next_data_address
         string_content = value[1:-1]  # Remover comillas
-        
-        # Almacenar cada carácter
-        for char in string_content:
-            self.memory[self.next_data_address] = ord(char)
-            self.next_data_address += 1
-            
-        # Agregar null terminator
-        self.memory[self.next_data_address] = 0
-        self.next_data_address += 1
-        
+
+        # Almacenar cada carácter y el null terminator
+        self.memory.extend(ord(char) & DATA_MASK for char in string_content)
+        self.memory.append(0)
+        self.next_data_address = len(self.memory)
+
         # Guardar referencia al inicio y longitud del string
-        self.data[name] = (start_address, len(string_content) + 1)
+        self.data[name] = Symbol(start_address, len(string_content) + 1, SYMBOL_STRING)
 
     def _store_number(self, name: str, value: str) -> None:
         """Almacena un número"""
-        parsed_value = ValueConverter.parse_numeric(value)
-        self.memory[self.next_data_address] = parsed_value
-        self.data[name] = self.next_data_address
+        self._store_scalar(name, ValueConverter.parse_numeric(value))
+
+    def _store_scalar(self, name: str, value: int) -> None:
+        self.memory.append(value & DATA_MASK)
+        self.data[name] = Symbol(self.next_data_address, 1, SYMBOL_SCALAR)
         self.next_data_address += 1
-        
+
     def get_value(self, name: str, index: int = None) -> int:
-        if name not in self.data:
+        symbol = self.data.get(name)
+        if symbol is None:
             raise MemoryError(f"Variable no definida: {name}")
-        
-        if isinstance(self.data[name], tuple):  # Es un array o string
-            start_address, size = self.data[name]
+
+        if symbol.kind != SYMBOL_SCALAR:  # Es un array o string
             if index is None:
                 raise MemoryError(f"Se requiere un índice para acceder al array o string: {name}")
-            if index < 0 or index >= size:
+            if index < 0 or index >= symbol.size:
                 raise MemoryError(f"Índice fuera de rango para {name}: {index}")
-            return self.memory[start_address + index]
+            return self.memory[symbol.address + index]
         else:  # Es un valor simple
             if index is not None:
                 raise MemoryError(f"No se puede indexar un valor simple: {name}")
-            return self.memory[self.data[name]]
+            return self.memory[symbol.address]
 
     def get_address(self, name: str) -> int:
-        """Obtiene la dirección de una variable"""
-        if name not in self.data:
+        """Obtiene la dirección de una variable (la de inicio para arrays y strings)"""
+        symbol = self.data.get(name)
+        if symbol is None:
             raise MemoryError(f"Variable no definida: {name}")
-        if isinstance(self.data[name], tuple):
-            return self.data[name][0]  # Retorna la dirección de inicio para arrays y strings
-        return self.data[name]
+        return symbol.address
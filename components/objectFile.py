@@ -0,0 +1,139 @@
+import json
+import os
+from array import array
+from typing import Dict, NamedTuple, Optional, Tuple
+from components.memory import DATA_TYPECODE, Symbol
+from components.valueConverter import ValueConverter
+from utils.exceptions import LinkError
+
+# Cambiar al modificar lo que se guarda en un archivo objeto
+OBJECT_VERSION = 2
+
+# Primer campo de un archivo objeto, para reconocerlo
+OBJECT_FORMAT = 'iic2343-objeto'
+
+OBJECT_EXTENSION = '.o'
+
+# Tipos de reubicación: el literal de la palabra es una dirección del módulo
+# (de CODE o de DATA) o un símbolo de otro módulo
+RELOC_CODE = 'code'
+RELOC_DATA = 'data'
+RELOC_EXTERNAL = 'external'
+RELOCATION_KINDS = (RELOC_CODE, RELOC_DATA, RELOC_EXTERNAL)
+
+
+class Relocation(NamedTuple):
+    address: int
+    kind: str
+    name: str
+
+
+class ObjectFile(NamedTuple):
+    """
+    Módulo ensamblado por separado. Las palabras y la tabla de símbolos usan
+    direcciones relativas al inicio del módulo, en CODE y en DATA; las
+    reubicaciones indican qué literales corrige el enlazador. Las etiquetas y
+    variables son locales al módulo, salvo las de exports (GLOBAL).
+    """
+    name: str
+    words: array
+    labels: Dict[str, int]
+    symbols: Dict[str, Symbol]
+    data: array
+    relocations: Tuple[Relocation, ...]
+    # Huella del programa y de setup.json, y los archivos de INCLUDE e incbin que usó
+    source_key: Optional[str] = None
+    dependencies: Tuple[Tuple[str, Optional[Tuple[int, int]]], ...] = ()
+    exports: Tuple[str, ...] = ()
+
+    @property
+    def externals(self) -> Tuple[str, ...]:
+        return tuple(sorted({relocation.name for relocation in self.relocations if relocation.kind == RELOC_EXTERNAL}))
+
+
+def operand_symbol(operand: str) -> Optional[str]:
+    """Nombre de la etiqueta o variable que usa un operando, si usa alguna"""
+    inner = operand[1:-1].strip() if operand.startswith('(') and operand.endswith(')') else operand
+    if inner in ('A', 'B') or ValueConverter.is_numeric(inner):
+        return None
+    return inner
+
+
+def object_path(input_path: str, directory: Optional[str] = None) -> str:
+    """Archivo objeto de un programa: <nombre>.o, junto a la entrada o dentro de directory"""
+    stem = os.path.splitext(input_path)[0]
+    if directory is not None:
+        stem = os.path.join(directory, os.path.basename(stem))
+    return stem + OBJECT_EXTENSION
+
+
+def object_to_dict(obj: ObjectFile) -> Dict:
+    """
+    Contenido de un archivo objeto, un objeto JSON con:
+      format, version: OBJECT_FORMAT y OBJECT_VERSION
+      name: programa de origen
+      words: palabras de CODE como enteros
+      labels: {etiqueta: dirección en CODE}
+      symbols: {variable: [dirección en DATA, tamaño, tipo]}
+      data: celdas de la imagen de DATA del módulo
+      relocations: [[dirección de la palabra, 'code' | 'data' | 'external', símbolo]]
+      exports: nombres visibles desde otros módulos
+      source_key: huella del programa y de setup.json (o null)
+      dependencies: [[archivo de INCLUDE o incbin, [mtime_ns, tamaño] o null]]
+    """
+    return {
+        'format': OBJECT_FORMAT,
+        'version': OBJECT_VERSION,
+        'name': obj.name,
+        'words': obj.words.tolist(),
+        'labels': dict(obj.labels),
+        'symbols': {name: list(symbol) for name, symbol in obj.symbols.items()},
+        'data': obj.data.tolist(),
+        'relocations': [list(relocation) for relocation in obj.relocations],
+        'exports': list(obj.exports),
+        'source_key': obj.source_key,
+        'dependencies': [[path, None if signature is None else list(signature)] for path, signature in obj.dependencies],
+    }
+
+
+def object_from_dict(content: Dict) -> ObjectFile:
+    """ObjectFile a partir de object_to_dict; KeyError, TypeError o ValueError si no calza"""
+    relocations = tuple(Relocation(int(address), kind, str(name)) for address, kind, name in content['relocations'])
+    if any(relocation.kind not in RELOCATION_KINDS for relocation in relocations):
+        raise ValueError("Tipo de reubicación desconocido")
+    return ObjectFile(
+        name=str(content['name']),
+        words=array('Q', content['words']),
+        labels={str(label): int(address) for label, address in content['labels'].items()},
+        symbols={str(name): Symbol(int(address), int(size), str(kind)) for name, (address, size, kind) in content['symbols'].items()},
+        data=array(DATA_TYPECODE, content['data']),
+        relocations=relocations,
+        source_key=content['source_key'],
+        dependencies=tuple((str(path), None if signature is None else tuple(signature)) for path, signature in content['dependencies']),
+        exports=tuple(str(name) for name in content['exports']),
+    )
+
+
+def write_object(obj: ObjectFile, path: str) -> None:
+    temporary = path + '.tmp'
+    with open(temporary, 'w') as f:
+        json.dump(object_to_dict(obj), f, separators=(',', ':'))
+        f.write('\n')
+    os.replace(temporary, path)
+
+
+def read_object(path: str) -> ObjectFile:
+    """Lee un archivo objeto (JSON, ver object_to_dict); nunca ejecuta su contenido"""
+    with open(path, 'rb') as f:
+        try:
+            content = json.loads(f.read())
+        except ValueError:
+            raise LinkError(f"{path} no es un archivo objeto válido")
+    if not isinstance(content, dict) or content.get('format') != OBJECT_FORMAT:
+        raise LinkError(f"{path} no es un archivo objeto válido")
+    if content.get('version') != OBJECT_VERSION:
+        raise LinkError(f"{path} es de otra versión del ensamblador")
+    try:
+        return object_from_dict(content)
+    except (KeyError, TypeError, ValueError, OverflowError):
+        raise LinkError(f"{path} no es un archivo objeto válido")
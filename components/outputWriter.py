@@ -0,0 +1,121 @@
+import os
+from typing import Dict, Iterable, List, Optional, Type
+
+# Bytes de datos por registro de Intel HEX
+HEX_RECORD_BYTES = 16
+
+
+class OutputWriter:
+    """
+    Base de los formatos de salida. Cada formato arma el archivo completo en
+    un solo buffer (render) y lo escribe con una única llamada (write).
+    """
+    extension = ''
+    description = ''
+
+    def __init__(self, word_length: int):
+        self.word_length = word_length
+        self.word_bytes = (word_length + 7) // 8
+        self.hex_digits = (word_length + 3) // 4
+
+    def render(self, binary: Iterable[int]) -> bytes:
+        raise NotImplementedError
+
+    def write(self, binary: Iterable[int], filename: str) -> int:
+        """Escribe el archivo y retorna la cantidad de bytes escritos."""
+        data = self.render(binary)
+        with open(filename, 'wb') as f:
+            f.write(data)
+        return len(data)
+
+
+class TextWriter(OutputWriter):
+    extension = '.txt'
+    description = 'una palabra en bits por línea'
+
+    def render(self, binary: Iterable[int]) -> bytes:
+        word_format = f'0{self.word_length}b'
+        return ''.join(format(word, word_format) + '\n' for word in binary).encode('ascii')
+
+
+class BinWriter(OutputWriter):
+    extension = '.bin'
+    description = 'imagen binaria, 5 bytes big-endian por palabra'
+
+    def render(self, binary: Iterable[int]) -> bytes:
+        size = self.word_bytes
+        return b''.join(word.to_bytes(size, 'big') for word in binary)
+
+
+class CoeWriter(OutputWriter):
+    extension = '.coe'
+    description = 'archivo de inicialización de BRAM de Xilinx (radix 16)'
+
+    def render(self, binary: Iterable[int]) -> bytes:
+        word_format = f'0{self.hex_digits}X'
+        values = [format(word, word_format) for word in binary] or ['0' * self.hex_digits]
+        return (
+            'memory_initialization_radix=16;\n'
+            'memory_initialization_vector=\n'
+            + ',\n'.join(values) + ';\n'
+        ).encode('ascii')
+
+
+class MemWriter(OutputWriter):
+    extension = '.mem'
+    description = 'archivo .mem para $readmemh / BRAM de Xilinx'
+
+    def render(self, binary: Iterable[int]) -> bytes:
+        word_format = f'0{self.hex_digits}X'
+        return ('@00000000\n' + ''.join(format(word, word_format) + '\n' for word in binary)).encode('ascii')
+
+
+class IntelHexWriter(OutputWriter):
+    extension = '.hex'
+    description = 'Intel HEX de la imagen binaria'
+
+    @staticmethod
+    def _record(record_type: int, address: int, data: bytes) -> str:
+        body = bytes((len(data), (address >> 8) & 0xFF, address & 0xFF, record_type)) + data
+        checksum = -sum(body) & 0xFF
+        return ':' + body.hex().upper() + format(checksum, '02X') + '\n'
+
+    def render(self, binary: Iterable[int]) -> bytes:
+        image = BinWriter(self.word_length).render(binary)
+        records: List[str] = []
+        segment = 0
+        for offset in range(0, len(image), HEX_RECORD_BYTES):
+            # Registro de dirección lineal extendida al pasar cada bloque de 64 KiB
+            if offset >> 16 != segment:
+                segment = offset >> 16
+                records.append(self._record(0x04, 0, segment.to_bytes(2, 'big')))
+            records.append(self._record(0x00, offset & 0xFFFF, image[offset:offset + HEX_RECORD_BYTES]))
+        records.append(self._record(0x01, 0, b''))
+        return ''.join(records).encode('ascii')
+
+
+OUTPUT_WRITERS: Dict[str, Type[OutputWriter]] = {
+    'txt': TextWriter,
+    'bin': BinWriter,
+    'coe': CoeWriter,
+    'mem': MemWriter,
+    'hex': IntelHexWriter,
+}
+
+
+def get_writer(output_format: str, word_length: int) -> OutputWriter:
+    try:
+        return OUTPUT_WRITERS[output_format](word_length)
+    except KeyError:
+        raise ValueError(f"Formato de salida desconocido: {output_format}")
+
+
+def output_path(input_path: str, output_format: str, directory: Optional[str] = None) -> str:
+    """
+    Salida por defecto de un archivo cuando se ensamblan varios:
+    <nombre>.out.<formato>, junto a la entrada o dentro de directory.
+    """
+    stem = os.path.splitext(input_path)[0]
+    if directory is not None:
+        stem = os.path.join(directory, os.path.basename(stem))
+    return stem + '.out' + OUTPUT_WRITERS[output_format].extension
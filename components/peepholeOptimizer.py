@@ -0,0 +1,234 @@
+from typing import Dict, List, Optional, Tuple
+from components.instructionEncoder import DOUBLE_WORD_INSTRUCTIONS
+from components.valueConverter import ValueConverter
+from utils.logger import Deferred, logger
+
+# Saltos (y CALL) cuyo operando es una etiqueta
+JUMP_INSTRUCTIONS = {'JMP', 'JEQ', 'JNE', 'JGT', 'JGE', 'JLT', 'JLE', 'JCR', 'CALL'}
+
+# Instrucciones después de las cuales no se sigue a la línea siguiente
+UNCONDITIONAL_INSTRUCTIONS = {'JMP', 'RET'}
+
+REGISTERS = ('A', 'B')
+
+# Reglas que aplica el optimizador, en el orden del reporte
+RULES = ('jump_chain', 'dead_code', 'jump_to_next', 'redundant_mov')
+
+CodeLine = Tuple[str, int]
+
+
+class PeepholeOptimizer:
+    """
+    Optimización de mirilla (-O) sobre la secuencia de etiquetas e instrucciones
+    de CODE, antes de codificarla. Como BinaryGenerator asigna las direcciones
+    de las etiquetas al codificar, quitar instrucciones no requiere otro ajuste.
+    """
+
+    def __init__(self, instruction_processor, verbose: bool = False):
+        self.instruction_processor = instruction_processor
+        self.verbose = verbose
+        self.stats: Dict = {}
+        # Cada línea distinta se separa en nombre y operandos una sola vez
+        self._parsed: Dict[str, Tuple[str, Tuple[str, ...]]] = {}
+
+    def optimize(self, code_lines: List[CodeLine]) -> List[CodeLine]:
+        """Aplica las reglas hasta que ninguna cambie el programa"""
+        self.stats = {rule: 0 for rule in RULES}
+        self._parsed = {}
+        self.stats.update({'before': self._words(code_lines), 'after': 0, 'cycles': 0, 'skipped': None})
+
+        reason = self._unsafe_reason(code_lines)
+        if reason is not None:
+            # Quitar instrucciones movería direcciones de las que el programa depende
+            self.stats['skipped'] = reason
+            self.stats['after'] = self.stats['before']
+            if self.verbose:
+                logger.info("%s", Deferred(self.report))
+            return list(code_lines)
+
+        lines = list(code_lines)
+        changed = True
+        while changed:
+            lines, threaded = self._thread_jumps(lines)
+            lines, removed = self._remove_dead_code(lines)
+            lines, skipped = self._remove_jumps_to_next(lines)
+            lines, redundant = self._remove_redundant_movs(lines)
+            changed = threaded or removed or skipped or redundant
+
+        self.stats['after'] = self._words(lines)
+        if self.verbose:
+            logger.info("%s", Deferred(self.report))
+        return lines
+
+    def _unsafe_reason(self, code_lines: List[CodeLine]) -> Optional[str]:
+        """Motivo para no optimizar si el programa usa direcciones de código como valores"""
+        labels = {line[:-1] for line, _ in code_lines if line.endswith(':')}
+        names = set()
+        for line, _ in code_lines:
+            instruction = self._parse(line)
+            if instruction is None:
+                continue
+            name, operands = instruction
+            names.add(name)
+            if name in JUMP_INSTRUCTIONS:
+                if len(operands) == 1 and ValueConverter.is_numeric(operands[0]):
+                    return f"salto a una dirección numérica ({line})"
+                continue
+            for operand in operands:
+                if operand in labels or (operand.startswith('(') and operand[1:-1] in labels):
+                    return f"etiqueta usada como valor ({line})"
+        if 'CALL' in names and 'POP' in names:
+            return "POP en un programa con CALL (podría modificar una dirección de retorno)"
+        return None
+
+    def report(self) -> str:
+        stats = self.stats
+        if stats.get('skipped'):
+            return f"Optimización -O omitida: {stats['skipped']}"
+        return (f"Optimización -O: {stats['before']} -> {stats['after']} palabras "
+                f"({stats['before'] - stats['after']} menos, unos {stats['cycles']} ciclos menos por pasada; "
+                f"saltos encadenados: {stats['jump_chain']}, código inalcanzable: {stats['dead_code']}, "
+                f"saltos a la siguiente: {stats['jump_to_next']}, MOV redundantes: {stats['redundant_mov']})")
+
+    def _parse(self, line: str) -> Optional[Tuple[str, Tuple[str, ...]]]:
+        """Nombre y operandos normalizados de una instrucción, o None para una etiqueta"""
+        if line.endswith(':'):
+            return None
+        instruction = self._parsed.get(line)
+        if instruction is None:
+            name, operands = self.instruction_processor._parse_instruction(line)
+            instruction = self._parsed[line] = (name, tuple(_normalize(operand) for operand in operands))
+        return instruction
+
+    def _words(self, lines: List[CodeLine]) -> int:
+        return sum(_size(line) for line, _ in lines if not line.endswith(':'))
+
+    def _label_targets(self, lines: List[CodeLine]) -> Dict[str, int]:
+        """Índice de la primera instrucción después de cada etiqueta"""
+        targets = {}
+        pending = []
+        for index, (line, _) in enumerate(lines):
+            if line.endswith(':'):
+                pending.append(line[:-1])
+                continue
+            for label in pending:
+                targets[label] = index
+            pending = []
+        for label in pending:
+            targets[label] = len(lines)
+        return targets
+
+    def _thread_jumps(self, lines: List[CodeLine]) -> Tuple[List[CodeLine], bool]:
+        """Un salto a un JMP va directo al destino final de la cadena"""
+        targets = self._label_targets(lines)
+        changed = False
+        result = []
+        for line, line_number in lines:
+            instruction = self._parse(line)
+            if instruction and instruction[0] in JUMP_INSTRUCTIONS and len(instruction[1]) == 1:
+                name, (label,) = instruction
+                visited = {label}
+                hops = 0
+                while label in targets and targets[label] < len(lines):
+                    following = self._parse(lines[targets[label]][0])
+                    if following is None or following[0] != 'JMP' or len(following[1]) != 1:
+                        break
+                    next_label = following[1][0]
+                    if next_label == label or next_label not in targets:
+                        # JMP a sí mismo (fin del programa): el destino ya es estable
+                        break
+                    if next_label in visited:
+                        # Ciclo de saltos: se deja como está
+                        hops = 0
+                        break
+                    visited.add(next_label)
+                    label = next_label
+                    hops += 1
+                if hops:
+                    line = f"{name} {label}"
+                    self.stats['jump_chain'] += 1
+                    self.stats['cycles'] += hops
+                    changed = True
+            result.append((line, line_number))
+        return result, changed
+
+    def _remove_dead_code(self, lines: List[CodeLine]) -> Tuple[List[CodeLine], bool]:
+        """Quita las instrucciones entre un JMP o RET y la siguiente etiqueta"""
+        result = []
+        reachable = True
+        changed = False
+        for line, line_number in lines:
+            if line.endswith(':'):
+                reachable = True
+            elif not reachable:
+                self.stats['dead_code'] += 1
+                changed = True
+                continue
+            else:
+                reachable = self._parse(line)[0] not in UNCONDITIONAL_INSTRUCTIONS
+            result.append((line, line_number))
+        return result, changed
+
+    def _remove_jumps_to_next(self, lines: List[CodeLine]) -> Tuple[List[CodeLine], bool]:
+        """Quita los saltos a la instrucción que les sigue (CALL no, porque usa el stack)"""
+        result = []
+        changed = False
+        for index, (line, line_number) in enumerate(lines):
+            instruction = self._parse(line)
+            if instruction and instruction[0] in JUMP_INSTRUCTIONS and instruction[0] != 'CALL' and len(instruction[1]) == 1:
+                following = index + 1
+                while following < len(lines) and lines[following][0].endswith(':'):
+                    if lines[following][0][:-1] == instruction[1][0]:
+                        self.stats['jump_to_next'] += 1
+                        self.stats['cycles'] += 1
+                        changed = True
+                        break
+                    following += 1
+                else:
+                    result.append((line, line_number))
+                continue
+            result.append((line, line_number))
+        return result, changed
+
+    def _remove_redundant_movs(self, lines: List[CodeLine]) -> Tuple[List[CodeLine], bool]:
+        """Quita un MOV que no cambia nada después del MOV anterior (sin etiquetas entre ellos)"""
+        result = []
+        previous = None
+        changed = False
+        for line, line_number in lines:
+            instruction = self._parse(line)
+            if instruction and previous and _redundant_mov(previous, instruction):
+                self.stats['redundant_mov'] += 1
+                self.stats['cycles'] += 1
+                changed = True
+                continue
+            result.append((line, line_number))
+            previous = instruction
+        return result, changed
+
+
+def _normalize(operand: str) -> str:
+    if operand.startswith('(') and operand.endswith(')'):
+        return f"({operand[1:-1].strip()})"
+    return operand
+
+
+def _size(line: str) -> int:
+    return 2 if line.split(None, 1)[0] in DOUBLE_WORD_INSTRUCTIONS else 1
+
+
+def _redundant_mov(previous: Tuple[str, Tuple[str, ...]], current: Tuple[str, Tuple[str, ...]]) -> bool:
+    if previous[0] != 'MOV' or current[0] != 'MOV' or len(previous[1]) != 2 or len(current[1]) != 2:
+        return False
+    (destination, source), (new_destination, new_source) = previous[1], current[1]
+    # MOV (x), A seguido de MOV A, (x): A ya tiene ese valor
+    if destination.startswith('(') and source in REGISTERS:
+        return current[1] == (source, destination)
+    if destination not in REGISTERS:
+        return False
+    # MOV A, (x) o MOV A, B seguido de la escritura inversa: el destino ya tiene ese valor.
+    # No aplica si la dirección depende del registro recién cargado, como (A) o (B)
+    if current[1] == (source, destination):
+        return (source in REGISTERS or source.startswith('(')) and source != f"({destination})"
+    # El mismo MOV dos veces, si la fuente no depende del registro que escribe
+    return current[1] == previous[1] and source not in (destination, f"({destination})")
@@ -0,0 +1,314 @@
+import hashlib
+import os
+import re
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from components.valueConverter import ValueConverter
+from utils.exceptions import SyntaxError
+from utils.fingerprint import text_digest
+
+# Directivas, al inicio de la línea y en mayúsculas:
+#   NOMBRE EQU valor | NOMBRE MACRO p1, p2 ... ENDM | REPT n ... ENDM | INCLUDE archivo | LOCAL etiqueta
+#   | GLOBAL nombre, nombre (símbolos que un módulo exporta al enlazar)
+DIRECTIVE_PATTERN = re.compile(r'\s*(?:(\w+)\s+(EQU|MACRO)|(REPT|INCLUDE|LOCAL|GLOBAL|ENDM))(?=\s|//|$)\s*(.*)$')
+
+# Basta con buscar esto en el texto para saber si hay algo que preprocesar
+NEEDED_PATTERN = re.compile(r'^\s*(?:\w+\s+(?:EQU|MACRO)|REPT|INCLUDE|GLOBAL)(?=\s|//|$)', re.MULTILINE)
+NEEDED_KEYWORDS = ('EQU', 'MACRO', 'REPT', 'INCLUDE', 'GLOBAL')
+
+# Palabras que se reemplazan; los strings y caracteres se dejan tal cual
+WORD_PATTERN = re.compile(r'"[^"]*"|\'.\'|\w+')
+
+# Argumentos de una macro: las comas dentro de paréntesis, strings o caracteres no separan
+ARGUMENT_PATTERN = re.compile(r'(?:"[^"]*"|\'.\'|\([^)]*\)|[^,])+')
+
+# Bloques que terminan en ENDM
+BLOCK_DIRECTIVES = {'MACRO', 'REPT'}
+
+# Profundidad máxima de macros, repeticiones e inclusiones anidadas
+MAX_DEPTH = 64
+
+# Máximo de repeticiones de un REPT; más que eso es casi seguro un error
+MAX_REPT = 65536
+
+# Máximo de archivos incluidos cuya expansión se guarda entre ensamblajes
+INCLUDE_MEMO_SIZE = 256
+
+NumberedLine = Tuple[int, str]
+
+
+class SourceLine(int):
+    """Número de línea que además recuerda el archivo y la macro de donde viene"""
+
+    def __new__(cls, number: int, file: Optional[str] = None, macro: Optional[str] = None):
+        line = super().__new__(cls, number)
+        line.file = file
+        line.macro = macro
+        return line
+
+    def __str__(self) -> str:
+        text = str(int(self))
+        if self.file is not None:
+            text += f" de {os.path.basename(self.file)}"
+        if self.macro is not None:
+            text += f" (macro {self.macro})"
+        return text
+
+
+class Macro(NamedTuple):
+    name: str
+    params: Tuple[str, ...]
+    body: Tuple[NumberedLine, ...]
+
+
+class IncludeExpansion(NamedTuple):
+    files: Tuple[Tuple[str, str], ...]
+    lines: Tuple[NumberedLine, ...]
+    constants: Tuple[Tuple[str, str], ...]
+    macros: Tuple[Macro, ...]
+    local_counter: int
+    definitions_digest: str
+    exported: Tuple[str, ...]
+
+
+def _strip_comment(text: str) -> str:
+    comment = text.find('//')
+    return (text if comment == -1 else text[:comment]).strip()
+
+
+class Preprocessor:
+    """
+    Expande constantes (EQU), macros con parámetros, bloques REPT e INCLUDE
+    antes de separar las secciones, y anota los nombres de GLOBAL. Cada línea expandida lleva un SourceLine
+    con su archivo y línea de origen, para los mensajes de error. La expansión
+    de cada archivo incluido se guarda según su contenido y las definiciones
+    previas, así que no se vuelve a expandir mientras no cambie.
+    """
+
+    def __init__(self, remove_comments: Callable[[str], str], include_memo: Optional[Dict] = None):
+        self.remove_comments = remove_comments
+        # Directorio para las rutas relativas de INCLUDE (None: el directorio actual)
+        self.base_dir: Optional[str] = None
+        self.include_memo: Dict[Tuple, IncludeExpansion] = {} if include_memo is None else include_memo
+        self.reset()
+
+    def reset(self) -> None:
+        """Descarta las definiciones de un ensamblaje anterior"""
+        self.constants: Dict[str, str] = {}
+        self.macros: Dict[str, Macro] = {}
+        # Archivos incluidos en este ensamblaje (para invalidar cachés)
+        self.included: List[str] = []
+        # Nombres declarados con GLOBAL, que Assembler.assemble_object exporta
+        self.exported: List[str] = []
+        self.local_counter = 0
+        self.definitions_digest = ''
+        self.stats = {'includes': 0, 'memo_hits': 0, 'expansions': 0}
+        self._file_digests: Dict[str, str] = {}
+        self._include_stack: List[str] = []
+
+    def needed(self, text: str) -> bool:
+        # Buscar las palabras clave como substrings es mucho más rápido que la expresión regular
+        if not any(keyword in text for keyword in NEEDED_KEYWORDS):
+            return False
+        return NEEDED_PATTERN.search(text) is not None
+
+    def expand(self, lines: List[str]) -> Tuple[List[str], List[int]]:
+        """Expande el programa completo y entrega sus líneas junto con su origen"""
+        expanded = []
+        line_numbers = []
+        for line_number, line in self.iter_expand(enumerate(lines, 1)):
+            line_numbers.append(line_number)
+            expanded.append(line)
+        return expanded, line_numbers
+
+    def iter_expand(self, numbered: Iterable[NumberedLine]) -> Iterator[NumberedLine]:
+        """Versión perezosa de expand, sobre tuplas (número de línea, línea)"""
+        self.reset()
+        yield from self._expand(iter(numbered), self.base_dir, 0)
+
+    def _expand(self, numbered: Iterator[NumberedLine], directory: Optional[str], depth: int) -> Iterator[NumberedLine]:
+        for location, line in numbered:
+            directive = DIRECTIVE_PATTERN.match(line)
+            if directive is None:
+                if self.constants:
+                    line = self._replace_words(line, self.constants)
+                if self.macros:
+                    parts = line.split(None, 1)
+                    macro = self.macros.get(parts[0]) if parts else None
+                    if macro is not None:
+                        arguments = _strip_comment(parts[1]) if len(parts) == 2 else ''
+                        yield from self._expand_macro(macro, arguments, location, directory, depth)
+                        continue
+                yield location, line
+                continue
+
+            name, keyword = directive.group(1), directive.group(2) or directive.group(3)
+            argument = _strip_comment(directive.group(4))
+            if keyword == 'EQU':
+                self._define_constant(name, self._replace_words(argument, self.constants), location)
+            elif keyword == 'MACRO':
+                params = tuple(param.strip() for param in argument.split(',')) if argument else ()
+                self._define_macro(Macro(name, params, self._collect_block(numbered, keyword, location)), location)
+            elif keyword == 'REPT':
+                count = self._parse_count(self._replace_words(argument, self.constants), location)
+                body = self._collect_block(numbered, keyword, location)
+                for _ in range(count):
+                    yield from self._expand(iter(self._instantiate(body, {}, None)), directory, depth + 1)
+            elif keyword == 'INCLUDE':
+                yield from self._include(argument, location, directory, depth)
+            elif keyword == 'GLOBAL':
+                names = [name.strip() for name in argument.split(',')]
+                if not all(name.isidentifier() for name in names):
+                    raise SyntaxError(f"Línea {location}: GLOBAL requiere nombres separados por comas: {argument}")
+                self.exported.extend(names)
+            else:
+                raise SyntaxError(f"Línea {location}: {keyword} fuera de una macro o bloque REPT")
+
+    def _collect_block(self, numbered: Iterator[NumberedLine], keyword: str, start: int) -> Tuple[NumberedLine, ...]:
+        """Líneas hasta el ENDM que cierra el bloque, sin expandir"""
+        body = []
+        nesting = 0
+        for location, line in numbered:
+            directive = DIRECTIVE_PATTERN.match(line)
+            if directive is not None:
+                inner = directive.group(2) or directive.group(3)
+                if inner in BLOCK_DIRECTIVES:
+                    nesting += 1
+                elif inner == 'ENDM':
+                    if nesting == 0:
+                        return tuple(body)
+                    nesting -= 1
+            body.append((location, line))
+        raise SyntaxError(f"Línea {start}: {keyword} sin ENDM")
+
+    def _instantiate(self, body: Tuple[NumberedLine, ...], replacements: Dict[str, str],
+                     macro: Optional[str]) -> List[NumberedLine]:
+        """Copia del cuerpo con los parámetros reemplazados y etiquetas LOCAL únicas"""
+        self.local_counter += 1
+        replacements = dict(replacements)
+        lines = []
+        nesting = 0
+        for line_number, line in body:
+            directive = DIRECTIVE_PATTERN.match(line)
+            if directive is not None:
+                inner = directive.group(2) or directive.group(3)
+                if inner == 'LOCAL' and nesting == 0:
+                    for label in _strip_comment(directive.group(4)).split(','):
+                        label = label.strip()
+                        replacements[label] = f"{label}_{self.local_counter}"
+                    continue
+                if inner in BLOCK_DIRECTIVES:
+                    nesting += 1
+                elif inner == 'ENDM':
+                    nesting -= 1
+            if replacements:
+                line = self._replace_words(line, replacements)
+            if macro is not None:
+                line_number = SourceLine(line_number, getattr(line_number, 'file', None), macro)
+            lines.append((line_number, line))
+        return lines
+
+    def _expand_macro(self, macro: Macro, arguments: str, location: int,
+                      directory: Optional[str], depth: int) -> Iterator[NumberedLine]:
+        if depth >= MAX_DEPTH:
+            raise SyntaxError(f"Línea {location}: Expansión demasiado profunda en la macro {macro.name}")
+        values = [value.strip() for value in ARGUMENT_PATTERN.findall(arguments)]
+        if len(values) != len(macro.params):
+            raise SyntaxError(f"Línea {location}: La macro {macro.name} espera {len(macro.params)} argumentos y recibió {len(values)}")
+        self.stats['expansions'] += 1
+        body = self._instantiate(macro.body, dict(zip(macro.params, values)), macro.name)
+        yield from self._expand(iter(body), directory, depth + 1)
+
+    def _include(self, argument: str, location: int, directory: Optional[str], depth: int) -> Iterator[NumberedLine]:
+        path = argument[1:-1] if len(argument) >= 2 and argument[0] == argument[-1] == '"' else argument
+        if not path:
+            raise SyntaxError(f"Línea {location}: INCLUDE requiere un archivo")
+        resolved = path if directory is None or os.path.isabs(path) else os.path.join(directory, path)
+        if resolved in self._include_stack or depth >= MAX_DEPTH:
+            raise SyntaxError(f"Línea {location}: Inclusión circular de {path}")
+
+        # Se anota antes de leerlo, para que --watch también observe un archivo que falta
+        self.included.append(resolved)
+        content_digest = self._file_digest(resolved, location, path)
+        self.stats['includes'] += 1
+
+        key = (resolved, content_digest, self.definitions_digest, self.local_counter)
+        entry = self.include_memo.get(key)
+        if entry is not None and all(self._file_digest(file, location, file) == digest for file, digest in entry.files):
+            # Misma entrada y mismas definiciones previas: se repite el resultado guardado
+            self.stats['memo_hits'] += 1
+            self.constants.update(entry.constants)
+            self.macros.update((macro.name, macro) for macro in entry.macros)
+            self.local_counter = entry.local_counter
+            self.definitions_digest = entry.definitions_digest
+            self.included.extend(file for file, _ in entry.files)
+            self.exported.extend(entry.exported)
+            yield from entry.lines
+            return
+
+        constants_before = set(self.constants)
+        macros_before = set(self.macros)
+        included_before = len(self.included)
+        exported_before = len(self.exported)
+        with open(resolved, 'r') as f:
+            text = self.remove_comments(f.read())
+        numbered = ((SourceLine(number, resolved), line) for number, line in enumerate(text.split('\n'), 1))
+        self._include_stack.append(resolved)
+        try:
+            lines = tuple(self._expand(numbered, os.path.dirname(resolved), depth + 1))
+        finally:
+            self._include_stack.pop()
+
+        if len(self.include_memo) >= INCLUDE_MEMO_SIZE:
+            self.include_memo.clear()
+        self.include_memo[key] = IncludeExpansion(
+            files=tuple((file, self._file_digests[file]) for file in self.included[included_before:]),
+            lines=lines,
+            constants=tuple((name, value) for name, value in self.constants.items() if name not in constants_before),
+            macros=tuple(macro for name, macro in self.macros.items() if name not in macros_before),
+            local_counter=self.local_counter,
+            definitions_digest=self.definitions_digest,
+            exported=tuple(self.exported[exported_before:]),
+        )
+        yield from lines
+
+    def _file_digest(self, path: str, location: int, name: str) -> str:
+        """Huella del contenido de un archivo, leído una sola vez por ensamblaje"""
+        digest = self._file_digests.get(path)
+        if digest is None:
+            try:
+                with open(path, 'rb') as f:
+                    digest = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+            except OSError as e:
+                raise SyntaxError(f"Línea {location}: No se pudo leer {name}: {e.strerror}")
+            self._file_digests[path] = digest
+        return digest
+
+    def _define_constant(self, name: str, value: str, location: int) -> None:
+        if name in self.constants:
+            raise SyntaxError(f"Línea {location}: Constante '{name}' ya definida")
+        if not value:
+            raise SyntaxError(f"Línea {location}: Constante '{name}' sin valor")
+        self.constants[name] = value
+        self.definitions_digest = text_digest(f"{self.definitions_digest}\0EQU\0{name}\0{value}")
+
+    def _define_macro(self, macro: Macro, location: int) -> None:
+        if macro.name in self.macros:
+            raise SyntaxError(f"Línea {location}: Macro '{macro.name}' ya definida")
+        self.macros[macro.name] = macro
+        body = '\n'.join(line for _, line in macro.body)
+        self.definitions_digest = text_digest(f"{self.definitions_digest}\0MACRO\0{macro.name}\0{macro.params}\0{body}")
+
+    @staticmethod
+    def _parse_count(text: str, location: int) -> int:
+        literal = ValueConverter.literal(text)
+        if literal.value is None or literal.kind == 'char':
+            raise SyntaxError(f"Línea {location}: Cantidad de repeticiones inválida: {text}")
+        if literal.value < 0:
+            raise SyntaxError(f"Línea {location}: La cantidad de repeticiones no puede ser negativa: {text}")
+        if literal.value > MAX_REPT:
+            raise SyntaxError(f"Línea {location}: La cantidad de repeticiones supera el máximo de {MAX_REPT}: {text}")
+        return literal.value
+
+    @staticmethod
+    def _replace_words(line: str, replacements: Dict[str, str]) -> str:
+        return WORD_PATTERN.sub(lambda match: replacements.get(match.group(), match.group()), line)
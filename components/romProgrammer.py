@@ -0,0 +1,117 @@
+import os
+import time
+from typing import Iterable, List, Optional
+from utils.logger import Deferred, logger
+
+# Bytes por palabra de ROM enviados a la Basys3 (36 bits)
+WORD_BYTES = 5
+
+
+def _bits(payload: bytes) -> str:
+    return f"{int.from_bytes(payload, 'big'):036b}"
+
+
+class MockBasys3:
+    """
+    Reemplazo de iic2343.Basys3 que solo registra las escrituras. latency
+    simula el tiempo de cada escritura serial, para medir sin hardware.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.rom = {}
+        self.writes = 0
+        self.open = False
+
+    def begin(self, port_number: Optional[int] = None) -> None:
+        self.open = True
+
+    def write(self, address: int, data: bytearray) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+        self.rom[address] = bytes(data)
+        self.writes += 1
+
+    def end(self) -> None:
+        self.open = False
+
+
+class RomProgrammer:
+    """
+    Programa la ROM de la Basys3 enviando solo las direcciones que cambiaron
+    respecto de la última imagen programada, guardada en cache_path con el
+    mismo formato que la salida .bin (5 bytes por palabra).
+    """
+
+    def __init__(self, device, cache_path: Optional[str] = None,
+                 progress_interval: float = 0.5, verbose: bool = False):
+        self.device = device
+        self.cache_path = cache_path
+        self.progress_interval = progress_interval
+        self.verbose = verbose
+
+    @staticmethod
+    def payloads(binary: Iterable[int]) -> List[bytearray]:
+        """Bytes a enviar por cada dirección, calculados una sola vez."""
+        return [bytearray(word.to_bytes(WORD_BYTES, 'big')) for word in binary]
+
+    def load_cache(self) -> bytes:
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return b''
+        with open(self.cache_path, 'rb') as f:
+            return f.read()
+
+    def save_cache(self, payloads: List[bytearray]) -> None:
+        if not self.cache_path:
+            return
+        temporary = self.cache_path + '.tmp'
+        with open(temporary, 'wb') as f:
+            f.write(b''.join(payloads))
+        os.replace(temporary, self.cache_path)
+
+    @staticmethod
+    def changed_addresses(payloads: List[bytearray], previous: bytes) -> List[int]:
+        """Direcciones cuya palabra difiere de la imagen anterior."""
+        if b''.join(payloads) == previous:
+            return []
+        return [
+            address for address, payload in enumerate(payloads)
+            if previous[address * WORD_BYTES:(address + 1) * WORD_BYTES] != payload
+        ]
+
+    def program(self, binary: Iterable[int], port_number: Optional[int] = 1, full: bool = False) -> int:
+        """
+        Escribe las palabras que cambiaron (todas si full es True o no hay
+        caché) y actualiza la caché. Retorna la cantidad de palabras escritas.
+        """
+        payloads = self.payloads(binary)
+        previous = b'' if full else self.load_cache()
+        addresses = self.changed_addresses(payloads, previous) if previous else list(range(len(payloads)))
+
+        logger.info("Programando %d de %d palabras en la Basys3...", len(addresses), len(payloads))
+        if not addresses:
+            logger.flush()
+            return 0
+
+        device = self.device
+        write = device.write
+        verbose = self.verbose
+        device.begin(port_number=port_number)
+        try:
+            last_report = time.perf_counter()
+            for count, address in enumerate(addresses, 1):
+                write(address, payloads[address])
+                if verbose:
+                    logger.debug("Programando dirección %d: %s", address, Deferred(_bits, payloads[address]))
+                now = time.perf_counter()
+                if now - last_report >= self.progress_interval:
+                    # El avance se muestra de inmediato, junto con lo acumulado hasta ahora
+                    logger.info("  %d/%d palabras escritas", count, len(addresses))
+                    logger.flush()
+                    last_report = now
+        finally:
+            device.end()
+            logger.flush()
+
+        self.save_cache(payloads)
+        return len(addresses)
@@ -0,0 +1,397 @@
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Union
+from components.configuration import Configuration
+from components.instructionEncoder import InstructionEncoder
+from utils.exceptions import SimulatorError
+
+# Parámetros del computador básico del proyecto (enunciado Etapa 2)
+REGISTER_BITS = 16
+ADDRESS_BITS = 12
+
+REGISTER_MASK = (1 << REGISTER_BITS) - 1
+ADDRESS_MASK = (1 << ADDRESS_BITS) - 1
+RAM_SIZE = 1 << ADDRESS_BITS
+HIGH_BIT_SHIFT = REGISTER_BITS - 1
+
+
+# La ALU no opera en complemento de 2: cada operación retorna
+# (resultado, carry, negativo) y N solo se activa cuando una resta da negativo
+def _alu_add(a: int, b: int):
+    total = a + b
+    return total & REGISTER_MASK, total >> REGISTER_BITS, False
+
+def _alu_sub(a: int, b: int):
+    # A + ~B + 1: el carry queda en 1 cuando no hay préstamo
+    total = a + (~b & REGISTER_MASK) + 1
+    return total & REGISTER_MASK, total >> REGISTER_BITS, a < b
+
+def _alu_and(a: int, b: int):
+    return a & b, 0, False
+
+def _alu_or(a: int, b: int):
+    return a | b, 0, False
+
+def _alu_xor(a: int, b: int):
+    return a ^ b, 0, False
+
+def _alu_not(a: int, b: int):
+    return ~a & REGISTER_MASK, 0, False
+
+def _alu_shl(a: int, b: int):
+    return (a << 1) & REGISTER_MASK, a >> HIGH_BIT_SHIFT, False
+
+def _alu_shr(a: int, b: int):
+    return a >> 1, a & 1, False
+
+
+ALU_OPERATIONS = {
+    'ADD': _alu_add,
+    'SUB': _alu_sub,
+    'AND': _alu_and,
+    'OR': _alu_or,
+    'XOR': _alu_xor,
+    'NOT': _alu_not,
+    'SHL': _alu_shl,
+    'SHR': _alu_shr,
+}
+
+# Posición de cada registro en la lista de registros
+REGISTER_INDEX = {'A': 0, 'B': 1}
+
+# Condición de salto en función de los flags (z, n, c)
+JUMP_CONDITIONS = {
+    'JMP': lambda z, n, c: True,
+    'JEQ': lambda z, n, c: z,
+    'JNE': lambda z, n, c: not z,
+    'JGT': lambda z, n, c: not n and not z,
+    'JGE': lambda z, n, c: not n,
+    'JLT': lambda z, n, c: n,
+    'JLE': lambda z, n, c: n or z,
+    'JCR': lambda z, n, c: c,
+}
+
+
+class _Halt(Exception):
+    """Señal interna de un salto incondicional a sí mismo (fin del programa)."""
+    pass
+
+
+def _halt() -> int:
+    raise _Halt
+
+
+class Simulator:
+    """
+    Simulador a nivel de ciclo del computador básico del proyecto: registros A
+    y B de 16 bits, RAM de 4096 palabras, Status (Z, N, C) y SP que parte en
+    la última dirección de RAM. Cada palabra de ROM toma un ciclo, por lo que
+    POP y RET (dos palabras) toman dos.
+
+    Las palabras se decodifican una sola vez al cargarlas: cada dirección de
+    ROM queda asociada a una función ya especializada en sus operandos que
+    ejecuta la instrucción y retorna el siguiente PC.
+    """
+
+    def __init__(self, config: Configuration):
+        self.config = config
+        self.encoder = InstructionEncoder(config)
+        self.opcode_names = {opcode: name for name, opcode in self.encoder.opcodes.items()}
+        self.type_names = {int(bits, 2): name for name, bits in config.types.items()}
+        self.program: List[Callable[[], int]] = []
+        # El estado vive en listas para que las funciones decodificadas lo compartan
+        self.registers = [0, 0]
+        self.flags = [False, False, False]
+        self.stack_pointer = [ADDRESS_MASK]
+        self.ram = [0] * RAM_SIZE
+        self.data_image: Dict[int, int] = {}
+        self.reset()
+
+    def reset(self) -> None:
+        """Vuelve al estado inicial: registros y flags en 0 y RAM con la imagen de DATA."""
+        self.registers[:] = [0, 0]
+        self.flags[:] = [False, False, False]
+        self.stack_pointer[0] = ADDRESS_MASK
+        self.ram[:] = [0] * RAM_SIZE
+        for address, value in self.data_image.items():
+            self.ram[address & ADDRESS_MASK] = value & REGISTER_MASK
+        self.pc = 0
+        self.cycles = 0
+        self.halted = False
+
+    @property
+    def a(self) -> int:
+        return self.registers[0]
+
+    @property
+    def b(self) -> int:
+        return self.registers[1]
+
+    @property
+    def sp(self) -> int:
+        return self.stack_pointer[0]
+
+    @property
+    def z(self) -> bool:
+        return self.flags[0]
+
+    @property
+    def n(self) -> bool:
+        return self.flags[1]
+
+    @property
+    def c(self) -> bool:
+        return self.flags[2]
+
+    def load(self, binary: Iterable[int], data: Optional[Union[Dict[int, int], Sequence[int]]] = None) -> None:
+        """
+        Carga las palabras de ROM y la imagen de la sección DATA: un dict
+        dirección -> valor o una secuencia desde la dirección 0 (Memory.image()).
+        """
+        self.data_image = dict(data) if isinstance(data, dict) else dict(enumerate(data or ()))
+        self.reset()
+        self.program = [self._decode(address, word) for address, word in enumerate(binary)]
+
+    def load_text(self, lines: Iterable[str], data: Optional[Union[Dict[int, int], Sequence[int]]] = None) -> None:
+        """Carga un archivo de salida del assembler (una palabra en bits por línea)."""
+        self.load((int(line, 2) for line in lines if line.strip()), data)
+
+    def run(self, max_cycles: int = 1_000_000) -> int:
+        """
+        Ejecuta hasta salir de la ROM, llegar a un salto incondicional a sí mismo
+        o cumplir max_cycles. Retorna la cantidad de ciclos ejecutados.
+        """
+        program = self.program
+        pc = self.pc
+        executed = 0
+        try:
+            for executed in range(max_cycles):
+                pc = program[pc]()
+            executed = max_cycles
+        except _Halt:
+            executed += 1
+            self.halted = True
+        except IndexError:
+            if pc < len(program):
+                raise
+            self.halted = True
+        self.pc = pc
+        self.cycles += executed
+        return executed
+
+    def step(self) -> None:
+        """Ejecuta una sola palabra."""
+        if self.halted or self.pc >= len(self.program):
+            self.halted = True
+            return
+        try:
+            self.pc = self.program[self.pc]()
+        except _Halt:
+            self.halted = True
+        self.cycles += 1
+
+    def _decode(self, address: int, word: int) -> Callable[[], int]:
+        encoder = self.encoder
+        opcode = word >> encoder.opcode_shift
+        type_mask = (1 << encoder.type_width) - 1
+        param1 = self.type_names.get((word >> encoder.param1_shift) & type_mask)
+        param2 = self.type_names.get((word >> encoder.param2_shift) & type_mask)
+        literal = word & encoder.max_literal
+        name = self.opcode_names.get(opcode)
+        if name is None:
+            raise SimulatorError(f"Opcode desconocido en la dirección {address}: {opcode}")
+
+        next_pc = address + 1
+        if name == 'JMP' and literal == address:
+            return _halt
+        if name in JUMP_CONDITIONS:
+            return self._decode_jump(name, literal, next_pc)
+        return self._decode_instruction(name, param1, param2, literal, next_pc, address)
+
+    def _reader(self, param: Optional[str], literal: int) -> Callable[[], int]:
+        registers = self.registers
+        ram = self.ram
+        if param == 'A':
+            return lambda: registers[0]
+        if param == 'B':
+            return lambda: registers[1]
+        if param == 'lit':
+            value = literal & REGISTER_MASK
+            return lambda: value
+        if param == '(dir)':
+            address = literal & ADDRESS_MASK
+            return lambda: ram[address]
+        if param == '(A)':
+            return lambda: ram[registers[0] & ADDRESS_MASK]
+        if param == '(B)':
+            return lambda: ram[registers[1] & ADDRESS_MASK]
+        raise SimulatorError(f"Operando no legible: {param}")
+
+    def _writer(self, param: Optional[str], literal: int) -> Callable[[int], None]:
+        registers = self.registers
+        ram = self.ram
+        if param == 'A':
+            def write(value): registers[0] = value
+        elif param == 'B':
+            def write(value): registers[1] = value
+        elif param == '(dir)':
+            address = literal & ADDRESS_MASK
+            def write(value): ram[address] = value
+        elif param == '(A)':
+            def write(value): ram[registers[0] & ADDRESS_MASK] = value
+        elif param == '(B)':
+            def write(value): ram[registers[1] & ADDRESS_MASK] = value
+        else:
+            raise SimulatorError(f"Operando no escribible: {param}")
+        return write
+
+    def _decode_jump(self, name: str, literal: int, next_pc: int) -> Callable[[], int]:
+        flags = self.flags
+        target = literal
+        if name == 'JMP':
+            return lambda: target
+        if name == 'JEQ':
+            return lambda: target if flags[0] else next_pc
+        if name == 'JNE':
+            return lambda: next_pc if flags[0] else target
+        condition = JUMP_CONDITIONS[name]
+        def conditional_jump():
+            return target if condition(flags[0], flags[1], flags[2]) else next_pc
+        return conditional_jump
+
+    def _decode_instruction(self, name: str, param1: Optional[str], param2: Optional[str],
+                            literal: int, next_pc: int, address: int) -> Callable[[], int]:
+        registers = self.registers
+        ram = self.ram
+        flags = self.flags
+        stack = self.stack_pointer
+
+        if name == 'NOP':
+            return lambda: next_pc
+
+        if name == 'MOV':
+            # Formas frecuentes sin llamadas intermedias
+            destination = REGISTER_INDEX.get(param1)
+            if destination is not None and param2 == 'lit':
+                value = literal & REGISTER_MASK
+                def mov_literal():
+                    registers[destination] = value
+                    return next_pc
+                return mov_literal
+            if destination is not None and param2 in REGISTER_INDEX:
+                source = REGISTER_INDEX[param2]
+                def mov_register():
+                    registers[destination] = registers[source]
+                    return next_pc
+                return mov_register
+            read = self._reader(param2, literal)
+            write = self._writer(param1, literal)
+            def mov():
+                write(read())
+                return next_pc
+            return mov
+
+        if name in ('ADD', 'SUB', 'AND', 'OR', 'XOR'):
+            # Siempre es A op X; X es el segundo operando o B si no aplica
+            operation = ALU_OPERATIONS[name]
+            source = param2 if param2 not in (None, 'A') else 'B'
+            destination = REGISTER_INDEX.get(param1)
+            if destination is not None and source in ('B', 'lit'):
+                value = literal & REGISTER_MASK
+                from_register = source == 'B'
+                def alu_register():
+                    result, carry, negative = operation(registers[0], registers[1] if from_register else value)
+                    flags[0] = result == 0
+                    flags[1] = negative
+                    flags[2] = bool(carry)
+                    registers[destination] = result
+                    return next_pc
+                return alu_register
+            read = self._reader(source, literal)
+            write = self._writer(param1, literal)
+            def alu():
+                result, carry, negative = operation(registers[0], read())
+                flags[0] = result == 0
+                flags[1] = negative
+                flags[2] = bool(carry)
+                write(result)
+                return next_pc
+            return alu
+
+        if name in ('NOT', 'SHL', 'SHR'):
+            operation = ALU_OPERATIONS[name]
+            write = self._writer(param1, literal)
+            def unary():
+                result, carry, negative = operation(registers[0], 0)
+                flags[0] = result == 0
+                flags[1] = negative
+                flags[2] = bool(carry)
+                write(result)
+                return next_pc
+            return unary
+
+        if name in ('INC', 'DEC'):
+            operation = _alu_add if name == 'INC' else _alu_sub
+            read = self._reader(param1, literal)
+            write = self._writer(param1, literal)
+            def step_value():
+                result, carry, negative = operation(read(), 1)
+                flags[0] = result == 0
+                flags[1] = negative
+                flags[2] = bool(carry)
+                write(result)
+                return next_pc
+            return step_value
+
+        if name == 'CMP':
+            if param2 == 'lit':
+                value = literal & REGISTER_MASK
+                def compare_literal():
+                    a = registers[0]
+                    flags[0] = a == value
+                    flags[1] = a < value
+                    flags[2] = a >= value
+                    return next_pc
+                return compare_literal
+            read = self._reader(param2, literal)
+            def compare():
+                result, carry, negative = _alu_sub(registers[0], read())
+                flags[0] = result == 0
+                flags[1] = negative
+                flags[2] = bool(carry)
+                return next_pc
+            return compare
+
+        if name == 'PUSH':
+            read = self._reader(param1, literal)
+            def push():
+                ram[stack[0]] = read()
+                stack[0] = (stack[0] - 1) & ADDRESS_MASK
+                return next_pc
+            return push
+
+        if name in ('POP1', 'RET1'):
+            def increment_sp():
+                stack[0] = (stack[0] + 1) & ADDRESS_MASK
+                return next_pc
+            return increment_sp
+
+        if name == 'POP2':
+            write = self._writer(param1, literal)
+            def pop():
+                write(ram[stack[0]])
+                return next_pc
+            return pop
+
+        if name == 'RET2':
+            def ret():
+                return ram[stack[0]]
+            return ret
+
+        if name == 'CALL':
+            target = literal
+            def call():
+                ram[stack[0]] = next_pc
+                stack[0] = (stack[0] - 1) & ADDRESS_MASK
+                return target
+            return call
+
+        raise SimulatorError(f"Instrucción no soportada por el simulador en la dirección {address}: {name}")
@@ -1,6 +1,20 @@
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional
 from utils.exceptions import InvalidOperandError
 
+# Máximo de textos distintos guardados en la caché de literales
+LITERAL_CACHE_SIZE = 4096
+
+# Tipo y base de un número según su sufijo (sin sufijo es decimal)
+LITERAL_KINDS = {'d': ('dec', 10), 'b': ('bin', 2), 'h': ('hex', 16)}
+
+class Literal(NamedTuple):
+    kind: str              # 'dec', 'bin', 'hex', 'char', 'string' o 'var'
+    base: int              # 0 si no es un número con base
+    numeric: bool          # resultado de is_numeric
+    value: Optional[int]   # resultado de parse_numeric, None si falla
+    error: Optional[str]   # mensaje de parse_numeric cuando falla
+
 class ValueConverter:
     @staticmethod
     def get_type(param: str, types: Dict) -> str:
@@ -26,9 +40,62 @@ class ValueConverter:
         value = value.strip()
         return value.startswith('"') and value.endswith('"')
 
+    @staticmethod
+    @lru_cache(maxsize=LITERAL_CACHE_SIZE)
+    def literal(value: str) -> Literal:
+        """
+        Interpreta un texto de operando como número una sola vez. is_numeric y
+        parse_numeric leen de aquí, así que cada constante distinta se analiza
+        una vez aunque aparezca en miles de líneas.
+        """
+        numeric = ValueConverter._is_numeric_text(value)
+        if ValueConverter.is_string(value):
+            return Literal('string', 0, numeric, None, "No se puede convertir un string a número")
+
+        value = value.strip()
+        if numeric:
+            if value.startswith("'") and value.endswith("'") and len(value) == 3:
+                kind, base = 'char', 0
+            else:
+                kind, base = LITERAL_KINDS.get(value[-1], ('dec', 10))
+        else:
+            kind, base = 'var', 0
+
+        try:
+            if value.endswith('d'):
+                number = int(value[:-1])
+            elif value.endswith('b'):
+                number = int(value[:-1], 2)
+            elif value.endswith('h'):
+                number = int(value[:-1], 16)
+            elif value.startswith("'") and value.endswith("'") and len(value) == 3:
+                number = ord(value[1])
+            else:
+                number = int(value)
+        except ValueError:
+            return Literal(kind, base, numeric, None, f"Valor numérico inválido: {value}")
+        return Literal(kind, base, numeric, number, None)
+
+    @staticmethod
+    def literal_cache_stats() -> Dict[str, float]:
+        """Aciertos, fallos y tamaño de la caché de literales"""
+        info = ValueConverter.literal.cache_info()
+        lookups = info.hits + info.misses
+        return {
+            'hits': info.hits,
+            'misses': info.misses,
+            'size': info.currsize,
+            'max_size': info.maxsize,
+            'hit_rate': info.hits / lookups if lookups else 0.0,
+        }
+
     @staticmethod
     def is_numeric(value: str) -> bool:
         """Determina si un valor es numérico"""
+        return ValueConverter.literal(value).numeric
+
+    @staticmethod
+    def _is_numeric_text(value: str) -> bool:
         if not value or ValueConverter.is_string(value):
             return False
         
@@ -59,24 +126,10 @@ class ValueConverter:
     @staticmethod
     def parse_numeric(value: str) -> int:
         """Convierte un valor numérico a entero"""
-        if ValueConverter.is_string(value):
-            raise InvalidOperandError("No se puede convertir un string a número")
-            
-        value = value.strip()
-        
-        try:
-            if value.endswith('d'):
-                return int(value[:-1])
-            elif value.endswith('b'):
-                return int(value[:-1], 2)
-            elif value.endswith('h'):
-                return int(value[:-1], 16)
-            elif value.startswith("'") and value.endswith("'") and len(value) == 3:
-                return ord(value[1])
-            else:
-                return int(value)
-        except ValueError:
-            raise InvalidOperandError(f"Valor numérico inválido: {value}")
+        literal = ValueConverter.literal(value)
+        if literal.error is not None:
+            raise InvalidOperandError(literal.error)
+        return literal.value
 
     @staticmethod
     def parse_string(value: str) -> List[int]:
@@ -1,105 +1,384 @@
+import time
+
+START = time.perf_counter()
+
 import argparse
-import json
+import os
 import sys
+from contextlib import nullcontext
 
-from components.assembler import Assembler
+# Los módulos de cada modo (servidor, simulador, Basys3, caché) se importan
+# recién cuando se usan, para que el inicio sea rápido. batchAssembler no
+# carga el ensamblador, así que se importa siempre
+from components.batchAssembler import GLOB_CHARACTERS, assemble_batch, expand_inputs, summarize
+from components.outputWriter import OUTPUT_WRITERS
 from utils.exceptions import AssemblerError
-from utils.logger import log
-from iic2343 import Basys3
+from utils.logger import LEVELS, logger
+from utils.timing import PhaseTimer
+
+SETUP_PATH = 'utils/setup.json'
 
 def parse_arguments():
     parser = argparse.ArgumentParser(description='Assembler para el proyecto de Arquitectura de Computadores')
-    parser.add_argument('input', help='Archivo de entrada con código assembly')
+    parser.add_argument('input', nargs='*', help='Archivo de entrada con código assembly (varios o un patrón glob ensamblan en lote)')
     parser.add_argument('--debug', action='store_true', help='Activar modo de depuración')
     parser.add_argument('--program-basys', action='store_true', help='Programar la ROM de la Basys3 después del ensamblaje')
     parser.add_argument('--port', default=None, help='Puerto serial para la conexión con Basys3')
+    parser.add_argument('--rom-cache', default='.basys3_rom.bin', help='Imagen de la última ROM programada, para escribir solo los cambios')
+    parser.add_argument('--full-program', action='store_true', help='Programar todas las direcciones, ignorando la caché de la ROM')
     parser.add_argument('-v', '--verbose', action='store_true', help='Mostrar información detallada durante el proceso')
-    return parser.parse_args()
+    parser.add_argument('--log-level', default='debug', choices=list(LEVELS), help='Nivel mínimo de los mensajes de -v')
+    parser.add_argument('--listing', metavar='ARCHIVO', default=None, help='Guardar el listado de cada instrucción en un archivo, de una sola vez')
+    parser.add_argument('--stream', action='store_true', help='Ensamblar leyendo y escribiendo de forma incremental')
+    parser.add_argument('--cache', default=None, help='Archivo de caché para re-ensamblar solo las líneas que cambiaron')
+    parser.add_argument('-f', '--format', default='txt', choices=sorted(OUTPUT_WRITERS), help='Formato del archivo de salida')
+    parser.add_argument('-o', '--output', default=None, help='Archivo de salida (por defecto output.<formato>)')
+    parser.add_argument('--simulate', action='store_true', help='Ejecutar el programa ensamblado en el simulador')
+    parser.add_argument('--max-cycles', type=int, default=1_000_000, help='Cantidad máxima de ciclos a simular')
+    parser.add_argument('--watch', action='store_true', help='Volver a ensamblar cada vez que cambie el archivo de entrada')
+    parser.add_argument('--serve', metavar='SOCKET', default=None, help='Atender pedidos de ensamblaje en un socket Unix')
+    parser.add_argument('--connect', metavar='SOCKET', default=None, help='Ensamblar con un servidor ya iniciado con --serve')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='Procesos para ensamblar en lote (por defecto, uno por núcleo)')
+    parser.add_argument('--output-dir', default=None, help='Directorio de las salidas al ensamblar en lote')
+    parser.add_argument('--load-data', action='store_true', help='Cargar los datos iniciales como instrucciones al inicio del programa')
+    parser.add_argument('-O', '--optimize', action='store_true', help='Aplicar el optimizador de mirilla antes de codificar')
+    parser.add_argument('--link', action='store_true', help='Ensamblar cada entrada como módulo (.o) y enlazarlas en una sola salida')
+    parser.add_argument('--timing', action='store_true', help='Mostrar el tiempo de cada fase (imports, configuración, ensamblaje, escritura)')
+    parser.add_argument('--profile', action='store_true', help='Mostrar tiempo y líneas por etapa del ensamblaje y las líneas más lentas')
+    parser.add_argument('--profile-json', metavar='ARCHIVO', default=None, help='Guardar el perfil del ensamblaje como JSON (implica --profile)')
+    parser.add_argument('--profile-stats', metavar='ARCHIVO', default=None, help='Guardar un perfil de cProfile, legible con pstats (implica --profile)')
+    args = parser.parse_args()
+    args.profile = bool(args.profile or args.profile_json or args.profile_stats)
+    args.batch = not (args.connect or args.serve or args.link) and (
+        len(args.input) > 1 or args.jobs is not None or args.output_dir is not None
+        or any(c in path for path in args.input for c in GLOB_CHARACTERS))
+    if args.batch:
+        if not args.input:
+            parser.error('falta el archivo de entrada')
+        if args.output is not None:
+            parser.error('-o no se puede usar al ensamblar en lote (ver --output-dir)')
+        if args.stream or args.watch or args.cache or args.simulate or args.program_basys or args.profile or args.listing:
+            parser.error('el modo en lote solo ensambla y escribe las salidas')
+        if args.jobs is not None and args.jobs < 1:
+            parser.error('--jobs debe ser al menos 1')
+        return args
+    if args.link:
+        if not args.input:
+            parser.error('falta el archivo de entrada')
+        if args.connect or args.serve or args.stream or args.watch or args.cache:
+            parser.error('--link no se puede combinar con --connect, --serve, --stream, --watch ni --cache')
+        if args.load_data or args.optimize:
+            parser.error('--load-data y -O necesitan las direcciones finales y no se pueden usar con --link')
+    elif args.connect:
+        if not args.input:
+            parser.error('falta el archivo de entrada')
+        if len(args.input) > 1 and args.output is not None:
+            parser.error('-o solo se puede usar con un archivo de entrada')
+    elif args.serve:
+        if args.input:
+            parser.error('--serve no recibe archivo de entrada')
+    elif not args.input:
+        parser.error('falta el archivo de entrada')
+    else:
+        args.input = args.input[0]
+    if args.serve and (args.watch or args.connect or args.stream):
+        parser.error('--serve no se puede combinar con --watch, --connect ni --stream')
+    if args.connect and (args.watch or args.stream or args.simulate or args.program_basys):
+        parser.error('--connect solo ensambla y escribe la salida')
+    if args.watch and args.stream:
+        parser.error('--watch no se puede combinar con --stream')
+    if args.stream and args.program_basys:
+        parser.error('--stream no se puede combinar con --program-basys')
+    if args.stream and args.simulate:
+        parser.error('--stream no se puede combinar con --simulate')
+    if args.stream and args.cache:
+        parser.error('--stream no se puede combinar con --cache')
+    if args.profile and (args.connect or args.serve or args.watch or args.link or args.stream or args.cache):
+        parser.error('--profile solo mide un ensamblaje normal (sin --connect, --serve, --watch, --link, --stream ni --cache)')
+    if args.listing and (args.connect or args.serve or args.watch or args.link or args.cache):
+        parser.error('--listing solo se puede usar en un ensamblaje normal o con --stream')
+    if args.stream and args.format != 'txt':
+        parser.error('--stream solo genera salida en formato txt')
+    if args.output is None and not args.connect:
+        args.output = 'output' + OUTPUT_WRITERS[args.format].extension
+    return args
 
-def program_basys(binary, port=None, verbose=False):
+def program_basys(binary, port=None, verbose=False, cache_path=None, full=False):
+    # Solo se necesita al programar la placa
+    from iic2343 import Basys3
+    from components.romProgrammer import RomProgrammer
     print("Iniciando programación de la Basys3...")
-    rom_programmer = Basys3()
-    rom_programmer.begin(port_number=1)
-    for address, instruction in enumerate(binary):
-        print(f"Programando dirección {address}: {instruction}")
-
-        old_instruction_bytes = bytearray([int(instruction[i:i+8], 2) for i in range(0, len(instruction), 8)])
-        new_instruction_bytes = bytearray(int(instruction, 2).to_bytes(5, "big"))
-        tst_instruction_bytes = remove_first_4_bits(bytearray(int(instruction, 2).to_bytes(5, "big")))
-
-        rom_programmer.write(address, new_instruction_bytes)
+    programmer = RomProgrammer(Basys3(), cache_path=cache_path, verbose=verbose)
+    programmer.program(binary, port_number=1, full=full)
+    print("Programación de la Basys3 completada.")
 
-        # print("Obj bin:", instruction)
+def simulate(assembler, binary, max_cycles):
+    from components.simulator import Simulator
+    simulator = Simulator(assembler.config)
+    simulator.load(binary, assembler.memory.image())
+    start = time.perf_counter()
+    cycles = simulator.run(max_cycles)
+    elapsed = time.perf_counter() - start
+    state = "detenido" if simulator.halted else "límite de ciclos alcanzado"
+    print(f"Simulación: {cycles} ciclos ({state}) en {elapsed:.3f} s")
+    print(f"  A={simulator.a} B={simulator.b} PC={simulator.pc} SP={simulator.sp} "
+          f"Z={int(simulator.z)} N={int(simulator.n)} C={int(simulator.c)}")
 
-        # olb_bin_repre = ''.join(format(byte, '08b') for byte in old_instruction_bytes)
-        # print(f"Old bin: {olb_bin_repre}")
+def build(args, assembler, cache=None, timer=None):
+    """Ensambla el archivo de entrada, escribe la salida y ejecuta los pasos pedidos"""
+    timer = timer or PhaseTimer()
+    profile = None
+    if args.profile:
+        from utils.profiling import AssemblyProfile
+        profile = AssemblyProfile()
+        with profile.stage('programa') as stage, (profile.cprofile() if args.profile_stats else nullcontext()):
+            binary = _build_output(args, assembler, cache, timer, profile)
+            stage['lines'] = profile.stages['FileProcessor']['lines']
+    else:
+        binary = _build_output(args, assembler, cache, timer)
+    
+    print(f"Ensamblaje exitoso. Resultado guardado en {args.output}")
+    if profile is not None:
+        print(profile.report())
+        if args.profile_json:
+            profile.write_json(args.profile_json)
+            print(f"Perfil guardado en {args.profile_json}")
+        if args.profile_stats:
+            profile.write_pstats(args.profile_stats)
+            print(f"Perfil de cProfile guardado en {args.profile_stats}")
+    # Con un acierto de --cache no se vuelve a generar la precarga ni a optimizar
+    if args.load_data and not args.verbose and assembler.data_processor.preload_stats:
+        print(assembler.data_processor.preload_summary())
+    if args.optimize and not args.verbose and assembler.optimizer.stats:
+        print(assembler.optimizer.report())
 
-        # new_bin_repre = ''.join(format(byte, '08b') for byte in new_instruction_bytes)
-        # print(f"New bin: {new_bin_repre}")
+    if args.simulate:
+        with timer.phase('simulación'):
+            simulate(assembler, binary, args.max_cycles)
 
-        # tst_bin_repre = ''.join(format(byte, '08b') for byte in tst_instruction_bytes)
-        # print(f"Tst bin: {tst_bin_repre}\n")
+    if args.program_basys:
+        with timer.phase('programación'):
+            program_basys(binary, args.port, args.verbose, args.rom_cache, args.full_program)
 
-        if verbose:
-            print(f"Programando dirección {address}: {instruction}")
-    rom_programmer.end()
-    print("Programación de la Basys3 completada.")
-
-def remove_first_4_bits(byte_array):
-    # Convert bytearray to integer
-    original_int = int.from_bytes(byte_array, byteorder='big')
+def _build_output(args, assembler, cache, timer, profile=None):
+    """Lee, ensambla y escribe el archivo de entrada; retorna las palabras"""
+    with timer.phase('lectura'):
+        with open(args.input, 'r') as f:
+            program = f.read()
+    
+    if args.verbose:
+        logger.info("Procesando archivo de entrada: %s", args.input)
+    # Las rutas de INCLUDE e incbin son relativas al archivo de entrada
+    assembler.base_dir = os.path.dirname(os.path.abspath(args.input))
     
-    # Shift left by 4 bits
-    shifted_int = (original_int << 4) & ((1 << 36) - 1)
+    with timer.phase('ensamblaje'):
+        if cache is not None:
+            binary = cache.assemble(program)
+        else:
+            binary = assembler.assemble(program, profile=profile)
     
-    # Convert back to bytearray (5 bytes for 36 bits)
-    new_byte_array = shifted_int.to_bytes(5, byteorder='big')
+    if args.verbose:
+        logger.info("Ensamblaje completado. Escribiendo salida en: %s", args.output)
     
-    return new_byte_array
+    with timer.phase('escritura'):
+        if profile is not None:
+            with profile.stage('escritura') as stage:
+                assembler.write(binary, args.output, args.format)
+                stage['lines'] = len(binary)
+        else:
+            assembler.write(binary, args.output, args.format)
+    return binary
 
-def main():
-    args = parse_arguments()
+def link(args, assembler, timer):
+    """Ensambla cada entrada como módulo, reutilizando los objetos vigentes, y enlaza todo"""
+    from components.linker import Linker
+    linker = Linker(assembler)
+    with timer.phase('ensamblaje'):
+        binary = linker.build(args.input, args.output_dir)
+    with timer.phase('escritura'):
+        assembler.write(binary, args.output, args.format)
+    stats = linker.stats
+    print(f"Enlace exitoso. Resultado guardado en {args.output} "
+          f"({stats['assembled']} módulos ensamblados, {stats['reused']} reutilizados, {stats['prebuilt']} objetos)")
+
+    if args.simulate:
+        with timer.phase('simulación'):
+            simulate(assembler, binary, args.max_cycles)
 
+    if args.program_basys:
+        with timer.phase('programación'):
+            program_basys(binary, args.port, args.verbose, args.rom_cache, args.full_program)
+
+def watch_input(args, assembler, cache=None):
+    """Ensambla y vuelve a ensamblar con cada cambio del archivo o de lo que incluye, hasta Ctrl+C"""
+    from components.assemblyServer import FileWatcher
+    print(f"Observando {args.input} (Ctrl+C para salir)")
+    watcher = FileWatcher([args.input])
+    try:
+        while True:
+            try:
+                build(args, assembler, cache)
+            except FileNotFoundError:
+                print(f"Error: No se pudo encontrar el archivo de entrada '{args.input}'")
+            except AssemblerError as e:
+                print(f"Error de ensamblado: {e}")
+            # Con un acierto de --cache no se lee ningún archivo incluido: se usan los que guardó la caché
+            dependencies = assembler.context.dependencies() + (cache.dependencies() if cache is not None else [])
+            watcher.update(list(dict.fromkeys([args.input] + dependencies)))
+            watcher.wait()
+    except KeyboardInterrupt:
+        pass
+
+def serve(socket_path, assembler):
+    from components.assemblyServer import AssemblyServer, AssemblyService
+    server = AssemblyServer(socket_path, AssemblyService(assembler))
+    print(f"Servidor de ensamblaje escuchando en {socket_path} (Ctrl+C para salir)")
     try:
-        with open('utils/setup.json') as f:
-            setup = json.load(f)
+        server.serve_until_shutdown()
+    except KeyboardInterrupt:
+        pass
+
+def connect(args):
+    """
+    Envía los archivos de entrada a un servidor iniciado con --serve, todos
+    por la misma conexión. Sin -o, cada salida queda junto a su archivo.
+    """
+    from components.assemblyServer import request
+    responses = request(args.connect, [{
+        'input': os.path.abspath(path),
+        'output': os.path.abspath(args.output) if args.output else None,
+        'format': args.format,
+    } for path in args.input])
+    failed = False
+    for path, response in zip(args.input, responses):
+        if response['ok']:
+            print(f"Ensamblaje exitoso. Resultado guardado en {response['output']}")
+        else:
+            print(f"Error de ensamblado en {path}: {response['error']}")
+            failed = True
+    if failed:
+        sys.exit(1)
+
+def batch(args, config, timer):
+    """Ensambla todas las entradas en paralelo y muestra un resumen"""
+    inputs = expand_inputs(args.input)
+    if not inputs:
+        print("Error: Ningún archivo coincide con las entradas indicadas")
+        sys.exit(1)
+    start = time.perf_counter()
+    with timer.phase('ensamblaje'):
+        results = assemble_batch(config, inputs, args.format, args.output_dir, args.jobs, args.load_data, args.optimize)
+    elapsed = time.perf_counter() - start
+    if args.verbose:
+        for result in results:
+            if result.ok:
+                print(f"{result.input} -> {result.output} ({result.words} palabras, {result.seconds:.3f} s)")
+    print(summarize(results, elapsed))
+    if args.timing:
+        print(timer.report())
+    if not all(result.ok for result in results):
+        sys.exit(1)
+
+def load_configuration():
+    """Carga setup.json, desde su versión precompilada si sigue vigente"""
+    from components.configuration import Configuration
+    try:
+        return Configuration.load(SETUP_PATH)
     except FileNotFoundError:
-        print(f"Error: No se pudo encontrar el archivo de configuración 'utils/setup.json'")
+        print(f"Error: No se pudo encontrar el archivo de configuración '{SETUP_PATH}'")
         sys.exit(1)
-    except json.JSONDecodeError:
-        print(f"Error: El archivo de configuración 'utils/setup.json' no es un JSON válido")
+    except (ValueError, KeyError):
+        print(f"Error: El archivo de configuración '{SETUP_PATH}' no es un JSON válido")
         sys.exit(1)
 
-    assembler = Assembler(setup, verbose=args.verbose)
+def literal_cache_report() -> str:
+    from components.valueConverter import ValueConverter
+    stats = ValueConverter.literal_cache_stats()
+    return (f"Caché de literales: {stats['hits']} aciertos, {stats['misses']} fallos "
+            f"({stats['hit_rate']:.1%}), {stats['size']} de {stats['max_size']} entradas")
+
+def main():
+    timer = PhaseTimer(START)
+    timer.add('imports', time.perf_counter() - START)
+    args = parse_arguments()
+    logger.level = LEVELS[args.log_level]
+
+    if args.connect:
+        try:
+            connect(args)
+        except OSError as e:
+            print(f"Error: No se pudo conectar con el servidor en '{args.connect}': {e}")
+            sys.exit(1)
+        return
+
+    with timer.phase('configuración'):
+        config = load_configuration()
+
+    if args.batch:
+        try:
+            batch(args, config, timer)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        return
+
+    with timer.phase('imports'):
+        from components.assembler import Assembler
+    with timer.phase('configuración'):
+        assembler = Assembler(config, verbose=args.verbose, load_data=args.load_data, optimize=args.optimize)
+
+    if args.serve:
+        try:
+            serve(args.serve, assembler)
+        except OSError as e:
+            print(f"Error: No se pudo iniciar el servidor en '{args.serve}': {e}")
+            sys.exit(1)
+        return
 
+    cache = None
+    if args.cache:
+        from components.assemblyCache import AssemblyCache
+        cache = AssemblyCache(assembler, args.cache)
+    if args.watch:
+        watch_input(args, assembler, cache)
+        return
+
+    if args.listing:
+        logger.start_listing()
     try:
-        with open(args.input, 'r') as f:
-            program = f.read()
-        
-        if args.verbose:
-            print(f"Procesando archivo de entrada: {args.input}")
-        
-        binary = assembler.assemble(program)
-        
-        if args.verbose:
-            print(f"Ensamblaje completado. Escribiendo salida en: output.txt")
-        
-        assembler.write(binary, 'output.txt')
-        
-        print(f"Ensamblaje exitoso. Resultado guardado en output.txt")
-
-        if args.program_basys:
-            program_basys(binary, args.port, args.verbose)
+        if args.link:
+            link(args, assembler, timer)
+        elif args.stream:
+            if args.verbose:
+                logger.info("Procesando archivo de entrada en modo streaming: %s", args.input)
+            assembler.base_dir = os.path.dirname(os.path.abspath(args.input))
+            with timer.phase('ensamblaje'):
+                with open(args.input, 'r') as f:
+                    assembler.write_stream(f, args.output)
+            print(f"Ensamblaje exitoso. Resultado guardado en {args.output}")
+        else:
+            build(args, assembler, cache, timer)
+        if args.listing:
+            entries = logger.write_listing(args.listing)
+            print(f"Listado guardado en {args.listing} ({entries} entradas)")
+
+        if args.timing:
+            print(timer.report())
+            print(literal_cache_report())
     
     except FileNotFoundError:
+        logger.flush()
         print(f"Error: No se pudo encontrar el archivo de entrada '{args.input}'")
         sys.exit(1)
     except AssemblerError as e:
+        # Lo registrado antes del error se muestra antes que el error
+        logger.flush()
         print(f"Error de ensamblado: {e}")
         if args.debug:
             raise
         sys.exit(1)
     except Exception as e:
+        logger.flush()
         print(f"Error inesperado: {e}")
         if args.debug:
             raise
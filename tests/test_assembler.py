@@ -328,7 +328,7 @@ class AssemblerTester:
 
             # Ensamblar y decodificar
             try:
-                binary_instructions = self.assembler.assemble(original_code)
+                binary_instructions = self.assembler.to_text(self.assembler.assemble(original_code))
                 decoded = []
                 
                 for binary in binary_instructions:
@@ -0,0 +1,106 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import json
+import pickle
+import tempfile
+import unittest
+from components.assembler import Assembler
+from components.assemblyCache import AssemblyCache
+
+PROGRAM = """DATA:
+x 5
+y 7
+CODE:
+MOV A,(x)
+loop:
+SUB A,1
+CMP A,0
+JNE loop
+MOV B,(y)
+JMP end
+ADD A,B
+end:
+JMP end
+"""
+
+class TestAssemblyCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open('utils/setup.json', 'r') as f:
+            cls.config = json.load(f)
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'cache')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _assemble(self, source):
+        cache = AssemblyCache(Assembler(self.config), self.path)
+        binary = cache.assemble(source)
+        self.assertEqual(list(binary), list(Assembler(self.config).assemble(source)))
+        return cache.stats
+
+    def test_unchanged_source(self):
+        """Un programa sin cambios se recupera sin codificar nada"""
+        self.assertEqual(self._assemble(PROGRAM)['encoded'], 7)
+        stats = self._assemble(PROGRAM)
+        self.assertTrue(stats['source_hit'])
+        self.assertEqual(stats['encoded'], 0)
+
+    def test_only_changed_lines(self):
+        """Solo se codifican las líneas editadas"""
+        self._assemble(PROGRAM)
+        stats = self._assemble(PROGRAM.replace('SUB A,1', 'SUB A,2'))
+        self.assertFalse(stats['source_hit'])
+        self.assertEqual(stats['encoded'], 1)
+
+    def test_label_shift(self):
+        """Si una etiqueta cambia de dirección se recodifican los saltos a ella"""
+        self._assemble(PROGRAM)
+        stats = self._assemble(PROGRAM.replace('ADD A,B\n', 'ADD A,B\nINC A\n'))
+        # INC A y los dos JMP end
+        self.assertEqual(stats['encoded'], 2)
+
+    def test_data_change(self):
+        """Un cambio en DATA recodifica las líneas que usan variables"""
+        self._assemble(PROGRAM)
+        stats = self._assemble(PROGRAM.replace('x 5', 'x 6'))
+        self.assertEqual(stats['encoded'], 4)
+
+    def test_included_file_change(self):
+        """Si cambia un archivo de incbin, DATA se vuelve a cargar aunque el programa sea el mismo"""
+        table = os.path.join(self.directory.name, 'tabla.bin')
+        with open(table, 'wb') as f:
+            f.write(bytes([1, 2, 3]))
+        source = PROGRAM.replace('y 7', f'y 7\ntabla incbin "{table}"')
+        self._assemble(source)
+        self.assertTrue(self._assemble(source)['source_hit'])
+
+        with open(table, 'wb') as f:
+            f.write(bytes([4, 5, 6, 7]))
+        assembler = Assembler(self.config)
+        AssemblyCache(assembler, self.path).assemble(source)
+        self.assertEqual(assembler.memory.image().tolist()[2:], [4, 5, 6, 7])
+        self.assertEqual(self._assemble(source)['source_hit'], True)
+
+    def test_file_format(self):
+        """La caché es JSON; un archivo que no lo es (por ejemplo un pickle) se descarta sin ejecutarlo"""
+        self._assemble(PROGRAM)
+        with open(self.path) as f:
+            stored = json.load(f)
+        self.assertEqual(stored['words'], list(Assembler(self.config).assemble(PROGRAM)))
+        self.assertTrue(self._assemble(PROGRAM)['source_hit'])
+
+        with open(self.path, 'wb') as f:
+            f.write(pickle.dumps(stored))
+        self.assertEqual(self._assemble(PROGRAM)['encoded'], 7)
+        with open(self.path, 'w') as f:
+            f.write('{"version": 4, "setup_key": null')
+        self.assertEqual(self._assemble(PROGRAM)['encoded'], 7)
+
+if __name__ == '__main__':
+    unittest.main()
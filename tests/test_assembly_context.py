@@ -0,0 +1,64 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import glob
+import json
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from components.assembler import Assembler
+from utils.exceptions import InvalidInstructionError, LabelError
+
+class TestAssemblyContext(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open('utils/setup.json', 'r') as f:
+            cls.setup = json.load(f)
+        cls.programs = []
+        for path in sorted(glob.glob('tests/inputs/E2/*.txt')) + ['Problema_3_Grupo_26.txt']:
+            with open(path) as f:
+                cls.programs.append(f.read())
+
+    def _expected(self):
+        """Cada programa ensamblado con un Assembler recién creado"""
+        results = []
+        for program in self.programs:
+            assembler = Assembler(self.setup)
+            results.append((list(assembler.assemble(program)), assembler.memory.image().tolist()))
+        return results
+
+    def test_reuse_without_leaks(self):
+        """Un mismo Assembler ensambla muchos programas seguidos sin arrastrar etiquetas ni variables"""
+        expected = self._expected()
+        assembler = Assembler(self.setup)
+        for _ in range(3):
+            for program, result in zip(self.programs, expected):
+                binary = assembler.assemble(program)
+                self.assertEqual((list(binary), assembler.memory.image().tolist()), result)
+
+        # Las etiquetas y macros del programa anterior no existen en el siguiente
+        assembler.assemble("x MACRO\nNOP\nENDM\nCODE:\nfin:\nx\nJMP fin\n")
+        with self.assertRaisesRegex(LabelError, "Etiqueta no definida: fin"):
+            assembler.assemble("CODE:\nJMP fin\n")
+        with self.assertRaisesRegex(InvalidInstructionError, "Instrucción desconocida: x"):
+            assembler.assemble("CODE:\nx\n")
+
+    def test_threads(self):
+        """Varios hilos comparten un Assembler y obtienen lo mismo que en secuencia"""
+        expected = self._expected()
+        assembler = Assembler(self.setup, optimize=True)
+        sequential = [list(assembler.assemble(program)) for program in self.programs]
+
+        def assemble(index):
+            program = self.programs[index]
+            binary = assembler.assemble(program)
+            return index, list(binary), assembler.memory.image().tolist()
+
+        jobs = list(range(len(self.programs))) * 8
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for index, binary, image in executor.map(assemble, jobs):
+                self.assertEqual(binary, sequential[index])
+                self.assertEqual(image, expected[index][1])
+
+if __name__ == '__main__':
+    unittest.main()
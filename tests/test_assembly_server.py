@@ -0,0 +1,105 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import json
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from components.assembler import Assembler
+from components.assemblyServer import AssemblyServer, AssemblyService, FileWatcher, request
+
+@unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'Requiere sockets Unix')
+class TestAssemblyServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open('utils/setup.json', 'r') as f:
+            cls.config = json.load(f)
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.directory.name, 'assembler.sock')
+        self.server = AssemblyServer(self.socket_path, AssemblyService(Assembler(self.config)))
+        self.thread = threading.Thread(target=self.server.serve_until_shutdown)
+        self.thread.start()
+
+    def tearDown(self):
+        request(self.socket_path, [{'command': 'shutdown'}])
+        self.thread.join()
+        self.directory.cleanup()
+
+    def test_requests(self):
+        """Varios pedidos por una conexión, con el mismo resultado que ensamblar directamente"""
+        inputs = ['tests/inputs/E2/etapa_2_test_1.txt', 'tests/inputs/E2/etapa_2_test_2.txt']
+        outputs = [os.path.join(self.directory.name, f'{i}.txt') for i in range(len(inputs))]
+        responses = request(self.socket_path, [
+            {'input': os.path.abspath(path), 'output': output} for path, output in zip(inputs, outputs)
+        ])
+        for path, output, response in zip(inputs, outputs, responses):
+            with self.subTest(path=path):
+                self.assertTrue(response['ok'], response)
+                with open(path) as f:
+                    assembler = Assembler(self.config)
+                    expected = ''.join(line + '\n' for line in assembler.to_text(assembler.assemble(f.read())))
+                with open(output) as f:
+                    self.assertEqual(f.read(), expected)
+
+    def test_errors(self):
+        """Los errores se informan en la respuesta sin detener el servidor"""
+        missing, bad_format = request(self.socket_path, [
+            {'input': os.path.join(self.directory.name, 'no_existe.txt')},
+            {'input': 'tests/inputs/E2/etapa_2_test_1.txt', 'format': 'xyz'},
+        ])
+        self.assertFalse(missing['ok'])
+        self.assertFalse(bad_format['ok'])
+        self.assertTrue(request(self.socket_path, [{'input': 'tests/inputs/E2/etapa_2_test_1.txt',
+                                                    'output': os.path.join(self.directory.name, 'out.txt')}])[0]['ok'])
+
+    def test_existing_path(self):
+        """No se reemplaza un servidor que sigue respondiendo ni un archivo que no es un socket"""
+        with self.assertRaisesRegex(FileExistsError, "Ya hay un servidor escuchando"):
+            AssemblyServer(self.socket_path, AssemblyService(Assembler(self.config)))
+        self.assertTrue(request(self.socket_path, [{'input': 'tests/inputs/E2/etapa_2_test_1.txt',
+                                                    'output': os.path.join(self.directory.name, 'out.txt')}])[0]['ok'])
+
+        path = os.path.join(self.directory.name, 'programa.txt')
+        with open(path, 'w') as f:
+            f.write('CODE:\n')
+        with self.assertRaisesRegex(FileExistsError, "no es un socket"):
+            AssemblyServer(path, AssemblyService(Assembler(self.config)))
+        self.assertTrue(os.path.exists(path))
+
+        # El socket de un servidor que ya no corre se reemplaza
+        stale = os.path.join(self.directory.name, 'viejo.sock')
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as orphan:
+            orphan.bind(stale)
+        server = AssemblyServer(stale, AssemblyService(Assembler(self.config)))
+        server.server_close()
+        self.assertFalse(os.path.exists(stale))
+
+class TestWatch(unittest.TestCase):
+    def test_included_files(self):
+        """--watch observa también los archivos de INCLUDE e incbin del último ensamblaje"""
+        with open('utils/setup.json', 'r') as f:
+            assembler = Assembler(json.load(f))
+        with tempfile.TemporaryDirectory() as directory:
+            files = {'program.txt': 'INCLUDE "lib.inc"\nDATA:\ntabla incbin "tabla.bin"\nCODE:\nNOP\n',
+                     'lib.inc': 'UNO EQU 1\n', 'tabla.bin': 'ab'}
+            for name, content in files.items():
+                with open(os.path.join(directory, name), 'w') as f:
+                    f.write(content)
+            assembler.assemble(files['program.txt'], directory)
+            dependencies = assembler.context.dependencies()
+            self.assertEqual(dependencies, [os.path.join(directory, 'lib.inc'), os.path.join(directory, 'tabla.bin')])
+
+            watcher = FileWatcher([os.path.join(directory, 'program.txt')], interval=0.01)
+            watcher.update(watcher.signatures.keys() | set(dependencies))
+            time.sleep(0.02)
+            with open(dependencies[1], 'w') as f:
+                f.write('abc')
+            self.assertEqual(watcher.wait(), [dependencies[1]])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import glob
+import json
+import tempfile
+import unittest
+from components.assembler import Assembler
+from components.batchAssembler import assemble_batch, expand_inputs, plan_outputs
+
+class TestBatchAssembler(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open('utils/setup.json', 'r') as f:
+            cls.setup = json.load(f)
+        cls.inputs = sorted(glob.glob('tests/inputs/E2/*.txt'))
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_matches_single_assembly(self):
+        """El lote en paralelo produce las mismas salidas que ensamblar cada archivo"""
+        results = assemble_batch(self.setup, self.inputs, output_dir=self.directory.name, workers=2)
+        self.assertEqual([result.input for result in results], self.inputs)
+        for result in results:
+            with self.subTest(input=result.input):
+                self.assertTrue(result.ok, result.error)
+                assembler = Assembler(self.setup)
+                with open(result.input) as f:
+                    expected = ''.join(line + '\n' for line in assembler.to_text(assembler.assemble(f.read())))
+                with open(result.output) as f:
+                    self.assertEqual(f.read(), expected)
+
+    def test_errors_are_collected(self):
+        """Un archivo con errores no detiene el lote"""
+        broken = os.path.join(self.directory.name, 'broken.txt')
+        with open(broken, 'w') as f:
+            f.write('CODE:\nMOV A,Q\n')
+        missing = os.path.join(self.directory.name, 'missing.txt')
+        results = assemble_batch(self.setup, [broken, self.inputs[0], missing], workers=1)
+        self.assertEqual([result.ok for result in results], [False, True, False])
+        self.assertIn('Q', results[0].error)
+        os.remove(results[1].output)
+
+    def test_inputs_and_outputs(self):
+        """Los patrones se expanden sin repetir y dos entradas no pueden compartir salida"""
+        inputs = expand_inputs(['tests/inputs/E2/*.txt', self.inputs[0]])
+        self.assertEqual(inputs, self.inputs)
+        with self.assertRaises(ValueError):
+            plan_outputs(['a/x.txt', 'b/x.txt'], 'txt', self.directory.name)
+        self.assertEqual(plan_outputs(['a/x.txt'], 'bin'), [('a/x.txt', 'a/x.out.bin')])
+
+    def test_assemble_many(self):
+        """assemble_many entrega un resultado por programa, en orden, con hilos o procesos"""
+        sources = []
+        for path in self.inputs:
+            with open(path) as f:
+                sources.append(f.read())
+        sources.insert(1, 'CODE:\nJMP nada\n')
+        assembler = Assembler(self.setup)
+        expected = []
+        for source in sources:
+            try:
+                expected.append((list(assembler.assemble(source)), assembler.memory.image().tolist()))
+            except Exception:
+                expected.append(None)
+
+        for processes in (False, True):
+            with self.subTest(processes=processes):
+                results = assembler.assemble_many(sources, workers=2, processes=processes)
+                self.assertEqual(len(results), len(sources))
+                self.assertEqual(results[1].error, "Línea 2: Etiqueta no definida: nada")
+                for result, outcome in zip(results, expected):
+                    self.assertEqual(result.ok, outcome is not None)
+                    if result.ok:
+                        self.assertEqual((list(result.binary), result.data.tolist()), outcome)
+
+if __name__ == '__main__':
+    unittest.main()
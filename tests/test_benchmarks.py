@@ -0,0 +1,49 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import copy
+import json
+import unittest
+from benchmarks.pipeline import compare
+from benchmarks.programs import SCENARIOS, generate_program, scenario_program
+from components.assembler import Assembler
+
+class TestBenchmarks(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open('utils/setup.json', 'r') as f:
+            cls.setup = json.load(f)
+
+    def test_generated_programs_assemble(self):
+        """Cada escenario genera un programa válido y siempre el mismo con la misma semilla"""
+        assembler = Assembler(self.setup)
+        for name in SCENARIOS:
+            with self.subTest(scenario=name):
+                program = scenario_program(name, 2000)
+                self.assertEqual(program, scenario_program(name, 2000))
+                self.assertGreaterEqual(len(assembler.assemble(program)), 2000)
+
+        assembler.assemble(generate_program(1000, label_density=0.1, arrays=3, array_size=50))
+        self.assertEqual(len(assembler.label_manager.labels), 100 + 1)
+        self.assertEqual(assembler.memory.get_address('tabla2') + 50, len(assembler.memory.memory))
+
+    def test_compare(self):
+        """Solo cuentan como regresión los tiempos que superan la tolerancia y no son ruido"""
+        scenario = {'assemble': {'seconds': 0.5}, 'write': {'txt': 0.001}, 'decode': None, 'peak_rss': 1000}
+        baseline = {'instructions': 100, 'scenarios': {'simple': scenario}}
+        result = copy.deepcopy(baseline)
+        result['scenarios']['simple']['assemble']['seconds'] = 0.6
+        result['scenarios']['simple']['write']['txt'] = 0.005
+        self.assertEqual(compare(result, baseline, 0.25), [])
+
+        result['scenarios']['simple']['assemble']['seconds'] = 0.7
+        result['scenarios']['simple']['peak_rss'] = 2000
+        regressions = compare(result, baseline, 0.25)
+        self.assertEqual([line.split(':')[0] for line in regressions], ['simple.assemble', 'simple.peak_rss'])
+
+        result['instructions'] = 200
+        self.assertEqual(len(compare(result, baseline, 0.25)), 1)
+
+if __name__ == '__main__':
+    unittest.main()
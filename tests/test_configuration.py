@@ -0,0 +1,79 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import json
+import shutil
+import tempfile
+import unittest
+from components.assembler import Assembler
+from components.configuration import Configuration
+
+class TestConfigurationCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open('utils/setup.json', 'r') as f:
+            cls.setup = json.load(f)
+        with open('tests/inputs/E2/etapa_2_test_2.txt') as f:
+            cls.program = f.read()
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'setup.json')
+        shutil.copy('utils/setup.json', self.path)
+        self.cache = os.path.join(self.directory.name, '__pycache__', 'setup.json.marshal')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_precompiled_matches_json(self):
+        """La configuración precompilada ensambla igual que la leída del JSON"""
+        Configuration.load(self.path)
+        self.assertTrue(os.path.exists(self.cache))
+        config = Configuration.load(self.path)
+        self.assertIsNotNone(config.encoder_table)
+        expected = Assembler(self.setup).assemble(self.program)
+        self.assertEqual(list(Assembler(config).assemble(self.program)), list(expected))
+
+    def test_json_change_invalidates_cache(self):
+        """Si el JSON cambia, la caché se descarta"""
+        Configuration.load(self.path)
+        setup = json.loads(json.dumps(self.setup))
+        setup['instrucciones']['NOP']['opcode'] = '111111'
+        with open(self.path, 'w') as f:
+            json.dump(setup, f)
+        config = Configuration.load(self.path)
+        self.assertEqual(config.instructions['NOP']['opcode'], '111111')
+        self.assertEqual(config.encoder_table[('NOP', ())][0][0] >> 30, 0b111111)
+
+    def test_corrupt_cache(self):
+        """Una caché ilegible se regenera"""
+        os.makedirs(os.path.dirname(self.cache))
+        with open(self.cache, 'wb') as f:
+            f.write(b'basura')
+        self.assertIsNotNone(Configuration.load(self.path).encoder_table)
+
+class TestFrozenConfiguration(unittest.TestCase):
+    def test_immutable_and_picklable(self):
+        """La Configuration no se puede modificar y se copia entre procesos sin cambios"""
+        import pickle
+        with open('utils/setup.json', 'r') as f:
+            setup = json.load(f)
+        config = Configuration(setup)
+        with self.assertRaises(AttributeError):
+            config.word_length = 8
+        with self.assertRaises(TypeError):
+            config.instructions['NOP'] = {}
+        with self.assertRaises(TypeError):
+            config.encoder_table[('NOP', ())] = None
+        # Cambiar el dict original no afecta a la configuración ya creada
+        setup['instrucciones']['NOP']['opcode'] = '111111'
+        self.assertNotEqual(config.instructions['NOP']['opcode'], '111111')
+
+        copy = pickle.loads(pickle.dumps(config))
+        self.assertEqual(copy.digest, config.digest)
+        self.assertEqual(dict(copy.encoder_table), dict(config.encoder_table))
+        self.assertEqual(copy.to_dict(), Configuration(copy.to_dict()).to_dict())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import json
+import tempfile
+import unittest
+from components.assembler import Assembler
+from utils.exceptions import MemoryError
+
+class TestDataDirectives(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open('utils/setup.json', 'r') as f:
+            cls.setup = json.load(f)
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.assembler = Assembler(self.setup)
+        self.assembler.base_dir = self.directory.name
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _image(self, data: str):
+        self.assembler.assemble(f"DATA:\n{data}\nCODE:\nNOP\n")
+        return self.assembler.memory.image().tolist()
+
+    def test_value_lists(self):
+        """Listas separadas por comas, en una o varias líneas"""
+        self.assertEqual(self._image("tabla 1, 2, 0Fh, 'a', ','\n5,\n6, 7\n8\nx 9"),
+                         [1, 2, 15, 97, 44, 5, 6, 7, 8, 9])
+        self.assertEqual(self.assembler.memory.data['tabla'].size, 9)
+        self.assertEqual(self.assembler.memory.get_address('x'), 9)
+
+    def test_dup(self):
+        """N dup(valor) repite un valor o una lista"""
+        self.assertEqual(self._image("buffer 3 dup(0)\n2 dup(1, 2), 9\nx 4h dup('z')"),
+                         [0, 0, 0, 1, 2, 1, 2, 9] + [ord('z')] * 4)
+
+    def test_incbin(self):
+        """incbin carga un archivo binario (un byte por celda) o uno de texto"""
+        with open(os.path.join(self.directory.name, 'font.bin'), 'wb') as f:
+            f.write(bytes([0, 255, 16]))
+        with open(os.path.join(self.directory.name, 'seno.csv'), 'w') as f:
+            f.write("0, 50, 100\n7Fh,10b\n")
+        image = self._image('x 1\nfont incbin "font.bin"\nseno incbin seno.csv\ny 2')
+        self.assertEqual(image, [1, 0, 255, 16, 0, 50, 100, 127, 2, 2])
+        self.assertEqual(self.assembler.memory.get_address('seno'), 4)
+
+    def test_preload_code(self):
+        """La precarga omite los ceros y carga cada valor distinto una sola vez"""
+        assembler = Assembler(self.setup, load_data=True)
+        binary = assembler.assemble("DATA:\ntabla 5, 0, 7, 5, 0\nx 7\nCODE:\nNOP\n")
+        self.assertEqual(assembler.data_processor.data_init_code, [
+            "MOV A, 5", "MOV (0), A", "MOV (3), A",
+            "MOV A, 7", "MOV (2), A", "MOV (5), A",
+            "MOV A, 0",
+        ])
+        self.assertEqual(assembler.data_processor.preload_stats['instructions'], 7)
+        self.assertEqual(len(binary), 8)
+
+    def test_preload_range(self):
+        """La precarga no trunca valores: los negativos usan el ancho del literal y lo que no cabe es un error"""
+        assembler = Assembler(self.setup, load_data=True)
+        max_literal = assembler.encoder.max_literal
+        assembler.assemble("DATA:\nx -1\nCODE:\nNOP\n")
+        self.assertEqual(assembler.data_processor.data_init_code[0], f"MOV A, {max_literal}")
+        with self.assertRaisesRegex(MemoryError, f"'tabla\\[1\\]' tiene el valor {max_literal + 1}"):
+            assembler.assemble(f"DATA:\ntabla 1, {max_literal + 1}\nCODE:\nNOP\n")
+
+    def test_errors(self):
+        with self.assertRaisesRegex(MemoryError, "Línea 2: Valor vacío"):
+            self._image("tabla 1,,2")
+        with self.assertRaisesRegex(MemoryError, "Línea 2: No se pudo leer falta.bin"):
+            self._image('tabla incbin "falta.bin"')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import unittest
+import json
+from components.assembler import Assembler
+
+# Palabras que cambiaron al codificar (Dir) como destino y etiquetas o variables
+# como literal: dirección -> palabra, por programa de tests/inputs
+PINNED_WORDS = {
+    'E1/etapa_1_test_0.txt': {
+        3: '000001011001000000000000000000000001',
+    },
+    'E1/etapa_1_test_1.txt': {
+        3: '000001011001000000000000000000000001', 30: '000001011010000000000000000000000110',
+        37: '000001011010000000000000000000000110', 47: '000001011001000000000000000000000001',
+        65: '000001011001000000000000000000000001', 130: '000001011001000000000000000000000001',
+        153: '000001011001000000000000000000000001', 431: '000001011001000000000000000000000001',
+    },
+    'E2/etapa_2_test_1.txt': {
+        24: '000001011001000000000000000000000110', 31: '000001011001000000000000000000000110',
+        38: '000001011010000000000000000000000110', 45: '000001011010000000000000000000000110',
+        55: '000001011001000000000000000000000001', 89: '000001011001000000000000000000000001',
+        154: '000001011001000000000000000000000001', 177: '000001011001000000000000000000000001',
+        535: '000001011001000000000000000000000001',
+    },
+    'E2/etapa_2_test_2.txt': {
+        11: '000001001100000000000000000000000010', 16: '000001010100000000000000000000000010',
+        23: '000010001100000000000000000000000010', 28: '000010010100000000000000000000000010',
+        34: '000011001100000000000000000000000010', 39: '000011010100000000000000000000000010',
+        46: '000111001100000000000000000000000010', 52: '000111010100000000000000000000000010',
+        59: '001000001100000000000000000000000010', 65: '001000010100000000000000000000000010',
+        71: '001001001100000000000000000000000010', 77: '001001010100000000000000000000000010',
+        84: '001111001100000000000000000000000010', 92: '000001011001000000000000000000000001',
+        96: '000001011001000000000000000000000010', 97: '000001010100000000000000000000000010',
+        114: '000001110100000000000000000000000010', 133: '000001010100000000000000000000000010',
+        146: '000001010100000000000000000000000010', 159: '000001010100000000000000000000000010',
+        173: '000001010100000000000000000000000010', 187: '000001010100000000000000000000000010',
+        229: '000001011001000000000000000000000001',
+    },
+    'E2/etapa_2_test_call.txt': {
+        13: '001111001100000000000000000000001100', 19: '001111001100000000000000000000010010',
+    },
+    'E2/etapa_2_test_indirecto.txt': {
+        11: '000001011001000000000000000000000001', 15: '000001011001000000000000000000000010',
+        16: '000001010100000000000000000000000010', 33: '000001110100000000000000000000000010',
+        52: '000001010100000000000000000000000010', 65: '000001010100000000000000000000000010',
+        78: '000001010100000000000000000000000010', 92: '000001010100000000000000000000000010',
+        106: '000001010100000000000000000000000010',
+    },
+    'E2/etapa_2_test_punteros.txt': {
+        11: '000001001100000000000000000000000010', 16: '000001010100000000000000000000000010',
+        23: '000010001100000000000000000000000010', 28: '000010010100000000000000000000000010',
+        34: '000011001100000000000000000000000010', 39: '000011010100000000000000000000000010',
+        46: '000111001100000000000000000000000010', 52: '000111010100000000000000000000000010',
+        59: '001000001100000000000000000000000010', 65: '001000010100000000000000000000000010',
+        71: '001001001100000000000000000000000010', 77: '001001010100000000000000000000000010',
+        84: '001111001100000000000000000000000010',
+    },
+    'E2/etapa_2_test_ret.txt': {
+        8: '000001001100000000000000000000001101', 13: '000001001100000000000000000000010010',
+        14: '000001011001000000000000000000000001',
+    },
+}
+
+# Salida completa de Problema_3_Grupo_26.txt
+PROBLEMA_3_WORDS = [
+    '000001001011000000000000000000000000', '000001010100000000000000000000000000',
+    '000001011001000000000000000000000010', '000001001011000000000000000000000100',
+    '000111001011000000000000000000000010', '000001011001000000000000000000000010',
+    '001011010000000000000000000000000000', '000010010011000000000000000000000010',
+    '000001001011000000000000000000000010', '001100001000000000000000000000000000',
+    '000001001011000000000000000000000011', '001110001000000000000000000000000000',
+    '000001011001000000000000000000000011', '001111001100000000000000000000000000',
+    '010010000000000000000000000000000010', '000001001011000000000000000000000000',
+    '001111001010000000000000000000000000', '010001000000000000000000000000010101',
+    '000001001100000000000000000000000000', '000001011001000000000000000000000001',
+    '010000000000000000000000000000010111', '000001001100000000000000000000000001',
+    '000001011001000000000000000000000001', '000001001011000000000000000000000001',
+    '000001010011000000000000000000000001',
+]
+
+class TestEncodingRegression(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open('utils/setup.json', 'r') as f:
+            cls.setup = json.load(f)
+
+    def _assemble(self, path):
+        assembler = Assembler(self.setup)
+        with open(path) as f:
+            return assembler.to_text(assembler.assemble(f.read()))
+
+    def test_problema_3(self):
+        self.assertEqual(self._assemble('Problema_3_Grupo_26.txt'), PROBLEMA_3_WORDS)
+
+    def test_pinned_words(self):
+        for name, words in PINNED_WORDS.items():
+            binary = self._assemble(os.path.join('tests', 'inputs', name))
+            for address, word in words.items():
+                with self.subTest(program=name, address=address):
+                    self.assertEqual(binary[address], word)
+
+if __name__ == '__main__':
+    unittest.main()
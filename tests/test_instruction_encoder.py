@@ -0,0 +1,69 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import unittest
+import json
+from components.configuration import Configuration
+from components.instructionProcessor import InstructionProcessor
+from components.memory import Memory
+
+SAMPLE_OPERANDS = {
+    'A': ['A'],
+    'B': ['B'],
+    '(A)': ['(A)'],
+    '(B)': ['(B)'],
+    '(dir)': ['(5)', '(0Fh)', '(var1)', '(arr)'],
+    'lit': ['0', '42', '1010b', 'FFh', "'a'"],
+    'var': ['loop', 'fin'],
+}
+
+class TestInstructionEncoder(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open('utils/setup.json', 'r') as f:
+            cls.config = Configuration(json.load(f))
+        cls.processor = InstructionProcessor(cls.config)
+        cls.memory = Memory()
+        cls.memory.store_value('var1', ['7'])
+        cls.memory.store_value('arr', ['1', '2', '3'])
+        cls.labels = {'loop': 3, 'fin': 12}
+
+    def _legacy(self, instruction_name, operands):
+        return self.processor._get_opcode_legacy(
+            instruction_name, operands, self.labels, self.memory.data, self.memory, 0
+        )
+
+    def test_table_matches_legacy_path(self):
+        """Cada entrada de la tabla codifica igual que la ruta basada en strings"""
+        for (instruction_name, shapes) in self.processor.encoder.table:
+            operand_lists = [[]]
+            for shape in shapes:
+                operand_lists = [ops + [op] for ops in operand_lists for op in SAMPLE_OPERANDS[shape]]
+            for operands in operand_lists:
+                with self.subTest(instruction=instruction_name, operands=operands):
+                    instruction = f"{instruction_name} {', '.join(operands)}".strip()
+                    result = self.processor.get_opcode(instruction, self.labels, self.memory.data, self.memory, 0)
+                    self.assertEqual(result, self._legacy(instruction_name, operands))
+
+    def test_irregular_forms_use_legacy_path(self):
+        """Los formatos fuera de setup.json se siguen codificando como antes"""
+        for instruction in ['NOP A', 'POP1 A, B', 'NOT A, B, A', 'CMP B, A']:
+            with self.subTest(instruction=instruction):
+                name, operands = self.processor._parse_instruction(instruction)
+                self.assertIsNone(self.processor.encoder.encode(name, operands, self.labels, self.memory.data, self.memory))
+                result = self.processor.get_opcode(instruction, self.labels, self.memory.data, self.memory, 0)
+                self.assertEqual(result, self._legacy(name, operands))
+
+    def test_literal_operands(self):
+        """Etiquetas y variables sin paréntesis valen su dirección; (Dir) como destino va en el literal"""
+        lit = int(self.config.types['lit'], 2)
+        for instruction, literal in [('MOV A, fin', 12), ('CMP A, loop', 3), ('MOV B, arr', 1), ('MOV (5), A', 5), ('MOV (var1), B', 0)]:
+            with self.subTest(instruction=instruction):
+                word, = self.processor.encode(instruction, self.labels, self.memory.data, self.memory, 0)
+                self.assertEqual(word & self.processor.encoder.max_literal, literal)
+                if '(' not in instruction:
+                    self.assertEqual((word >> self.processor.encoder.param2_shift) & 0b111, lit)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import io
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from components.assembler import Assembler
+from utils import interpreter
+from utils.interpreter import EnhancedInterpreter
+
+@unittest.skipIf(interpreter.np is None, "NumPy no está instalado")
+class TestBatchInterpreter(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open('utils/setup.json', 'r') as f:
+            assembler = Assembler(json.load(f))
+        with open('tests/inputs/E2/etapa_2_test_2.txt') as f:
+            binary = assembler.assemble(f.read())
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.output = os.path.join(cls.directory.name, 'output.txt')
+        assembler.write(binary, cls.output)
+        cls.binary = binary
+        cls.interpreter = EnhancedInterpreter('utils/setup.json')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def test_load_words(self):
+        """El archivo de salida se carga como las mismas palabras enteras"""
+        words, line_numbers, invalid = self.interpreter.load_words(self.output)
+        self.assertEqual(words.tolist(), list(self.binary))
+        self.assertEqual(line_numbers.tolist(), list(range(1, len(self.binary) + 1)))
+        self.assertEqual(invalid, [])
+
+    def test_batch_matches_line_decoder(self):
+        """La decodificación por lotes coincide con la de línea a línea"""
+        words, _, _ = self.interpreter.load_words(self.output)
+        decoded = self.interpreter.decode_batch(words)
+        for index, word in enumerate(self.binary):
+            binary = format(word, '036b')
+            info = self.interpreter.decode_instruction(binary[:6], binary[6:12], binary[12:])
+            with self.subTest(line=index + 1):
+                self.assertEqual(self.interpreter.instruction_names[decoded['name'][index]], info['name'])
+                self.assertEqual(self.interpreter.type_names[decoded['type1'][index]], info['param1'])
+                self.assertEqual(self.interpreter.type_names[decoded['type2'][index]], info['param2'])
+                self.assertEqual(int(decoded['literal'][index]), info['literal'])
+
+    def test_output_matches_line_interpreter(self):
+        """interpret produce el mismo texto con y sin NumPy, incluyendo líneas inválidas"""
+        with open(self.output, 'a') as f:
+            f.write('0101\n')
+        batch, lines = io.StringIO(), io.StringIO()
+        with redirect_stdout(batch):
+            self.interpreter.interpret(self.output)
+        with redirect_stdout(lines):
+            self.interpreter.interpret_lines(self.output)
+        self.assertEqual(batch.getvalue(), lines.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import glob
+import json
+import unittest
+from components.configuration import Configuration
+from components.fileProcessor import FileProcessor
+from components.instructionProcessor import InstructionProcessor
+from components.lexer import (parse_line, tokenize, TOKEN_CHAR, TOKEN_COMMA, TOKEN_LABEL,
+                              TOKEN_LITERAL, TOKEN_MEMORY, TOKEN_MNEMONIC, TOKEN_REGISTER)
+
+class TestLexer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open('utils/setup.json', 'r') as f:
+            cls.setup = json.load(f)
+        cls.file_processor = FileProcessor()
+        cls.instruction_processor = InstructionProcessor(Configuration(cls.setup))
+
+    def test_token_kinds(self):
+        """Cada token trae su tipo, valor, base y columna"""
+        tokens = tokenize("  MOV ( 1Fh ), 'a' // comentario")
+        self.assertEqual([token.kind for token in tokens], [TOKEN_MNEMONIC, TOKEN_MEMORY, TOKEN_COMMA, TOKEN_CHAR])
+        self.assertEqual([token.column for token in tokens], [2, 6, 13, 15])
+        inner = tokens[1].value
+        self.assertEqual((inner.kind, inner.text, inner.value, inner.base), (TOKEN_LITERAL, '1Fh', 31, 16))
+        self.assertEqual(tokens[3].value, ord('a'))
+
+        tokens = tokenize("JMP loop")
+        self.assertEqual(tokens[1].kind, TOKEN_LABEL)
+        tokens = tokenize("ADD A,101b")
+        self.assertEqual(tokens[1].kind, TOKEN_REGISTER)
+        self.assertEqual((tokens[3].value, tokens[3].base), (5, 2))
+
+    def test_matches_string_cleaning(self):
+        """El lexer produce la misma línea limpia y los mismos operandos que la ruta de strings"""
+        encoder = self.instruction_processor.encoder
+        lines = ["MOV A , ( 3 )", "INC(B)", "MOV ,A", "MOV A,", "MOV A,,B", "CMP A,' '", "MOV (var),A"]
+        for path in glob.glob('tests/inputs/**/*.txt', recursive=True):
+            with open(path) as f:
+                lines.extend(f.read().split('\n'))
+
+        for line in lines:
+            parsed = parse_line(line)
+            if parsed is None:
+                continue
+            with self.subTest(line=line):
+                cleaned = self.file_processor._clean_instruction(self.file_processor._remove_inline_comments(line))
+                name, operands = self.instruction_processor._parse_instruction(cleaned)
+                self.assertEqual(parsed.text, cleaned)
+                self.assertEqual((parsed.name, list(parsed.operands)), (name, operands))
+                self.assertEqual(parsed.infos, tuple(encoder._operand_info(operand) for operand in operands))
+
+    def test_fallback_to_string_cleaning(self):
+        """Las líneas que el lexer no sabe tokenizar se limpian como antes"""
+        for line in ["MOV A,(B", "MOV A B", "MOV A,x(3)", "MOV A,(x y)", "MOV A,\"a//b\""]:
+            with self.subTest(line=line):
+                self.assertIsNone(parse_line(line))
+                cleaned, parsed = self.file_processor._clean_code_line(line)
+                self.assertIsNone(parsed)
+                self.assertEqual(cleaned, self.file_processor._clean_instruction(self.file_processor._remove_inline_comments(line)))
+
+if __name__ == '__main__':
+    unittest.main()
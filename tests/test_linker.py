@@ -0,0 +1,138 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import json
+import pickle
+import tempfile
+import unittest
+from components.assembler import Assembler
+from components.linker import Linker
+from components.objectFile import read_object, RELOC_CODE, RELOC_DATA, RELOC_EXTERNAL
+from utils.exceptions import LabelError, LinkError
+
+MAIN = """DATA:
+resultado 0
+CODE:
+MOV A,(entrada)
+CALL doble
+MOV (resultado),A
+fin:
+JMP fin
+"""
+
+LIBRARY = """GLOBAL doble, entrada
+DATA:
+entrada 21
+tabla 1,2,3
+CODE:
+doble:
+ADD A,(tabla)
+MOV B,tabla
+INC B
+ADD A,(B)
+RET
+"""
+
+class TestLinker(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open('utils/setup.json', 'r') as f:
+            cls.setup = json.load(f)
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.paths = []
+        for name, source in [('main.txt', MAIN), ('lib.txt', LIBRARY)]:
+            self.paths.append(os.path.join(self.directory.name, name))
+            self._write(name, source)
+        self.assembler = Assembler(self.setup)
+        self.linker = Linker(self.assembler)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _write(self, name: str, source: str) -> None:
+        with open(os.path.join(self.directory.name, name), 'w') as f:
+            f.write(source)
+
+    def test_matches_single_file(self):
+        """Enlazar los módulos da lo mismo que ensamblar el programa en un solo archivo"""
+        binary = self.linker.build(self.paths)
+        image = self.assembler.memory.image().tolist()
+
+        main_data, main_code = MAIN.split('CODE:')
+        library_data, library_code = LIBRARY.split('CODE:')
+        single = Assembler(self.setup)
+        expected = single.assemble(main_data + library_data.replace('DATA:', '') + 'CODE:' + main_code + library_code)
+        self.assertEqual(list(binary), list(expected))
+        self.assertEqual(image, single.memory.image().tolist())
+        self.assertEqual(self.assembler.memory.get_address('entrada'), 1)
+        self.assertEqual(self.assembler.memory.get_address('lib:tabla'), 2)
+
+        obj = read_object(os.path.join(self.directory.name, 'main.o'))
+        self.assertEqual(obj.externals, ('doble', 'entrada'))
+        self.assertEqual({relocation.kind for relocation in obj.relocations}, {RELOC_CODE, RELOC_DATA, RELOC_EXTERNAL})
+        self.assertEqual(read_object(os.path.join(self.directory.name, 'lib.o')).exports, ('doble', 'entrada'))
+
+    def test_local_symbols(self):
+        """Las etiquetas y variables sin GLOBAL son locales: dos módulos pueden usar el mismo nombre"""
+        self._write('otro.txt', "GLOBAL otra\nDATA:\ntabla 9\nCODE:\notra:\nMOV A,(tabla)\nfin:\nJMP fin\n")
+        binary = self.linker.build(self.paths + [os.path.join(self.directory.name, 'otro.txt')])
+        self.assertEqual(len(binary), 12)
+        # JMP fin de cada módulo salta a su propia etiqueta, y (tabla) es la variable de otro.txt
+        max_literal = self.assembler.encoder.max_literal
+        self.assertEqual(binary[3] & max_literal, 3)
+        self.assertEqual(binary[11] & max_literal, 11)
+        self.assertEqual(binary[10] & max_literal, 5)
+        self.assertEqual(self.assembler.memory.get_address('otro:tabla'), 5)
+
+    def test_object_format(self):
+        """Los .o son JSON versionado; un archivo que no lo es no se carga"""
+        self.linker.build(self.paths)
+        path = os.path.join(self.directory.name, 'lib.o')
+        with open(path) as f:
+            content = json.load(f)
+        self.assertEqual((content['format'], content['version']), ('iic2343-objeto', 2))
+        self.assertEqual(content['exports'], ['doble', 'entrada'])
+
+        with open(path, 'wb') as f:
+            f.write(pickle.dumps(content))
+        with self.assertRaisesRegex(LinkError, "no es un archivo objeto válido"):
+            read_object(path)
+        with open(path, 'w') as f:
+            json.dump(dict(content, version=1), f)
+        with self.assertRaisesRegex(LinkError, "otra versión"):
+            read_object(path)
+
+    def test_incremental_build(self):
+        """Solo se vuelve a ensamblar el módulo que cambió; un .o se enlaza tal cual"""
+        first = list(self.linker.build(self.paths))
+        self.assertEqual(self.linker.stats, {'assembled': 2, 'reused': 0, 'prebuilt': 0})
+        self.assertEqual(list(self.linker.build(self.paths)), first)
+        self.assertEqual(self.linker.stats, {'assembled': 0, 'reused': 2, 'prebuilt': 0})
+
+        self._write('lib.txt', LIBRARY.replace('RET', 'NOP\nRET'))
+        binary = self.linker.build(self.paths)
+        self.assertEqual(len(binary), len(first) + 1)
+        self.assertEqual(self.linker.stats, {'assembled': 1, 'reused': 1, 'prebuilt': 0})
+
+        objects = [self.paths[0], os.path.join(self.directory.name, 'lib.o')]
+        self.assertEqual(list(self.linker.build(objects)), list(binary))
+        self.assertEqual(self.linker.stats, {'assembled': 0, 'reused': 1, 'prebuilt': 1})
+
+    def test_errors(self):
+        with self.assertRaisesRegex(LinkError, "Símbolo no definido: entrada"):
+            self.linker.build(self.paths[:1])
+        self._write('otro.txt', "GLOBAL entrada\nDATA:\nentrada 1\nCODE:\nNOP\n")
+        with self.assertRaisesRegex(LinkError, "Símbolo 'entrada' exportado por"):
+            self.linker.build(self.paths + [os.path.join(self.directory.name, 'otro.txt')])
+        self._write('lib.txt', LIBRARY.replace('GLOBAL doble, entrada', 'GLOBAL doble'))
+        with self.assertRaisesRegex(LinkError, "lib.txt lo define pero no lo exporta con GLOBAL"):
+            self.linker.build(self.paths)
+        self._write('lib.txt', LIBRARY.replace('GLOBAL doble', 'GLOBAL triple'))
+        with self.assertRaisesRegex(LabelError, "GLOBAL de un símbolo no definido en el módulo: triple"):
+            self.linker.build(self.paths)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import io
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from components.assembler import Assembler
+from utils.logger import BUFFER_SIZE, DEBUG, INFO, Deferred, Logger, logger
+
+class TestLogger(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open('utils/setup.json', 'r') as f:
+            cls.setup = json.load(f)
+        with open('Problema_3_Grupo_26.txt') as f:
+            cls.program = f.read()
+
+    def test_levels_and_lazy_format(self):
+        """Bajo el nivel no se formatea nada; sobre él, el mensaje llega completo y en orden"""
+        stream = io.StringIO()
+        log = Logger(level=INFO, stream=stream)
+        calls = []
+        expensive = Deferred(lambda: calls.append(1) or 'caro')
+        log.debug("detalle %s", expensive)
+        log.info("uno %d", 1)
+        log.warning("%s y %s", 'dos', expensive)
+        log.flush()
+        self.assertEqual(stream.getvalue(), "uno 1\ndos y caro\n")
+        self.assertEqual(len(calls), 1)
+
+    def test_format_errors(self):
+        """Un mensaje que no se puede formatear se informa en stderr sin perder los demás"""
+        stream = io.StringIO()
+        errors = io.StringIO()
+        log = Logger(stream=stream)
+        with redirect_stderr(errors):
+            log.info("antes")
+            log.info("valor %d", 'texto')
+            log.info("después %s", Deferred(lambda: 1 / 0))
+            log.info("fin")
+            log.flush()
+        self.assertEqual(stream.getvalue(), "antes\nfin\n")
+        self.assertIn("'valor %d'", errors.getvalue())
+        self.assertIn("'después %s'", errors.getvalue())
+        self.assertIn("ZeroDivisionError", errors.getvalue())
+
+    def test_buffer_size(self):
+        """El buffer se entrega según el texto formateado, no según el formato"""
+        stream = io.StringIO()
+        log = Logger(stream=stream)
+        log.info("%s", 'x' * BUFFER_SIZE)
+        self.assertEqual(log._parts, [])
+        log.flush()
+        self.assertEqual(len(stream.getvalue()), BUFFER_SIZE + 1)
+
+    def test_flush_before_print(self):
+        """Lo registrado por un ensamblaje con verbose sale antes que lo impreso después"""
+        output = io.StringIO()
+        with redirect_stdout(output):
+            Assembler(self.setup, verbose=True).assemble(self.program)
+            print("después")
+        lines = output.getvalue().splitlines()
+        self.assertEqual(lines[0], "Iniciando proceso de ensamblaje...")
+        self.assertEqual(lines[-2:], ["Ensamblaje completado.", "después"])
+
+    def test_listing_file(self):
+        """El listado guardado con write_listing es el mismo que muestra verbose"""
+        output = io.StringIO()
+        with redirect_stdout(output):
+            Assembler(self.setup, verbose=True).assemble(self.program)
+
+        assembler = Assembler(self.setup)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'listado.txt')
+            logger.start_listing()
+            try:
+                binary = assembler.assemble(self.program)
+            finally:
+                entries = logger.write_listing(path)
+            with open(path) as f:
+                listing = f.read()
+        self.assertFalse(logger.collecting)
+        # Un salto hacia una etiqueta posterior aparece de nuevo al resolverse
+        self.assertGreaterEqual(entries, len(binary))
+        self.assertTrue(listing.startswith("\nInstrucción 0:\n"))
+        self.assertIn(listing, output.getvalue())
+
+    def test_listing_respects_level(self):
+        """Con un nivel sobre DEBUG, verbose no formatea el listado"""
+        output = io.StringIO()
+        level = logger.level
+        logger.level = INFO
+        try:
+            with redirect_stdout(output):
+                Assembler(self.setup, verbose=True).assemble(self.program)
+        finally:
+            logger.level = level
+        self.assertIn("Ensamblaje completado.", output.getvalue())
+        self.assertNotIn("Instrucción 0", output.getvalue())
+        self.assertEqual(logger.level, DEBUG)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import json
+import unittest
+from components.assembler import Assembler
+from components.memory import Memory, Symbol, SYMBOL_ARRAY, SYMBOL_SCALAR, SYMBOL_STRING
+from utils.exceptions import MemoryError
+
+class TestMemory(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open('utils/setup.json', 'r') as f:
+            cls.setup = json.load(f)
+
+    def test_symbols_and_image(self):
+        """Cada variable queda como un símbolo y sus valores contiguos en la imagen"""
+        memory = Memory()
+        memory.store_value('x', '5')
+        memory.store_value('c', "'a'")
+        memory.store_value('s', '"hi"')
+        memory.store_value('arr', ['1', '10b', '0Fh'])
+        self.assertEqual(memory.data['x'], Symbol(0, 1, SYMBOL_SCALAR))
+        self.assertEqual(memory.data['s'], Symbol(2, 3, SYMBOL_STRING))
+        self.assertEqual(memory.data['arr'], Symbol(5, 3, SYMBOL_ARRAY))
+        self.assertEqual(memory.get_address('arr'), 5)
+        self.assertEqual(memory.get_value('arr', 2), 15)
+        self.assertEqual(memory.next_data_address, 8)
+
+        image = memory.image()
+        self.assertEqual(image.tolist(), [5, 97, ord('h'), ord('i'), 0, 1, 2, 15])
+        # La imagen es una vista, no una copia
+        memory.memory[0] = 6
+        self.assertEqual(image[0], 6)
+
+    def test_get_value_errors(self):
+        memory = Memory()
+        memory.store_value('x', '5')
+        memory.store_value('arr', ['1', '2'])
+        with self.assertRaises(MemoryError):
+            memory.get_value('arr')
+        with self.assertRaises(MemoryError):
+            memory.get_value('arr', 2)
+        with self.assertRaises(MemoryError):
+            memory.get_value('x', 0)
+        with self.assertRaises(MemoryError):
+            memory.get_address('y')
+
+    def test_large_table(self):
+        """Una tabla grande ocupa 4 bytes por elemento en la imagen"""
+        values = [str(i % 256) for i in range(100000)]
+        program = "DATA:\ntabla " + "\n".join(values) + "\nCODE:\nMOV A,(tabla)\n"
+        assembler = Assembler(self.setup)
+        assembler.assemble(program)
+        image = assembler.memory.image()
+        self.assertEqual(len(image), 100000)
+        self.assertEqual(image.nbytes, 4 * 100000)
+        self.assertEqual(image[99999], 99999 % 256)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import json
+import tempfile
+import unittest
+from components.assembler import Assembler
+from components.outputWriter import OUTPUT_WRITERS, get_writer
+
+class TestOutputWriter(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open('utils/setup.json', 'r') as f:
+            cls.assembler = Assembler(json.load(f))
+        with open('tests/inputs/E2/etapa_2_test_2.txt') as f:
+            cls.binary = cls.assembler.assemble(f.read())
+        cls.words = list(cls.binary)
+
+    def _render(self, output_format, binary=None):
+        return get_writer(output_format, 36).render(self.binary if binary is None else binary)
+
+    def test_text_matches_to_text(self):
+        """El formato txt es el mismo que to_text"""
+        expected = ''.join(line + '\n' for line in self.assembler.to_text(self.binary))
+        self.assertEqual(self._render('txt').decode(), expected)
+
+    def test_bin(self):
+        """Cada palabra ocupa 5 bytes big-endian"""
+        data = self._render('bin')
+        self.assertEqual(len(data), 5 * len(self.words))
+        decoded = [int.from_bytes(data[i:i + 5], 'big') for i in range(0, len(data), 5)]
+        self.assertEqual(decoded, self.words)
+
+    def test_coe_and_mem(self):
+        """.coe y .mem contienen una palabra hexadecimal de 9 dígitos por entrada"""
+        coe = self._render('coe').decode().splitlines()
+        self.assertEqual(coe[:2], ['memory_initialization_radix=16;', 'memory_initialization_vector='])
+        self.assertEqual([int(value.rstrip(',;'), 16) for value in coe[2:]], self.words)
+
+        mem = self._render('mem').decode().split()
+        self.assertEqual(mem[0], '@00000000')
+        self.assertTrue(all(len(value) == 9 for value in mem[1:]))
+        self.assertEqual([int(value, 16) for value in mem[1:]], self.words)
+
+    def test_intel_hex(self):
+        """Los registros tienen checksum válido y reconstruyen la imagen .bin, incluso sobre 64 KiB"""
+        words = [(i * 2654435761) & (2 ** 36 - 1) for i in range(14000)]
+        image = bytearray()
+        segment = 0
+        lines = self._render('hex', words).decode().splitlines()
+        for line in lines:
+            record = bytes.fromhex(line[1:])
+            self.assertEqual(sum(record) & 0xFF, 0)
+            length, address, record_type = record[0], int.from_bytes(record[1:3], 'big'), record[3]
+            if record_type == 0x04:
+                segment = int.from_bytes(record[4:6], 'big')
+            elif record_type == 0x00:
+                self.assertEqual((segment << 16) + address, len(image))
+                image += record[4:4 + length]
+        self.assertEqual(lines[-1], ':00000001FF')
+        self.assertEqual(bytes(image), self._render('bin', words))
+
+    def test_write(self):
+        """Assembler.write acepta todos los formatos"""
+        with tempfile.TemporaryDirectory() as directory:
+            for output_format, writer in OUTPUT_WRITERS.items():
+                with self.subTest(output_format=output_format):
+                    path = os.path.join(directory, 'output' + writer.extension)
+                    self.assembler.write(self.binary, path, output_format)
+                    with open(path, 'rb') as f:
+                        self.assertEqual(f.read(), self._render(output_format))
+        with self.assertRaises(ValueError):
+            get_writer('xyz', 36)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import glob
+import json
+import unittest
+from components.assembler import Assembler
+from components.simulator import Simulator
+
+# Registros con que terminan los tests del curso al pasar por 'bien'
+BIEN = (170, 17)
+
+class TestPeepholeOptimizer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open('utils/setup.json', 'r') as f:
+            cls.setup = json.load(f)
+
+    def _optimize(self, code: str):
+        assembler = Assembler(self.setup, optimize=True)
+        lines = [(line.strip(), number) for number, line in enumerate(code.strip().split('\n'), 1)]
+        return [line for line, _ in assembler.optimizer.optimize(lines)], assembler.optimizer.stats
+
+    def test_rules(self):
+        """Cada regla quita lo que no cambia el resultado del programa"""
+        lines, stats = self._optimize("""
+            MOV (temp), A
+            MOV A, (temp)
+            MOV B, (B)
+            MOV (B), B
+            JMP uno
+            MOV A, 1
+            uno:
+            JEQ dos
+            dos:
+            JNE tres
+            MOV A, 2
+            tres:
+            JMP fin
+            fin:
+            JMP fin
+        """)
+        self.assertEqual(lines, [
+            "MOV (temp), A", "MOV B, (B)", "MOV (B), B", "uno:", "dos:",
+            "JNE fin", "MOV A, 2", "tres:", "fin:", "JMP fin",
+        ])
+        self.assertEqual((stats['redundant_mov'], stats['dead_code'], stats['jump_to_next'], stats['jump_chain']), (1, 1, 3, 1))
+        self.assertEqual((stats['before'], stats['after']), (11, 6))
+
+    def test_course_programs(self):
+        """Los tests de la Etapa 2 optimizados terminan igual, sin crecer en palabras ni ciclos"""
+        for path in sorted(glob.glob('tests/inputs/E2/*.txt')):
+            with self.subTest(program=path):
+                with open(path) as f:
+                    program = f.read()
+                results = []
+                for optimize in (False, True):
+                    assembler = Assembler(self.setup, optimize=optimize)
+                    binary = assembler.assemble(program)
+                    simulator = Simulator(assembler.config)
+                    simulator.load(binary, assembler.memory.image())
+                    cycles = simulator.run(100000)
+                    self.assertTrue(simulator.halted)
+                    self.assertEqual((simulator.a, simulator.b), BIEN)
+                    results.append((len(binary), cycles))
+                self.assertLessEqual(results[1][0], results[0][0])
+                self.assertLessEqual(results[1][1], results[0][1])
+
+    def test_code_addresses_as_values(self):
+        """No se optimiza si el programa depende de direcciones de código fijas"""
+        for code in ["JMP 3\nJMP 0", "MOV A, fin\nJMP fin\nNOP\nfin:\nNOP", "CALL f\nf:\nPOP A\nJMP f"]:
+            with self.subTest(code=code):
+                lines, stats = self._optimize(code)
+                self.assertEqual(lines, code.split('\n'))
+                self.assertIsNotNone(stats['skipped'])
+
+if __name__ == '__main__':
+    unittest.main()
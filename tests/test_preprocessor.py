@@ -0,0 +1,126 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import json
+import tempfile
+import unittest
+from components.assembler import Assembler
+from components.assemblyCache import AssemblyCache
+from utils.exceptions import InvalidInstructionError, LabelError, MemoryError, SyntaxError
+
+# Cuerpo de Problema_3_Grupo_26.txt que invierte un bit, como macro
+LIBRARY = """// Biblioteca de macros
+UNO EQU 1
+reverse_bit MACRO origen, destino
+    MOV (origen),A
+    MOV A,(one)
+    AND A,(origen)
+    MOV (origen),A
+    SHL destino
+    ADD destino,(origen)
+    MOV A,(origen)
+    SHR A
+ENDM
+"""
+
+class TestPreprocessor(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open('utils/setup.json', 'r') as f:
+            cls.setup = json.load(f)
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.library = os.path.join(self.directory.name, 'bits.inc')
+        with open(self.library, 'w') as f:
+            f.write(LIBRARY)
+        self.assembler = Assembler(self.setup)
+        self.assembler.base_dir = self.directory.name
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_matches_hand_written(self):
+        """Constantes, macros, REPT e INCLUDE generan lo mismo que el programa escrito a mano"""
+        with open('Problema_3_Grupo_26.txt') as f:
+            hand_written = f.read()
+        body = hand_written[hand_written.index('    MOV (temp),A'):hand_written.index('    \n    MOV A,(count)')]
+        expected = Assembler(self.setup).assemble(
+            "DATA:\ntemp 0\none 1\nCODE:\nMOV A,0\n" + body * 2 +
+            "l1:\nDEC A\nJNE l1\nl2:\nDEC A\nJNE l2\n")
+
+        binary = self.assembler.assemble("""
+INCLUDE "bits.inc"
+DATA:
+temp 0
+one UNO
+CODE:
+MOV A,0
+REPT 2
+    reverse_bit temp, B
+ENDM
+espera MACRO
+    LOCAL loop
+loop:
+    DEC A
+    JNE loop
+ENDM
+espera
+espera
+""")
+        self.assertEqual(list(binary), list(expected))
+        self.assertEqual(self.assembler.file_processor.preprocessor.included, [self.library])
+
+    def test_error_locations(self):
+        """Los errores apuntan al archivo y la línea de origen"""
+        with open(os.path.join(self.directory.name, 'datos.inc'), 'w') as f:
+            f.write("// tabla\nb\n")
+        with open(os.path.join(self.directory.name, 'salto.inc'), 'w') as f:
+            f.write("NOP\nJMP nowhere\n")
+        cases = [
+            ('CODE:\nINCLUDE "salto.inc"', LabelError, "^Línea 2 de salto.inc: Etiqueta no definida: nowhere$"),
+            ('mala MACRO\n    NOP\n    FOO A\nENDM\nCODE:\nmala', InvalidInstructionError,
+             r"^Línea 3 \(macro mala\): Instrucción desconocida: FOO$"),
+            ('CODE:\nfin:\nINCLUDE "salto.inc"\nfin:', LabelError, "^Línea 4: Etiqueta 'fin' ya definida$"),
+            ('DATA:\nINCLUDE "datos.inc"\nCODE:\nNOP', MemoryError, "Línea 2 de datos.inc: Formato inválido"),
+            ('INCLUDE "bits.inc"\nCODE:\nreverse_bit temp', SyntaxError, "Línea 3: La macro reverse_bit espera 2 argumentos"),
+            ('CODE:\nREPT 2\nNOP', SyntaxError, "Línea 2: REPT sin ENDM"),
+            ('N EQU -1\nCODE:\nREPT N\nNOP\nENDM', SyntaxError, "Línea 3: La cantidad de repeticiones no puede ser negativa: -1"),
+            ('CODE:\nREPT 65537\nNOP\nENDM', SyntaxError, "Línea 2: La cantidad de repeticiones supera el máximo de 65536"),
+            ('CODE:\nINCLUDE "nada.inc"', SyntaxError, "Línea 2: No se pudo leer nada.inc"),
+            ('N EQU 1\nN EQU 2\nCODE:\nNOP', SyntaxError, "Línea 2: Constante 'N' ya definida"),
+        ]
+        for source, error, message in cases:
+            with self.subTest(source=source):
+                with self.assertRaisesRegex(error, message):
+                    self.assembler.assemble(source)
+                # En streaming los errores apuntan al mismo lugar
+                with self.assertRaisesRegex(error, message):
+                    list(self.assembler.assemble_iter(source.split('\n'), self.directory.name))
+
+    def test_include_memo(self):
+        """Un INCLUDE sin cambios no se vuelve a expandir, y uno modificado sí"""
+        source = 'INCLUDE "bits.inc"\nDATA:\nt 0\none 1\nCODE:\nreverse_bit t, B\n'
+        stats = lambda: self.assembler.file_processor.preprocessor.stats
+        first = list(self.assembler.assemble(source))
+        self.assertEqual(stats()['memo_hits'], 0)
+        self.assertEqual(list(self.assembler.assemble(source)), first)
+        self.assertEqual(stats()['memo_hits'], 1)
+
+        with open(self.library, 'w') as f:
+            f.write(LIBRARY.replace('SHR A', 'SHR A\n    NOP'))
+        self.assertEqual(len(self.assembler.assemble(source)), len(first) + 1)
+        self.assertEqual(stats()['memo_hits'], 0)
+
+        # La caché de ensamblaje tampoco reutiliza el resultado anterior
+        path = os.path.join(self.directory.name, 'cache.bin')
+        AssemblyCache(self.assembler, path).assemble(source)
+        with open(self.library, 'w') as f:
+            f.write(LIBRARY)
+        cache = AssemblyCache(self.assembler, path)
+        self.assertEqual(list(cache.assemble(source)), first)
+        self.assertFalse(cache.stats['source_hit'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import io
+import json
+import pstats
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from components.assembler import Assembler
+from utils.profiling import AssemblyProfile
+
+class TestProfiling(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open('utils/setup.json', 'r') as f:
+            cls.setup = json.load(f)
+        with open('Problema_3_Grupo_26.txt') as f:
+            cls.program = f.read()
+
+    def test_profile(self):
+        """Con profile se obtiene lo mismo, más los tiempos por etapa y por línea"""
+        assembler = Assembler(self.setup)
+        expected = list(assembler.assemble(self.program))
+        profile = AssemblyProfile()
+        with profile.cprofile():
+            binary = assembler.assemble(self.program, profile=profile)
+        self.assertEqual(list(binary), expected)
+
+        self.assertEqual(list(profile.stages), ['FileProcessor', 'DataProcessor', 'CodeProcessor', 'BinaryGenerator'])
+        self.assertEqual(profile.stages['FileProcessor']['lines'], self.program.count('\n') + 1)
+        # Los operandos ya vistos quedan en la caché del encoder, así que puede no haber llamadas
+        self.assertEqual(set(profile.literal_cache), {'calls', 'hits', 'misses'})
+        slowest = profile.slowest_lines(3)
+        self.assertEqual(len(slowest), 3)
+        source = self.program.split('\n')
+        for number, line, _ in slowest:
+            self.assertIn(line.split()[0], source[int(number) - 1])
+        self.assertGreaterEqual(slowest[0][2], slowest[-1][2])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'perfil.json')
+            profile.write_json(path)
+            with open(path) as f:
+                self.assertEqual(json.load(f), json.loads(json.dumps(profile.to_dict())))
+            path = os.path.join(directory, 'perfil.pstats')
+            profile.write_pstats(path)
+            functions = {name for _, _, name in pstats.Stats(path).stats}
+            self.assertIn('_assemble_profiled', functions)
+
+    def test_verbose_output(self):
+        """Con verbose, medir no cambia lo que se muestra"""
+        outputs = []
+        for profile in (None, AssemblyProfile()):
+            output = io.StringIO()
+            with redirect_stdout(output):
+                Assembler(self.setup, verbose=True).assemble(self.program, profile=profile)
+            outputs.append(output.getvalue())
+        self.assertTrue(outputs[0].startswith("Iniciando proceso de ensamblaje...\n"))
+        self.assertEqual(outputs[1], outputs[0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import contextlib
+import io
+import tempfile
+import unittest
+from components.outputWriter import BinWriter
+from components.romProgrammer import MockBasys3, RomProgrammer
+
+class TestRomProgrammer(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = os.path.join(self.directory.name, 'rom.bin')
+        self.device = MockBasys3()
+        self.programmer = RomProgrammer(self.device, cache_path=self.cache)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _program(self, binary, full=False):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.programmer.program(binary, full=full)
+
+    def test_first_program_writes_everything(self):
+        """Sin caché se escriben todas las palabras y la caché queda como imagen .bin"""
+        binary = [1, 2 ** 35, 0, 12345]
+        self.assertEqual(self._program(binary), 4)
+        self.assertEqual(self.device.rom[1], (2 ** 35).to_bytes(5, 'big'))
+        self.assertFalse(self.device.open)
+        with open(self.cache, 'rb') as f:
+            self.assertEqual(f.read(), BinWriter(36).render(binary))
+
+    def test_only_changes_are_written(self):
+        """Al reprogramar solo se escriben las direcciones que cambiaron"""
+        self._program([1, 2, 3, 4])
+        self.device.rom.clear()
+        self.assertEqual(self._program([1, 2, 3, 4]), 0)
+        self.assertEqual(self._program([1, 9, 3, 4, 5]), 2)
+        self.assertEqual(sorted(self.device.rom), [1, 4])
+
+    def test_full_ignores_cache(self):
+        """full=True vuelve a escribir todas las direcciones"""
+        self._program([1, 2, 3])
+        self.assertEqual(self._program([1, 2, 3], full=True), 3)
+
+if __name__ == '__main__':
+    unittest.main()
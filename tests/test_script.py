@@ -5,8 +5,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import unittest
 import json
 import os
+import tempfile
 from components.assembler import Assembler
-from utils.exceptions import AssemblerError, InvalidInstructionError, InvalidOperandError, SyntaxError
+from utils.exceptions import AssemblerError, InvalidInstructionError, InvalidOperandError, SyntaxError, LabelError
 
 class TestAssembler(unittest.TestCase):
     @classmethod
@@ -176,6 +177,28 @@ class TestAssembler(unittest.TestCase):
                     with self.assertRaises(test["expected_exception"]):
                         self.assembler.assemble(test["input"])
 
+    def test_label_addresses(self):
+        """Prueba que los saltos hacia adelante y hacia atrás apunten a la dirección correcta"""
+        program = "CODE:\nJMP fin\ninicio:\nPOP A\nJEQ inicio\nRET\nfin:\nCALL inicio"
+        binary = self.assembler.assemble(program)
+        literal_mask = (1 << self.setup['config']['literals']['bits']) - 1
+        self.assertEqual(len(binary), 7)
+        self.assertEqual(binary[0] & literal_mask, 6)
+        self.assertEqual(binary[3] & literal_mask, 1)
+        self.assertEqual(binary[6] & literal_mask, 1)
+
+    def test_stream_matches_assemble(self):
+        """Prueba que el modo streaming escriba lo mismo que el ensamblaje completo"""
+        program = "DATA:\nv 3\narr 1\n2\nCODE:\n/* salto\n hacia adelante */ JMP fin\ninicio:\nMOV A,(v)\nJNE fin\nRET\nfin:\nCALL inicio"
+        assembler = Assembler(self.setup)
+        expected = assembler.to_text(assembler.assemble(program))
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'output.txt')
+            count = Assembler(self.setup).write_stream(program.split('\n'), filename)
+            with open(filename) as f:
+                self.assertEqual(f.read().splitlines(), expected)
+        self.assertEqual(count, len(expected))
+
     def test_numeric_formats(self):
         """Prueba diferentes formatos numéricos"""
         test_cases = [
@@ -0,0 +1,101 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import glob
+import unittest
+import json
+from components.assembler import Assembler
+from components.simulator import Simulator
+
+# Registros con que terminan los tests del curso al pasar por 'bien'
+BIEN = (170, 17)
+
+class TestSimulator(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open('utils/setup.json', 'r') as f:
+            cls.setup = json.load(f)
+
+    def _run(self, program: str, max_cycles: int = 100000) -> Simulator:
+        assembler = Assembler(self.setup)
+        binary = assembler.assemble(program)
+        simulator = Simulator(assembler.config)
+        simulator.load(binary, assembler.memory.memory)
+        simulator.run(max_cycles)
+        return simulator
+
+    def test_course_programs(self):
+        """Los tests de la Etapa 2 terminan en 'bien'"""
+        for path in sorted(glob.glob('tests/inputs/E2/*.txt')) + ['tests/inputs/E1/etapa_1_test_0.txt']:
+            with self.subTest(program=path):
+                with open(path) as f:
+                    simulator = self._run(f.read())
+                self.assertTrue(simulator.halted)
+                self.assertEqual((simulator.a, simulator.b), BIEN)
+
+    def test_course_programs_with_preload(self):
+        """Con load_data, el programa carga DATA por sí mismo y termina igual sin la imagen"""
+        for path in sorted(glob.glob('tests/inputs/E2/*.txt')):
+            with self.subTest(program=path):
+                with open(path) as f:
+                    program = f.read()
+                assembler = Assembler(self.setup, load_data=True)
+                binary = assembler.assemble(program)
+                simulator = Simulator(assembler.config)
+                simulator.load(binary)
+                simulator.run(100000)
+                self.assertTrue(simulator.halted)
+                self.assertEqual((simulator.a, simulator.b), BIEN)
+
+    def test_flags(self):
+        """Carry de suma y resta, y N solo cuando la resta da negativo"""
+        simulator = self._run("CODE:\nMOV A,65535\nADD A,1\nfin:\nJMP fin")
+        self.assertEqual(simulator.a, 0)
+        self.assertTrue(simulator.z and simulator.c and not simulator.n)
+
+        simulator = self._run("CODE:\nMOV A,1\nCMP A,2\nfin:\nJMP fin")
+        self.assertEqual(simulator.a, 1)
+        self.assertTrue(simulator.n and not simulator.c and not simulator.z)
+
+        simulator = self._run("CODE:\nMOV A,2\nSUB A,1\nfin:\nJMP fin")
+        self.assertTrue(simulator.c and not simulator.n)
+
+    def test_stack(self):
+        """PUSH/POP y CALL/RET dejan el SP donde partió"""
+        program = """CODE:
+MOV A,7
+PUSH A
+CALL sub
+POP B
+fin:
+JMP fin
+sub:
+MOV A,3
+RET
+"""
+        simulator = self._run(program)
+        self.assertEqual((simulator.a, simulator.b), (3, 7))
+        self.assertEqual(simulator.sp, 4095)
+
+    def test_direct_store(self):
+        """MOV (Dir),A escribe en la dirección indicada"""
+        simulator = self._run("DATA:\nx 0\ny 0\nCODE:\nMOV A,9\nMOV (y),A\nMOV (5),A\nfin:\nJMP fin")
+        self.assertEqual(simulator.ram[:2], [0, 9])
+        self.assertEqual(simulator.ram[5], 9)
+
+    def test_max_cycles_and_reset(self):
+        """El límite de ciclos detiene bucles sin fin y reset vuelve a la imagen de DATA"""
+        program = "DATA:\nn 4\nCODE:\nloop:\nINC (n)\nJNE loop"
+        simulator = self._run(program, max_cycles=10)
+        self.assertFalse(simulator.halted)
+        self.assertEqual(simulator.cycles, 10)
+        self.assertEqual(simulator.ram[0], 9)
+
+        simulator.reset()
+        self.assertEqual(simulator.ram[0], 4)
+        simulator.step()
+        self.assertEqual((simulator.pc, simulator.ram[0]), (1, 5))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import unittest
+from components.valueConverter import ValueConverter
+from utils.exceptions import InvalidOperandError
+
+class TestLiteralCache(unittest.TestCase):
+    def test_literal_kinds(self):
+        """Cada texto se interpreta con su tipo, base y valor"""
+        cases = {
+            '12': ('dec', 10, True, 12),
+            '12d': ('dec', 10, True, 12),
+            '101b': ('bin', 2, True, 5),
+            '1Fh': ('hex', 16, True, 31),
+            "'a'": ('char', 0, True, 97),
+            ' 7 ': ('dec', 10, True, 7),
+            'h': ('hex', 16, True, None),
+            'var': ('var', 0, False, None),
+            '"hola"': ('string', 0, False, None),
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                literal = ValueConverter.literal(text)
+                self.assertEqual((literal.kind, literal.base, literal.numeric, literal.value), expected)
+                self.assertEqual(ValueConverter.is_numeric(text), expected[2])
+
+    def test_parse_errors(self):
+        """parse_numeric sigue reportando los mismos errores, también desde la caché"""
+        for _ in range(2):
+            with self.assertRaisesRegex(InvalidOperandError, "Valor numérico inválido: 12x"):
+                ValueConverter.parse_numeric('12x')
+            with self.assertRaisesRegex(InvalidOperandError, "No se puede convertir un string"):
+                ValueConverter.parse_numeric('"12"')
+
+    def test_cache_stats(self):
+        """Un texto repetido se interpreta una sola vez"""
+        ValueConverter.parse_numeric('123456h')
+        before = ValueConverter.literal_cache_stats()
+        for _ in range(10):
+            self.assertEqual(ValueConverter.parse_numeric('123456h'), 0x123456)
+        after = ValueConverter.literal_cache_stats()
+        self.assertEqual(after['hits'] - before['hits'], 10)
+        self.assertEqual(after['misses'], before['misses'])
+        self.assertLessEqual(after['size'], after['max_size'])
+
+if __name__ == '__main__':
+    unittest.main()
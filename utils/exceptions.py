@@ -20,4 +20,18 @@ class SyntaxError(AssemblerError):
 
 class MemoryError(AssemblerError):
     """Se lanza cuando hay un problema relacionado con la memoria."""
-    pass
\ No newline at end of file
+    pass
+
+class SimulatorError(AssemblerError):
+    """Se lanza cuando el simulador encuentra una palabra que no puede ejecutar."""
+    pass
+
+class LinkError(AssemblerError):
+    """Se lanza cuando el enlazador no puede combinar los módulos."""
+    pass
+
+def with_location(error: AssemblerError, location: int) -> AssemblerError:
+    """El mismo error con la línea de origen como prefijo; las líneas sin número (0) no lo llevan."""
+    if not location:
+        return error
+    return type(error)(f"Línea {location}: {error}")
@@ -0,0 +1,17 @@
+import hashlib
+import os
+from typing import Optional, Tuple
+
+
+def text_digest(text: str) -> str:
+    """Hash corto (blake2b de 128 bits) de un texto, para claves de caché"""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def file_signature(path: str) -> Optional[Tuple[int, int]]:
+    """Fecha de modificación y tamaño de un archivo, o None si no existe"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
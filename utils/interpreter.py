@@ -1,4 +1,12 @@
+import heapq
 import json
+import sys
+from typing import Dict, Iterator, List, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Sin NumPy solo está disponible la decodificación línea a línea
+    np = None
 
 class EnhancedInterpreter:
     def __init__(self, setup_file):
@@ -8,7 +16,34 @@ class EnhancedInterpreter:
         self.types = self.setup['tipos']
         self.config = self.setup['config']
 
+        self.word_length = self.config['tamanoPalabra']
+        self.opcode_bits = self.config['instrucciones']['bits']
+        self.types_bits = self.config['tipos']['bits']
+        self.type_width = len(next(iter(self.types.values())))
+        self.lit_bits = self.word_length - self.opcode_bits - self.types_bits
+
+        # Diccionarios inversos en vez de recorrer instrucciones y tipos en cada línea
+        self.instructions_inverse = {info['opcode']: name for name, info in self.instructions.items()}
+        self.types_inverse = {bits: name for name, bits in self.types.items()}
+
+        # Nombres por índice; la última posición corresponde a "Unknown"
+        self.instruction_names = list(self.instructions) + ['Unknown']
+        self.type_names = list(self.types) + ['Unknown']
+        self._format_cache: Dict[Tuple[str, str, str], str] = {}
+
     def interpret(self, filename):
+        if np is None:
+            self.interpret_lines(filename)
+            return
+
+        words, line_numbers, invalid_lines = self.load_words(filename)
+        decoded = self.decode_batch(words)
+        errors = ((line, f"Error: La línea {line} no tiene la longitud correcta.\n") for line in invalid_lines)
+        blocks = self.format_batch(decoded, line_numbers)
+        sys.stdout.write(''.join(text for _, text in heapq.merge(errors, blocks)))
+
+    def interpret_lines(self, filename):
+        """Decodifica e imprime línea a línea, sin NumPy."""
         with open(filename, 'r') as f:
             lines = f.readlines()
 
@@ -25,8 +60,103 @@ class EnhancedInterpreter:
             instruction_info = self.decode_instruction(opcode, params, literal)
             self.print_instruction_info(i+1, binary, instruction_info)
 
+    def load_words(self, filename) -> Tuple['np.ndarray', 'np.ndarray', List[int]]:
+        """
+        Carga un archivo de salida completo en un arreglo uint64. Retorna las
+        palabras, el número de línea de cada una y las líneas con largo inválido.
+        """
+        with open(filename, 'rb') as f:
+            raw = f.read()
+        if raw and not raw.endswith(b'\n'):
+            raw += b'\n'
+
+        # Caso común: todas las líneas tienen exactamente una palabra y '\n'
+        record = self.word_length + 1
+        buffer = np.frombuffer(raw, dtype=np.uint8)
+        if buffer.size % record == 0:
+            rows = buffer.reshape(-1, record)
+            bits = rows[:, :self.word_length]
+            if (rows[:, -1] == ord('\n')).all() and ((bits == ord('0')) | (bits == ord('1'))).all():
+                weights = np.left_shift(np.uint64(1), np.arange(self.word_length - 1, -1, -1, dtype=np.uint64))
+                words = (bits == ord('1')).astype(np.uint64) @ weights
+                return words, np.arange(1, len(words) + 1), []
+
+        words, line_numbers, invalid_lines = [], [], []
+        for number, line in enumerate(raw.decode().splitlines(), 1):
+            binary = line.strip()
+            if len(binary) != self.word_length:
+                invalid_lines.append(number)
+                continue
+            words.append(int(binary, 2))
+            line_numbers.append(number)
+        return np.array(words, dtype=np.uint64), np.array(line_numbers, dtype=np.int64), invalid_lines
+
+    def _index_arrays(self) -> Tuple['np.ndarray', 'np.ndarray']:
+        """Tablas valor del campo -> índice en instruction_names / type_names."""
+        opcode_index = np.full(2 ** self.opcode_bits, len(self.instruction_names) - 1, dtype=np.intp)
+        for index, name in enumerate(self.instructions):
+            opcode_index[int(self.instructions[name]['opcode'], 2)] = index
+        type_index = np.full(2 ** self.type_width, len(self.type_names) - 1, dtype=np.intp)
+        for index, bits in enumerate(self.types.values()):
+            type_index[int(bits, 2)] = index
+        return opcode_index, type_index
+
+    def decode_batch(self, words: 'np.ndarray') -> Dict[str, 'np.ndarray']:
+        """Separa opcode, tipos y literal de todas las palabras con desplazamientos y máscaras."""
+        words = np.asarray(words, dtype=np.uint64)
+        opcode_index, type_index = self._index_arrays()
+        type_mask = np.uint64(2 ** self.type_width - 1)
+
+        opcode = words >> np.uint64(self.lit_bits + self.types_bits)
+        param1 = (words >> np.uint64(self.lit_bits + self.types_bits - self.type_width)) & type_mask
+        param2 = (words >> np.uint64(self.lit_bits + self.types_bits - 2 * self.type_width)) & type_mask
+        literal = words & np.uint64(2 ** self.lit_bits - 1)
+
+        return {
+            'word': words,
+            'opcode': opcode,
+            'param1': param1,
+            'param2': param2,
+            'literal': literal,
+            'name': opcode_index[opcode.astype(np.intp)],
+            'type1': type_index[param1.astype(np.intp)],
+            'type2': type_index[param2.astype(np.intp)],
+        }
+
+    def format_batch(self, decoded: Dict[str, 'np.ndarray'], line_numbers=None) -> Iterator[Tuple[int, str]]:
+        """Etapa opcional de formato: entrega (línea, texto) en el mismo formato que print_instruction_info."""
+        if line_numbers is None:
+            line_numbers = range(1, len(decoded['word']) + 1)
+        names, types = self.instruction_names, self.type_names
+        word_format = f"0{self.word_length}b"
+        opcode_format = f"0{self.opcode_bits}b"
+        columns = zip(
+            line_numbers,
+            decoded['word'].tolist(),
+            decoded['opcode'].tolist(),
+            decoded['literal'].tolist(),
+            decoded['name'].tolist(),
+            decoded['type1'].tolist(),
+            decoded['type2'].tolist(),
+        )
+        for line, word, opcode, literal, name, type1, type2 in columns:
+            name, param1, param2 = names[name], types[type1], types[type2]
+            key = (name, param1, param2)
+            instruction_format = self._format_cache.get(key)
+            if instruction_format is None:
+                instruction_format = self._format_cache[key] = self.determine_format(name, param1, param2, literal)
+            yield int(line), (
+                f"Línea {line}:\n"
+                f"  Binario completo: {format(word, word_format)}\n"
+                f"  Instrucción: {name}\n"
+                f"  Formato: {instruction_format}\n"
+                f"  Desglose:\n"
+                f"    [opcode: {format(opcode, opcode_format)}] [param1: {param1}] [param2: {param2}] [literal: {literal}]\n"
+                f"\n"
+            )
+
     def decode_instruction(self, opcode, params, literal):
-        instruction_name = next((name for name, info in self.instructions.items() if info['opcode'] == opcode), "Unknown")
+        instruction_name = self.instructions_inverse.get(opcode, "Unknown")
         param1_type = self.decode_param_type(params[:3])
         param2_type = self.decode_param_type(params[3:])
         literal_value = int(literal, 2) if literal else None
@@ -41,14 +171,14 @@ class EnhancedInterpreter:
         }
 
     def decode_param_type(self, param_bits):
-        return next((type_name for type_name, type_bits in self.types.items() if type_bits == param_bits), "Unknown")
+        return self.types_inverse.get(param_bits, "Unknown")
 
     def determine_format(self, instruction_name, param1_type, param2_type, literal_value):
         if instruction_name not in self.instructions:
             return "Unknown format"
 
         possible_formats = self.instructions[instruction_name]['formato']
-        
+
         for format in possible_formats:
             format_parts = format.replace(',', '').split()
             if len(format_parts) == 1 and format_parts[0] == 'Ins' and literal_value is not None:
@@ -75,4 +205,4 @@ class EnhancedInterpreter:
 
 if __name__ == "__main__":
     interpreter = EnhancedInterpreter("utils/setup.json")
-    interpreter.interpret("output.txt")
\ No newline at end of file
+    interpreter.interpret("output.txt")
@@ -1,3 +1,161 @@
+import atexit
+import queue
+import sys
+import threading
+from typing import Any, Callable, List, Optional, TextIO
+
+# Niveles de los mensajes, de menor a mayor importancia
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+LEVELS = {'debug': DEBUG, 'info': INFO, 'warning': WARNING, 'error': ERROR}
+
+# Caracteres acumulados antes de entregar el buffer al hilo escritor
+BUFFER_SIZE = 1 << 16
+
+
+class Deferred:
+    """Texto que se calcula recién al escribirlo, para argumentos caros de formatear"""
+    __slots__ = ('function', 'args')
+
+    def __init__(self, function: Callable[..., str], *args: Any):
+        self.function = function
+        self.args = args
+
+    def __str__(self) -> str:
+        return self.function(*self.args)
+
+
+class _Message:
+    """Entrada del listado con sus argumentos; se formatea en write_listing"""
+    __slots__ = ('message', 'args')
+
+    def __init__(self, message: str, args: tuple):
+        self.message = message
+        self.args = args
+
+
+def _format(message: str, args: tuple) -> Optional[str]:
+    """Texto del mensaje; si no se puede formatear se informa en stderr y retorna None"""
+    try:
+        return message % args if args else str(message)
+    except Exception as e:
+        sys.stderr.write(f"Error del logger al formatear {message!r}: {type(e).__name__}: {e}\n")
+        return None
+
+
+class Logger:
+    """
+    Mensajes con nivel y formato perezoso: bajo el nivel no se formatea
+    nada. Los mensajes formateados se acumulan en un buffer y un hilo
+    escritor los escribe en bloques, así que quien registra no espera a la
+    terminal. flush() espera a que todo lo registrado esté escrito; se llama
+    al terminar cada ensamblaje y al salir.
+
+    El listado de instrucciones (listing) va al log o, con start_listing, a
+    una lista que write_listing guarda en un archivo con una sola escritura.
+    """
+
+    def __init__(self, level: int = DEBUG, stream: Optional[TextIO] = None):
+        self.level = level
+        # None: el sys.stdout vigente al registrar (respeta redirect_stdout)
+        self.stream = stream
+        self._parts: List[str] = []
+        self._size = 0
+        self._stream: Optional[TextIO] = None
+        self._lock = threading.Lock()
+        self._queue: Optional[queue.Queue] = None
+        self._listing: Optional[List[_Message]] = None
+
+    def enabled(self, level: int) -> bool:
+        return level >= self.level
+
+    def log(self, level: int, message: str, *args: Any) -> None:
+        if level < self.level:
+            return
+        text = _format(message, args)
+        if text is None:
+            return
+        stream = self.stream or sys.stdout
+        with self._lock:
+            if stream is not self._stream and self._parts:
+                self._hand_off()
+            self._stream = stream
+            self._parts.append(text)
+            self._size += len(text) + 1
+            if self._size >= BUFFER_SIZE:
+                self._hand_off()
+
+    def debug(self, message: str, *args: Any) -> None:
+        self.log(DEBUG, message, *args)
+
+    def info(self, message: str, *args: Any) -> None:
+        self.log(INFO, message, *args)
+
+    def warning(self, message: str, *args: Any) -> None:
+        self.log(WARNING, message, *args)
+
+    def error(self, message: str, *args: Any) -> None:
+        self.log(ERROR, message, *args)
+
+    @property
+    def collecting(self) -> bool:
+        """Si el listado se está guardando para write_listing"""
+        return self._listing is not None
+
+    def listing(self, message: str, *args: Any) -> None:
+        """Una entrada del listado de instrucciones"""
+        if self._listing is not None:
+            self._listing.append(_Message(message, args))
+        else:
+            self.log(DEBUG, message, *args)
+
+    def start_listing(self) -> None:
+        """Desde ahora el listado se guarda para write_listing en vez de ir al log"""
+        self._listing = []
+
+    def write_listing(self, filename: str) -> int:
+        """Escribe el listado acumulado de una vez y vuelve a enviarlo al log; retorna las entradas"""
+        entries, self._listing = self._listing or [], None
+        with open(filename, 'w') as f:
+            texts = (_format(entry.message, entry.args) for entry in entries)
+            f.write(''.join(f"{text}\n" for text in texts if text is not None))
+        return len(entries)
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._parts:
+                self._hand_off()
+        if self._queue is not None:
+            self._queue.join()
+
+    def _hand_off(self) -> None:
+        """Entrega el buffer al hilo escritor (con el lock tomado)"""
+        if self._queue is None:
+            self._queue = queue.Queue()
+            threading.Thread(target=self._write_loop, name='logger', daemon=True).start()
+        self._queue.put((self._stream, self._parts))
+        self._parts = []
+        self._size = 0
+
+    def _write_loop(self) -> None:
+        while True:
+            stream, parts = self._queue.get()
+            try:
+                stream.write(''.join(f"{part}\n" for part in parts))
+                stream.flush()
+            except Exception as e:
+                # Un error al escribir no debe detener al ensamblador, pero se informa
+                sys.stderr.write(f"Error del logger al escribir {len(parts)} mensajes: {type(e).__name__}: {e}\n")
+            finally:
+                self._queue.task_done()
+
+
+logger = Logger()
+atexit.register(logger.flush)
+
+
 def log(message: str, log: bool = False):
     if log:
-        print(message)
+        logger.info(message)
@@ -0,0 +1,116 @@
+import json
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+# Líneas más lentas que se muestran por defecto
+SLOWEST_LINES = 10
+
+
+class AssemblyProfile:
+    """
+    Tiempos y cantidad de líneas de cada etapa de un ensamblaje, llamadas a la
+    caché de literales y tiempo por línea de CODE, para --profile. Se pasa a
+    Assembler.assemble(..., profile=...); sin él, el ensamblaje no mide nada.
+    """
+
+    def __init__(self):
+        # Etapa -> {'seconds', 'lines'}, en el orden en que se ejecutaron
+        self.stages: Dict[str, Dict[str, float]] = {}
+        # (línea de origen, texto) -> segundos acumulados en BinaryGenerator
+        self.line_times: Dict[Tuple[str, str], float] = {}
+        self.literal_cache: Dict[str, int] = {}
+        self.profiler = None
+
+    def add(self, name: str, seconds: float, lines: int = 0) -> None:
+        stage = self.stages.setdefault(name, {'seconds': 0.0, 'lines': 0})
+        stage['seconds'] += seconds
+        stage['lines'] += lines
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[Dict[str, float]]:
+        """Mide el bloque como la etapa name; las líneas se suman al dict entregado"""
+        counts = {'lines': 0}
+        start = time.perf_counter()
+        try:
+            yield counts
+        finally:
+            self.add(name, time.perf_counter() - start, counts['lines'])
+
+    def time_lines(self, code_lines: Iterable[Tuple[str, int]]) -> Iterator[Tuple[str, int]]:
+        """
+        Entrega las líneas de CODE midiendo cuánto tarda el consumidor en pedir
+        la siguiente, es decir, en codificar la actual.
+        """
+        line_times = self.line_times
+        clock = time.perf_counter
+        key = None
+        start = 0.0
+        for line, number in code_lines:
+            now = clock()
+            if key is not None:
+                line_times[key] = line_times.get(key, 0.0) + now - start
+            key = (str(number), line)
+            start = now
+            yield line, number
+        if key is not None:
+            line_times[key] = line_times.get(key, 0.0) + clock() - start
+
+    def set_literal_cache(self, before: Dict[str, float], after: Dict[str, float]) -> None:
+        """Diferencia de ValueConverter.literal_cache_stats() durante el ensamblaje"""
+        hits = after['hits'] - before['hits']
+        misses = after['misses'] - before['misses']
+        self.literal_cache = {'calls': hits + misses, 'hits': hits, 'misses': misses}
+
+    def slowest_lines(self, count: int = SLOWEST_LINES) -> List[Tuple[str, str, float]]:
+        ranked = sorted(self.line_times.items(), key=lambda item: item[1], reverse=True)[:count]
+        return [(number, line, seconds) for (number, line), seconds in ranked]
+
+    @contextmanager
+    def cprofile(self) -> Iterator[None]:
+        """Ejecuta el bloque bajo cProfile; el resultado queda para write_pstats"""
+        # Import local: solo se necesita con --profile-stats
+        import cProfile
+        if self.profiler is None:
+            self.profiler = cProfile.Profile()
+        self.profiler.enable()
+        try:
+            yield
+        finally:
+            self.profiler.disable()
+
+    def write_pstats(self, filename: str) -> None:
+        """Guarda el resultado de cprofile, legible con pstats o snakeviz"""
+        if self.profiler is None:
+            raise ValueError("No hay datos de cProfile: el ensamblaje no corrió dentro de cprofile()")
+        self.profiler.dump_stats(filename)
+
+    def to_dict(self, count: int = SLOWEST_LINES) -> Dict:
+        return {
+            'stages': {name: dict(stage) for name, stage in self.stages.items()},
+            'literal_cache': dict(self.literal_cache),
+            'slowest_lines': [
+                {'line': number, 'source': line, 'seconds': seconds}
+                for number, line, seconds in self.slowest_lines(count)
+            ],
+        }
+
+    def write_json(self, filename: str, count: int = SLOWEST_LINES) -> None:
+        with open(filename, 'w') as f:
+            json.dump(self.to_dict(count), f, indent=2, ensure_ascii=False)
+            f.write('\n')
+
+    def report(self, count: int = SLOWEST_LINES) -> str:
+        lines = ["Perfil del ensamblaje:"]
+        for name, stage in self.stages.items():
+            lines.append(f"  {name:<16}{stage['seconds'] * 1000:9.2f} ms {int(stage['lines']):>9} líneas")
+        if self.literal_cache:
+            cache = self.literal_cache
+            lines.append(f"  ValueConverter.literal: {cache['calls']} llamadas, "
+                         f"{cache['hits']} aciertos, {cache['misses']} fallos")
+        slowest = self.slowest_lines(count)
+        if slowest:
+            lines.append("  Líneas más lentas:")
+            for number, line, seconds in slowest:
+                lines.append(f"    {seconds * 1e6:9.1f} us  línea {number}: {line}")
+        return '\n'.join(lines)
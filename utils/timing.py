@@ -0,0 +1,28 @@
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+
+class PhaseTimer:
+    """Acumula el tiempo de cada fase de una ejecución, para --timing"""
+
+    def __init__(self, start: Optional[float] = None):
+        self.start = time.perf_counter() if start is None else start
+        self.phases: Dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def report(self) -> str:
+        total = time.perf_counter() - self.start
+        lines = [f"  {name:<16}{seconds * 1000:9.2f} ms" for name, seconds in self.phases.items()]
+        lines.append(f"  {'total':<16}{total * 1000:9.2f} ms")
+        return "Tiempos:\n" + '\n'.join(lines)